@@ -0,0 +1,205 @@
+"""Per-endpoint serialization cost of the list responses, before and after the fast path
+
+Runs on synthetic documents shaped like the stored ones (no database needed):
+
+    cd backend && python -m benchmarks.serialization [--rounds 200]
+
+For each endpoint shape it times, per response:
+  before     Model(**doc) for every document, in the full document shape, then FastAPI's
+             response_model handling (dump, validate again, serialize) and JSONResponse
+             rendering with json
+  validated  projected documents validated once, encoded by pydantic-core (default)
+  trusted    projected documents encoded as-is by orjson (FAST_JSON_ENABLED)
+with the payload size before and after (list endpoints serving a summary shape are smaller),
+and, for responses still rendered by FastAPI, JSONResponse against ORJSONResponse.
+"""
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+from bson import ObjectId
+from models.admin_models import GalleryItem, GalleryItemSummary
+from models.contact_models import MESSAGE_PREVIEW_LENGTH, Booking, ContactRequest, ContactRequestSummary, Testimonial
+from models.pagination_models import Page, SearchResults
+from services.serialization import trusted_list_body, validated_list_body
+from datetime import date, datetime, timedelta
+from typing import Callable, List
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+
+def contact_request_document(i: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "id": str(uuid.uuid4()),
+        "name": f"Client {i}",
+        "email": f"client{i}@example.fr",
+        "phone": "06 12 34 56 78",
+        "event_type": ("mariage", "anniversaire", "bapteme")[i % 3],
+        "event_date": "2026-06-20",
+        "guests": 80 + i % 50,
+        "message": "Bonjour, nous souhaitons un devis pour notre événement. " * (2 + i % 12),
+        "status": ("new", "contacted", "quoted", "closed")[i % 4],
+        "created_at": datetime(2026, 1, 1) + timedelta(minutes=i),
+        "updated_at": datetime(2026, 1, 1) + timedelta(minutes=i),
+    }
+
+
+def testimonial_document(i: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "id": str(uuid.uuid4()),
+        "name": f"Client {i}",
+        "event": "Mariage à Lyon",
+        "text": "Une soirée parfaite, toute l'équipe était au top ! " * 3,
+        "rating": 1 + i % 5,
+        "is_approved": bool(i % 2),
+        "created_at": datetime(2026, 1, 1) + timedelta(minutes=i),
+        "updated_at": datetime(2026, 1, 1) + timedelta(minutes=i),
+    }
+
+
+def booking_document(i: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "id": str(uuid.uuid4()),
+        "contact_request_id": str(uuid.uuid4()),
+        "package_id": str(uuid.uuid4()),
+        "package_type": ("event", "photobooth")[i % 2],
+        "total_price": 1200 + i,
+        "status": "pending",
+        "event_date": date(2026, 6, 20),
+        "notes": "Acompte reçu",
+        "created_at": datetime(2026, 1, 1) + timedelta(minutes=i),
+        "updated_at": datetime(2026, 1, 1) + timedelta(minutes=i),
+    }
+
+
+def gallery_document(i: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "id": str(uuid.uuid4()),
+        "title": f"Photo {i}",
+        "description": "Décoration de salle et photobooth",
+        "file_type": "image",
+        "file_url": f"/uploads/{uuid.uuid4()}.jpg",
+        "content_hash": uuid.uuid4().hex * 2,
+        "thumbnail_url": f"/uploads/derived/{i}-400.webp",
+        "variants": [
+            {"width": width, "height": width * 2 // 3, "format": fmt, "url": f"/uploads/derived/{i}-{width}.{fmt}"}
+            for width in (400, 800, 1600) for fmt in ("webp", "avif")
+        ],
+        "placeholder": "data:image/webp;base64," + "A" * 120,
+        "width": 4000,
+        "height": 2667,
+        "derivatives_status": "ready",
+        "event_type": "mariage",
+        "is_featured": i % 10 == 0,
+        "is_active": True,
+        "created_by": str(uuid.uuid4()),
+        "created_at": datetime(2026, 1, 1) + timedelta(minutes=i),
+        "updated_at": datetime(2026, 1, 1) + timedelta(minutes=i),
+    }
+
+
+# Full document shape of the summary models served by list endpoints
+FULL_MODELS = {ContactRequestSummary: ContactRequest, GalleryItemSummary: GalleryItem}
+
+
+def projected(document: dict, model) -> dict:
+    """The document as fields_projection(model) returns it"""
+    fields = {field: value for field, value in document.items() if field in model.model_fields}
+    if "message_preview" in model.model_fields:
+        fields["message_preview"] = document["message"][:MESSAGE_PREVIEW_LENGTH]
+        fields["message_truncated"] = len(document["message"]) > MESSAGE_PREVIEW_LENGTH
+    return fields
+
+
+# (endpoint, response type, item model, document factory, documents, envelope fields)
+ENDPOINTS = [
+    ("GET /api/admin/contact-requests (50)", Page[ContactRequestSummary], ContactRequestSummary,
+     contact_request_document, 50, {"limit": 50, "next_cursor": "x", "prev_cursor": None}),
+    ("GET /api/admin/contact-requests (200)", Page[ContactRequestSummary], ContactRequestSummary,
+     contact_request_document, 200, {"limit": 200, "next_cursor": "x", "prev_cursor": None}),
+    ("GET /api/admin/testimonials (50)", Page[Testimonial], Testimonial, testimonial_document, 50,
+     {"limit": 50, "next_cursor": None, "prev_cursor": None}),
+    ("GET /api/admin/bookings (50)", Page[Booking], Booking, booking_document, 50,
+     {"limit": 50, "next_cursor": None, "prev_cursor": None}),
+    ("GET /api/admin/gallery (50)", Page[GalleryItemSummary], GalleryItemSummary, gallery_document, 50,
+     {"limit": 50, "next_cursor": None, "prev_cursor": None}),
+    ("GET /api/admin/search/gallery (100)", SearchResults[GalleryItemSummary], GalleryItemSummary, gallery_document, 100,
+     {"total": 1000, "limit": 100, "offset": 0, "facets": {"event_type": {"mariage": 1000}}}),
+    ("GET /api/contact-requests (100)", List[ContactRequest], ContactRequest, contact_request_document, 100, {}),
+]
+
+
+def timed(func: Callable[[], object], rounds: int) -> float:
+    """Median time of one call in milliseconds"""
+    func()
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000
+
+
+def run(rounds: int) -> None:
+    loop = asyncio.new_event_loop()
+    header = (
+        f"{'endpoint':<40} {'before':>9} {'validated':>10} {'trusted':>9} {'x valid':>7} {'x trust':>7} "
+        f"{'KB before':>9} {'KB after':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for name, response_type, model, factory, count, envelope in ENDPOINTS:
+        documents = [factory(i) for i in range(count)]
+        projected_documents = [projected(document, model) for document in documents]
+        full_model = FULL_MODELS.get(model, model)
+        full_type = response_type.__pydantic_generic_metadata__["origin"][full_model] if envelope else List[full_model]
+        field = create_response_field(name="Response", type_=full_type, mode="serialization")
+        adapter = TypeAdapter(response_type)
+
+        def before():
+            items = [full_model(**document) for document in documents]
+            value = full_type(items=items, **envelope) if envelope else items
+            content = loop.run_until_complete(serialize_response(field=field, response_content=value))
+            return JSONResponse(content).body
+
+        def validated():
+            return validated_list_body(adapter, model, projected_documents, **envelope)
+
+        def trusted():
+            return trusted_list_body(model, projected_documents, **envelope)
+
+        # Same payload whichever path produced it (and the same as before for full shapes)
+        assert json.loads(validated()) == json.loads(trusted())
+        assert full_model is not model or json.loads(before()) == json.loads(validated())
+        before_ms, validated_ms, trusted_ms = (timed(func, rounds) for func in (before, validated, trusted))
+        print(
+            f"{name:<40} {before_ms:>7.2f}ms {validated_ms:>8.2f}ms {trusted_ms:>7.2f}ms "
+            f"{before_ms / validated_ms:>6.1f}x {before_ms / trusted_ms:>6.1f}x "
+            f"{len(before()) / 1024:>9.1f} {len(validated()) / 1024:>8.1f}"
+        )
+
+    # Responses still rendered by FastAPI (stats, bulk results): only the encoder changes
+    content = {
+        "queues": {f"queue-{i}": {"queued": i, "accepted": i * 10, "inserted": i * 9} for i in range(50)},
+        "results": [{"id": str(uuid.uuid4()), "status": "updated", "error": None} for _ in range(500)],
+    }
+    json_ms = timed(lambda: JSONResponse(content).body, rounds)
+    orjson_ms = timed(lambda: ORJSONResponse(content).body, rounds)
+    print()
+    print(f"{'dict response render (500 results)':<40} json {json_ms:.2f}ms  orjson {orjson_ms:.2f}ms  {json_ms / orjson_ms:.1f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=200)
+    run(parser.parse_args().rounds)
@@ -33,6 +33,16 @@ class Token(BaseModel):
     access_token: str
     token_type: str
     expires_in: int
+    refresh_token: Optional[str] = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class ImageVariant(BaseModel):
+    width: int
+    height: int
+    format: str  # "webp", "avif"
+    url: str
 
 class GalleryItem(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -40,7 +50,15 @@ class GalleryItem(BaseModel):
     description: Optional[str] = None
     file_type: str  # "image" or "video"
     file_url: str
+    content_hash: Optional[str] = None  # SHA-256 of the stored blob
     thumbnail_url: Optional[str] = None
+    variants: List[ImageVariant] = []
+    placeholder: Optional[str] = None  # tiny blurred preview as a data URI
+    preview_url: Optional[str] = None  # short muted loop for videos
+    duration: Optional[float] = None  # seconds, videos only
+    width: Optional[int] = None
+    height: Optional[int] = None
+    derivatives_status: Optional[str] = None  # "pending", "ready", "failed"
     event_type: Optional[str] = None  # "mariage", "anniversaire", "bapteme"
     is_featured: bool = False
     is_active: bool = True
@@ -48,6 +66,23 @@ class GalleryItem(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+class GalleryItemSummary(BaseModel):
+    # Fields rendered by the admin gallery grid, media metadata is on the detail endpoint
+    id: str
+    title: str
+    description: Optional[str] = None
+    file_type: str
+    file_url: str
+    thumbnail_url: Optional[str] = None
+    variants: List[ImageVariant] = []
+    placeholder: Optional[str] = None
+    preview_url: Optional[str] = None
+    event_type: Optional[str] = None
+    is_featured: bool = False
+    is_active: bool = True
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
 class GalleryItemCreate(BaseModel):
     title: str
     description: Optional[str] = None
@@ -71,4 +106,57 @@ class DashboardStats(BaseModel):
     pending_testimonials: int
     total_gallery_items: int
     total_bookings: int
-    recent_requests: List[dict] = []
\ No newline at end of file
+    recent_requests: List[dict] = []
+
+class UploadSessionCreate(BaseModel):
+    filename: str
+    content_type: str
+    total_size: int = Field(gt=0)
+    chunk_size: Optional[int] = None
+    title: str
+    description: Optional[str] = None
+    event_type: Optional[str] = None
+    is_featured: bool = False
+
+class UploadSession(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    filename: str
+    content_type: str
+    file_type: str  # "image" or "video"
+    total_size: int
+    chunk_size: int
+    total_chunks: int
+    received_chunks: List[int] = []
+    status: str = "open"  # "open", "assembling", "completed"
+    title: str
+    description: Optional[str] = None
+    event_type: Optional[str] = None
+    is_featured: bool = False
+    gallery_item_id: Optional[str] = None
+    created_by: str  # admin user id
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
+
+class UploadSessionStatus(BaseModel):
+    id: str
+    status: str
+    total_size: int
+    chunk_size: int
+    total_chunks: int
+    received_chunks: List[int]
+    missing_chunks: List[int]
+    received_ranges: List[List[int]]  # [start, end] byte ranges, end inclusive
+    received_bytes: int
+    expires_at: datetime
+    gallery_item_id: Optional[str] = None
+
+class DirectUploadCreate(BaseModel):
+    filename: str
+    content_type: str
+    size: int = Field(gt=0)
+    sha256: str = Field(pattern=r"^[0-9a-f]{64}$")  # hex digest computed by the client
+    title: str
+    description: Optional[str] = None
+    event_type: Optional[str] = None
+    is_featured: bool = False
@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field
+from typing import Generic, List, Optional, TypeVar
+
+P = TypeVar("P")
+
+MAX_BULK_ITEMS = 500
+
+class BulkItem(BaseModel, Generic[P]):
+    id: str
+    patch: Optional[P] = None
+    delete: bool = False  # only where single-item deletion exists (gallery)
+
+class BulkRequest(BaseModel, Generic[P]):
+    items: List[BulkItem[P]] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+    ordered: bool = True  # stop at the first failing item, like an ordered bulk_write
+
+class BulkItemResult(BaseModel):
+    id: str
+    status: str  # "updated", "deleted", "not_found", "failed", "skipped"
+    error: Optional[str] = None
+
+class BulkResult(BaseModel):
+    ordered: bool
+    updated: int = 0
+    deleted: int = 0
+    not_found: int = 0
+    failed: int = 0
+    skipped: int = 0
+    results: List[BulkItemResult]
@@ -16,6 +16,29 @@ class ContactRequest(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+# Admin list rows carry the start of the message, the detail endpoint the whole request
+MESSAGE_PREVIEW_LENGTH = 200
+_message = {"$ifNull": ["$message", ""]}
+# Computed fields of ContactRequestSummary, as projection expressions (MongoDB 4.4+)
+CONTACT_REQUEST_SUMMARY_FIELDS = {
+    "message_preview": {"$substrCP": [_message, 0, MESSAGE_PREVIEW_LENGTH]},
+    "message_truncated": {"$gt": [{"$strLenCP": _message}, MESSAGE_PREVIEW_LENGTH]},
+}
+
+class ContactRequestSummary(BaseModel):
+    id: str
+    name: str
+    email: str  # validated when the request was created
+    phone: Optional[str] = None
+    event_type: str
+    event_date: Optional[str] = None
+    guests: Optional[int] = None
+    message_preview: Optional[str] = None
+    message_truncated: bool = False
+    status: str = "new"
+    created_at: datetime
+    updated_at: datetime
+
 class ContactRequestCreate(BaseModel):
     name: str
     email: EmailStr
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Dict, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    limit: int
+    next_cursor: Optional[str] = None  # older items
+    prev_cursor: Optional[str] = None  # newer items
+
+class SearchResults(BaseModel, Generic[T]):
+    items: List[T]
+    total: int
+    limit: int
+    offset: int
+    facets: Dict[str, Dict[str, int]] = {}  # field -> value -> matching documents
@@ -1,57 +1,49 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import List, Optional
-from models.admin_models import AdminUser, DashboardStats, GalleryItem, GalleryItemCreate, GalleryItemUpdate
-from models.contact_models import ContactRequest, ContactRequestUpdate, Testimonial, TestimonialUpdate
+from pydantic import TypeAdapter
+from typing import Optional
+from models.admin_models import AdminUser, DashboardStats, GalleryItem, GalleryItemCreate, GalleryItemSummary, GalleryItemUpdate
+from models.contact_models import (
+    CONTACT_REQUEST_SUMMARY_FIELDS, Booking, ContactRequest, ContactRequestSummary, ContactRequestUpdate, Testimonial, TestimonialUpdate
+)
+from models.bulk_models import BulkRequest, BulkResult
+from models.pagination_models import Page
 from routers.auth import get_current_user
-from datetime import datetime
+from routers.testimonials import APPROVED_TESTIMONIALS_CACHE_KEY
+from services.database import get_database, get_pool_stats
+from services import analytics, blob_store, catalog_cache, compression, diagnostics, dashboard_counters, login_limiter, password_pool, principal_cache, refresh_tokens, write_behind
+from services.http_cache import conditional_response, max_updated_at, PRIVATE_CACHE_CONTROL
+from services.bulk_ops import apply_bulk, patch_fields, update_tracked
+from services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate
+from services.serialization import fields_projection, item_body, json_response, list_body
 import logging
-import os
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 logger = logging.getLogger(__name__)
 
-async def get_database() -> AsyncIOMotorDatabase:
-    from motor.motor_asyncio import AsyncIOMotorClient
-    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
-    return client[os.environ['DB_NAME']]
+contact_page_adapter = TypeAdapter(Page[ContactRequestSummary])
+testimonial_page_adapter = TypeAdapter(Page[Testimonial])
+booking_page_adapter = TypeAdapter(Page[Booking])
+gallery_page_adapter = TypeAdapter(Page[GalleryItemSummary])
 
 @router.get("/dashboard", response_model=DashboardStats)
 async def get_dashboard_stats(
     current_user: AdminUser = Depends(get_current_user),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
-    """Get dashboard statistics"""
+    """Get dashboard statistics (one read of the maintained counters)"""
     try:
-        # Get counts
-        total_contact_requests = await db.contact_requests.count_documents({})
-        pending_contact_requests = await db.contact_requests.count_documents({"status": "new"})
-        total_testimonials = await db.testimonials.count_documents({})
-        pending_testimonials = await db.testimonials.count_documents({"is_approved": False})
-        total_gallery_items = await db.gallery_items.count_documents({"is_active": True})
-        total_bookings = await db.bookings.count_documents({})
-        
-        # Get recent requests
-        recent_cursor = db.contact_requests.find({}).sort("created_at", -1).limit(5)
-        recent_requests_raw = await recent_cursor.to_list(5)
-        recent_requests = []
+        counters = await dashboard_counters.get_counters(db)
         
-        for req in recent_requests_raw:
+        recent_requests = []
+        for req in counters.get("recent_requests", []):
             recent_requests.append({
-                "id": req["id"],
-                "name": req["name"],
-                "event_type": req["event_type"],
-                "status": req["status"],
+                **req,
                 "created_at": req["created_at"].isoformat() if req.get("created_at") else None
             })
         
         return DashboardStats(
-            total_contact_requests=total_contact_requests,
-            pending_contact_requests=pending_contact_requests,
-            total_testimonials=total_testimonials,
-            pending_testimonials=pending_testimonials,
-            total_gallery_items=total_gallery_items,
-            total_bookings=total_bookings,
+            **{field: counters.get(field, 0) for field in dashboard_counters.COUNTER_FIELDS},
             recent_requests=recent_requests
         )
         
@@ -59,29 +51,145 @@ async def get_dashboard_stats(
         logger.error(f"Dashboard stats error: {e}")
         raise HTTPException(status_code=500, detail="Failed to get dashboard stats")
 
+@router.post("/dashboard/reconcile", response_model=DashboardStats)
+async def reconcile_dashboard_stats(
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Recompute the dashboard counters from the collections"""
+    try:
+        counters = await dashboard_counters.reconcile(db)
+        
+        logger.info(f"Dashboard counters reconciled by {current_user.username}")
+        
+        return DashboardStats(
+            **{field: counters[field] for field in dashboard_counters.COUNTER_FIELDS},
+            recent_requests=[
+                {**req, "created_at": req["created_at"].isoformat() if req.get("created_at") else None}
+                for req in counters["recent_requests"]
+            ]
+        )
+        
+    except Exception as e:
+        logger.error(f"Dashboard reconcile error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to reconcile dashboard stats")
+
+@router.get("/pool-stats")
+async def get_database_pool_stats(current_user: AdminUser = Depends(get_current_user)):
+    """Get MongoDB connection pool statistics"""
+    return get_pool_stats()
+
+# Catalog cache management
+@router.get("/cache/catalog")
+async def get_catalog_cache_stats(current_user: AdminUser = Depends(get_current_user)):
+    """Get catalog cache statistics"""
+    return catalog_cache.get_cache_stats()
+
+@router.post("/cache/catalog/invalidate")
+async def invalidate_catalog_cache(current_user: AdminUser = Depends(get_current_user)):
+    """Drop cached catalog payloads after catalog data was changed"""
+    catalog_cache.invalidate()
+    
+    logger.info(f"Catalog cache invalidated by {current_user.username}")
+    
+    return {"message": "Catalog cache invalidated"}
+
+@router.get("/compression")
+async def get_compression_stats(current_user: AdminUser = Depends(get_current_user)):
+    """Get response compression statistics"""
+    return compression.get_compression_stats()
+
+@router.get("/diagnostics")
+async def get_diagnostics(
+    limit: int = Query(20, ge=1, le=diagnostics.MAX_REPORTS),
+    current_user: AdminUser = Depends(get_current_user)
+):
+    """Get the latest event loop stalls and slow request profiles (diagnostics mode)"""
+    return diagnostics.get_diagnostics(limit)
+
+# Principal cache management
+@router.get("/cache/principals")
+async def get_principal_cache_stats(current_user: AdminUser = Depends(get_current_user)):
+    """Get authenticated principal cache statistics"""
+    return principal_cache.get_cache_stats()
+
+@router.post("/cache/principals/invalidate")
+async def invalidate_principal_cache(
+    username: Optional[str] = None,
+    current_user: AdminUser = Depends(get_current_user)
+):
+    """Drop cached principals after an admin user was modified or deactivated"""
+    principal_cache.invalidate(username)
+    
+    logger.info(f"Principal cache invalidated by {current_user.username} ({username or 'all users'})")
+    
+    return {"message": "Principal cache invalidated"}
+
+@router.get("/auth-stats")
+async def get_auth_stats(current_user: AdminUser = Depends(get_current_user)):
+    """Get password hashing pool latency, login rate limiter and token revocation statistics"""
+    return {
+        "password_hashing": password_pool.get_hash_stats(),
+        "login_limiter": login_limiter.get_limiter_stats(),
+        "refresh_tokens": refresh_tokens.get_revocation_stats(),
+    }
+
+@router.get("/write-behind")
+async def get_write_behind_stats(current_user: AdminUser = Depends(get_current_user)):
+    """Get write-behind queue statistics for public submissions"""
+    return write_behind.get_queue_stats()
+
 # Contact Requests Management
-@router.get("/contact-requests", response_model=List[ContactRequest])
+@router.get("/contact-requests", response_model=Page[ContactRequestSummary])
 async def get_all_contact_requests(
     status: Optional[str] = None,
-    limit: int = 50,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    before: Optional[str] = None,
     current_user: AdminUser = Depends(get_current_user),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
-    """Get all contact requests with optional filtering"""
+    """Get contact requests, newest first, one page at a time (message preview only)"""
     try:
         filter_query = {}
         if status:
             filter_query["status"] = status
             
-        cursor = db.contact_requests.find(filter_query).sort("created_at", -1).limit(limit)
-        requests = await cursor.to_list(limit)
+        requests, next_cursor, prev_cursor = await paginate(
+            db.contact_requests, filter_query, limit, after, before,
+            fields_projection(ContactRequestSummary, **CONTACT_REQUEST_SUMMARY_FIELDS)
+        )
         
-        return [ContactRequest(**req) for req in requests]
+        return json_response(list_body(
+            contact_page_adapter, ContactRequestSummary, requests, limit=limit, next_cursor=next_cursor, prev_cursor=prev_cursor
+        ))
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching contact requests: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch contact requests")
 
+@router.get("/contact-requests/{request_id}", response_model=ContactRequest)
+async def get_contact_request(
+    request_id: str,
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Get one contact request with its full message"""
+    try:
+        contact_request = await db.contact_requests.find_one({"id": request_id}, fields_projection(ContactRequest))
+        if not contact_request:
+            raise HTTPException(status_code=404, detail="Contact request not found")
+        
+        return json_response(item_body(ContactRequest, contact_request))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching contact request: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch contact request")
+
 @router.put("/contact-requests/{request_id}", response_model=ContactRequest)
 async def update_contact_request(
     request_id: str,
@@ -91,27 +199,23 @@ async def update_contact_request(
 ):
     """Update contact request status"""
     try:
-        # Find the request
-        existing_request = await db.contact_requests.find_one({"id": request_id})
-        if not existing_request:
+        # The previous state feeds the counters and analytics, the updated one is returned
+        changed = await update_tracked(
+            db.contact_requests, request_id, patch_fields(update_data), fields_projection(ContactRequest)
+        )
+        if not changed:
             raise HTTPException(status_code=404, detail="Contact request not found")
         
-        # Update fields
-        update_fields = {k: v for k, v in update_data.dict().items() if v is not None}
-        update_fields["updated_at"] = datetime.utcnow()
-        
-        # Update in database
-        await db.contact_requests.update_one(
-            {"id": request_id},
-            {"$set": update_fields}
+        existing_request, updated_request = changed
+        await dashboard_counters.contact_request_status_changed(
+            db, request_id, existing_request["status"], updated_request["status"]
         )
-        
-        # Get updated request
-        updated_request = await db.contact_requests.find_one({"id": request_id})
+        if existing_request["status"] != updated_request["status"]:
+            await analytics.invalidate(db, analytics.CONTACT_REQUEST_METRICS, existing_request["created_at"])
         
         logger.info(f"Contact request {request_id} updated by {current_user.username}")
         
-        return ContactRequest(**updated_request)
+        return json_response(item_body(ContactRequest, updated_request))
         
     except HTTPException:
         raise
@@ -119,28 +223,82 @@ async def update_contact_request(
         logger.error(f"Error updating contact request: {e}")
         raise HTTPException(status_code=500, detail="Failed to update contact request")
 
+@router.post("/contact-requests/bulk", response_model=BulkResult)
+async def bulk_update_contact_requests(
+    bulk: BulkRequest[ContactRequestUpdate],
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Update many contact requests in one bulk write"""
+    try:
+        result, applied = await apply_bulk(db.contact_requests, bulk, ("status", "created_at"))
+        
+        changed = [(before, after) for before, after in applied if before["status"] != after["status"]]
+        await dashboard_counters.contact_request_statuses_changed(
+            db, [(before["id"], before["status"], after["status"]) for before, after in changed]
+        )
+        await analytics.invalidate_many(db, analytics.CONTACT_REQUEST_METRICS, [before["created_at"] for before, _ in changed])
+        
+        logger.info(f"{result.updated} contact requests updated in bulk by {current_user.username}")
+        
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error bulk updating contact requests: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update contact requests")
+
 # Testimonials Management
-@router.get("/testimonials", response_model=List[Testimonial])
+@router.get("/testimonials", response_model=Page[Testimonial])
 async def get_all_testimonials(
     approved: Optional[bool] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    before: Optional[str] = None,
     current_user: AdminUser = Depends(get_current_user),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
-    """Get all testimonials with optional filtering"""
+    """Get testimonials, newest first, one page at a time"""
     try:
         filter_query = {}
         if approved is not None:
             filter_query["is_approved"] = approved
             
-        cursor = db.testimonials.find(filter_query).sort("created_at", -1)
-        testimonials = await cursor.to_list(100)
+        testimonials, next_cursor, prev_cursor = await paginate(
+            db.testimonials, filter_query, limit, after, before, fields_projection(Testimonial)
+        )
         
-        return [Testimonial(**testimonial) for testimonial in testimonials]
+        return json_response(list_body(
+            testimonial_page_adapter, Testimonial, testimonials, limit=limit, next_cursor=next_cursor, prev_cursor=prev_cursor
+        ))
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching testimonials: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch testimonials")
 
+@router.get("/testimonials/{testimonial_id}", response_model=Testimonial)
+async def get_testimonial(
+    testimonial_id: str,
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Get one testimonial"""
+    try:
+        testimonial = await db.testimonials.find_one({"id": testimonial_id}, fields_projection(Testimonial))
+        if not testimonial:
+            raise HTTPException(status_code=404, detail="Testimonial not found")
+        
+        return json_response(item_body(Testimonial, testimonial))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching testimonial: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch testimonial")
+
 @router.put("/testimonials/{testimonial_id}", response_model=Testimonial)
 async def update_testimonial(
     testimonial_id: str,
@@ -150,27 +308,23 @@ async def update_testimonial(
 ):
     """Update testimonial (approve/reject)"""
     try:
-        # Find the testimonial
-        existing_testimonial = await db.testimonials.find_one({"id": testimonial_id})
-        if not existing_testimonial:
+        # The previous approval feeds the counters and the cache invalidation
+        changed = await update_tracked(
+            db.testimonials, testimonial_id, patch_fields(update_data), fields_projection(Testimonial)
+        )
+        if not changed:
             raise HTTPException(status_code=404, detail="Testimonial not found")
         
-        # Update fields
-        update_fields = {k: v for k, v in update_data.dict().items() if v is not None}
-        update_fields["updated_at"] = datetime.utcnow()
-        
-        # Update in database
-        await db.testimonials.update_one(
-            {"id": testimonial_id},
-            {"$set": update_fields}
+        existing_testimonial, updated_testimonial = changed
+        await dashboard_counters.testimonial_approval_changed(
+            db, existing_testimonial["is_approved"], updated_testimonial["is_approved"]
         )
-        
-        # Get updated testimonial
-        updated_testimonial = await db.testimonials.find_one({"id": testimonial_id})
+        if existing_testimonial["is_approved"] or updated_testimonial["is_approved"]:
+            catalog_cache.invalidate(APPROVED_TESTIMONIALS_CACHE_KEY)
         
         logger.info(f"Testimonial {testimonial_id} updated by {current_user.username}")
         
-        return Testimonial(**updated_testimonial)
+        return json_response(item_body(Testimonial, updated_testimonial))
         
     except HTTPException:
         raise
@@ -178,19 +332,91 @@ async def update_testimonial(
         logger.error(f"Error updating testimonial: {e}")
         raise HTTPException(status_code=500, detail="Failed to update testimonial")
 
+@router.post("/testimonials/bulk", response_model=BulkResult)
+async def bulk_update_testimonials(
+    bulk: BulkRequest[TestimonialUpdate],
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Approve or reject many testimonials in one bulk write"""
+    try:
+        result, applied = await apply_bulk(db.testimonials, bulk, ("is_approved",))
+        
+        await dashboard_counters.testimonial_approvals_changed(
+            db, [(before["is_approved"], after["is_approved"]) for before, after in applied]
+        )
+        if any(before["is_approved"] or after["is_approved"] for before, after in applied):
+            catalog_cache.invalidate(APPROVED_TESTIMONIALS_CACHE_KEY)
+        
+        logger.info(f"{result.updated} testimonials updated in bulk by {current_user.username}")
+        
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error bulk updating testimonials: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update testimonials")
+
+# Bookings
+@router.get("/bookings", response_model=Page[Booking])
+async def get_all_bookings(
+    status: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Get bookings, newest first, one page at a time"""
+    try:
+        filter_query = {}
+        if status:
+            filter_query["status"] = status
+            
+        bookings, next_cursor, prev_cursor = await paginate(
+            db.bookings, filter_query, limit, after, before, fields_projection(Booking)
+        )
+        
+        return json_response(list_body(
+            booking_page_adapter, Booking, bookings, limit=limit, next_cursor=next_cursor, prev_cursor=prev_cursor
+        ))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching bookings: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch bookings")
+
 # Gallery Management
-@router.get("/gallery", response_model=List[GalleryItem])
+@router.get("/gallery", response_model=Page[GalleryItemSummary])
 async def get_gallery_items(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    before: Optional[str] = None,
     current_user: AdminUser = Depends(get_current_user),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
-    """Get all gallery items"""
+    """Get gallery items, newest first, one page at a time"""
     try:
-        cursor = db.gallery_items.find({}).sort("created_at", -1)
-        items = await cursor.to_list(100)
+        items, next_cursor, prev_cursor = await paginate(
+            db.gallery_items, {}, limit, after, before, fields_projection(GalleryItemSummary)
+        )
         
-        return [GalleryItem(**item) for item in items]
+        body = list_body(
+            gallery_page_adapter, GalleryItemSummary, items, limit=limit, next_cursor=next_cursor, prev_cursor=prev_cursor
+        )
         
+        return conditional_response(
+            request,
+            body,
+            PRIVATE_CACHE_CONTROL,
+            last_modified=max_updated_at(items)
+        )
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching gallery items: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch gallery items")
@@ -209,6 +435,7 @@ async def create_gallery_item(
         )
         
         await db.gallery_items.insert_one(gallery_item.dict())
+        await dashboard_counters.gallery_item_activity_changed(db, False, gallery_item.is_active)
         
         logger.info(f"Gallery item created by {current_user.username}")
         
@@ -218,6 +445,26 @@ async def create_gallery_item(
         logger.error(f"Error creating gallery item: {e}")
         raise HTTPException(status_code=500, detail="Failed to create gallery item")
 
+@router.get("/gallery/{item_id}", response_model=GalleryItem)
+async def get_gallery_item(
+    item_id: str,
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Get one gallery item with its media metadata"""
+    try:
+        item = await db.gallery_items.find_one({"id": item_id}, fields_projection(GalleryItem))
+        if not item:
+            raise HTTPException(status_code=404, detail="Gallery item not found")
+        
+        return json_response(item_body(GalleryItem, item))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching gallery item: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch gallery item")
+
 @router.put("/gallery/{item_id}", response_model=GalleryItem)
 async def update_gallery_item(
     item_id: str,
@@ -227,27 +474,21 @@ async def update_gallery_item(
 ):
     """Update gallery item"""
     try:
-        # Find the item
-        existing_item = await db.gallery_items.find_one({"id": item_id})
-        if not existing_item:
+        # The previous activity feeds the counters
+        changed = await update_tracked(
+            db.gallery_items, item_id, patch_fields(update_data), fields_projection(GalleryItem)
+        )
+        if not changed:
             raise HTTPException(status_code=404, detail="Gallery item not found")
         
-        # Update fields
-        update_fields = {k: v for k, v in update_data.dict().items() if v is not None}
-        update_fields["updated_at"] = datetime.utcnow()
-        
-        # Update in database
-        await db.gallery_items.update_one(
-            {"id": item_id},
-            {"$set": update_fields}
+        existing_item, updated_item = changed
+        await dashboard_counters.gallery_item_activity_changed(
+            db, existing_item.get("is_active", True), updated_item.get("is_active", True)
         )
         
-        # Get updated item
-        updated_item = await db.gallery_items.find_one({"id": item_id})
-        
         logger.info(f"Gallery item {item_id} updated by {current_user.username}")
         
-        return GalleryItem(**updated_item)
+        return json_response(item_body(GalleryItem, updated_item))
         
     except HTTPException:
         raise
@@ -255,6 +496,38 @@ async def update_gallery_item(
         logger.error(f"Error updating gallery item: {e}")
         raise HTTPException(status_code=500, detail="Failed to update gallery item")
 
+@router.post("/gallery/bulk", response_model=BulkResult)
+async def bulk_update_gallery_items(
+    bulk: BulkRequest[GalleryItemUpdate],
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Update or delete many gallery items in one bulk write"""
+    try:
+        result, applied = await apply_bulk(db.gallery_items, bulk, ("is_active", "content_hash"), allow_delete=True)
+        
+        await dashboard_counters.gallery_items_activity_changed(db, [
+            (before.get("is_active", True), after.get("is_active", True) if after else False)
+            for before, after in applied
+        ])
+        
+        # Uploaded files are shared by content: only the last reference removes them
+        for before, after in applied:
+            if after is None and before.get("content_hash"):
+                await blob_store.release_blob(db, before["content_hash"])
+        
+        logger.info(
+            f"{result.updated} gallery items updated and {result.deleted} deleted in bulk by {current_user.username}"
+        )
+        
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error bulk updating gallery items: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update gallery items")
+
 @router.delete("/gallery/{item_id}")
 async def delete_gallery_item(
     item_id: str,
@@ -263,11 +536,17 @@ async def delete_gallery_item(
 ):
     """Delete gallery item"""
     try:
-        result = await db.gallery_items.delete_one({"id": item_id})
+        deleted_item = await db.gallery_items.find_one_and_delete({"id": item_id})
         
-        if result.deleted_count == 0:
+        if deleted_item is None:
             raise HTTPException(status_code=404, detail="Gallery item not found")
         
+        await dashboard_counters.gallery_item_activity_changed(db, deleted_item.get("is_active", True), False)
+        
+        # Uploaded files are shared by content: only the last reference removes them
+        if deleted_item.get("content_hash"):
+            await blob_store.release_blob(db, deleted_item["content_hash"])
+        
         logger.info(f"Gallery item {item_id} deleted by {current_user.username}")
         
         return {"message": "Gallery item deleted successfully"}
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, HTTPException, Depends
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from datetime import datetime, timezone
+from typing import Optional
+from models.admin_models import AdminUser
+from routers.auth import get_current_user
+from services.database import get_database
+from services import analytics
+import logging
+
+router = APIRouter(prefix="/api/admin/analytics", tags=["analytics"])
+logger = logging.getLogger(__name__)
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Stored dates are naive UTC: convert offset-aware bounds before dropping the offset"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+@router.get("/{metric}")
+async def get_analytics_series(
+    metric: str,
+    granularity: str = "week",
+    group_by: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Get a time series of contact requests, bookings or conversion, bucketed by day/week/month"""
+    try:
+        if metric not in analytics.METRICS:
+            raise HTTPException(status_code=404, detail=f"Unknown metric. Must be one of: {list(analytics.METRICS)}")
+        if granularity not in analytics.GRANULARITIES:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid granularity. Must be one of: {list(analytics.GRANULARITIES)}"
+            )
+        dimensions = analytics.METRICS[metric]["dimensions"]
+        if group_by is not None and group_by not in dimensions:
+            raise HTTPException(status_code=400, detail=f"Invalid group_by. Must be one of: {list(dimensions)}")
+        
+        start = naive_utc(start)
+        end = naive_utc(end)
+        
+        try:
+            series = await analytics.get_series(db, metric, granularity, group_by, start, end)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        return {
+            "metric": metric,
+            "granularity": granularity,
+            "group_by": group_by,
+            "series": series
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error computing analytics for {metric}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to compute analytics")
\ No newline at end of file
@@ -1,20 +1,41 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from models.admin_models import AdminUser, LoginRequest, Token
-from services.auth_service import verify_password, create_access_token, verify_token, ACCESS_TOKEN_EXPIRE_MINUTES
+from models.admin_models import AdminUser, LoginRequest, RefreshRequest, Token
+from services.auth_service import create_access_token, principal_claims, verify_token, ACCESS_TOKEN_EXPIRE_MINUTES
+from services.database import get_database
+from services.password_pool import PasswordPoolBusy, verify_password_async
+from services.refresh_tokens import RefreshTokenError
+from services import login_limiter, principal_cache, refresh_tokens
 from datetime import timedelta
+from typing import Optional
+import asyncio
 import logging
-import os
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
-async def get_database() -> AsyncIOMotorDatabase:
-    from motor.motor_asyncio import AsyncIOMotorClient
-    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
-    return client[os.environ['DB_NAME']]
+async def load_principal(db: AsyncIOMotorDatabase, username: str) -> Optional[AdminUser]:
+    """Admin user from the principal cache, loaded from the database when missing"""
+    async def load_user():
+        document = await db.admin_users.find_one({"username": username})
+        return AdminUser(**document) if document else None
+    
+    return await principal_cache.get_or_load(username, load_user)
+
+def issue_tokens(user: dict, refresh_token: str) -> dict:
+    """Token response with a fresh access token"""
+    access_token = create_access_token(
+        data=principal_claims(user),
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        "refresh_token": refresh_token
+    }
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -29,44 +50,78 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Get user from database
-    user = await db.admin_users.find_one({"username": token_data["username"]})
+    # Trusted token claims, else the cached principal, else the database
+    user = principal_cache.from_claims(token_data)
+    if user is not None:
+        return user
+    
+    user = await load_principal(db, token_data["username"])
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
     
-    if not user.get("is_active", True):
+    if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Inactive user",
         )
     
-    return AdminUser(**user)
+    return user
 
 @router.post("/login", response_model=Token)
 async def login(
     login_data: LoginRequest,
+    request: Request,
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Authenticate user and return access token"""
+    client_ip = login_limiter.client_ip(request)
     try:
+        # Locked out clients are refused before any bcrypt work
+        wait = login_limiter.retry_after(client_ip, login_data.username)
+        if wait > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many failed login attempts, try again later",
+                headers=login_limiter.retry_after_header(wait),
+            )
+        
+        # A username failing from many addresses is slowed down, never locked
+        delay = login_limiter.login_delay(login_data.username)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        
         # Find user by username
         user = await db.admin_users.find_one({"username": login_data.username})
         if not user:
+            login_limiter.record_failure(client_ip, login_data.username)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
             )
         
-        # Verify password
-        if not verify_password(login_data.password, user["hashed_password"]):
+        # Verify password in the bounded hashing pool
+        try:
+            password_ok = await verify_password_async(login_data.password, user["hashed_password"])
+        except PasswordPoolBusy:
+            logger.warning("Password hashing pool saturated, login refused")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service busy, try again later",
+                headers={"Retry-After": "1"},
+            )
+        
+        if not password_ok:
+            login_limiter.record_failure(client_ip, login_data.username)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
             )
         
+        login_limiter.record_success(client_ip, login_data.username)
+        
         # Check if user is active
         if not user.get("is_active", True):
             raise HTTPException(
@@ -74,20 +129,10 @@ async def login(
                 detail="Inactive user",
             )
         
-        # Create access token
-        access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={"sub": user["username"]},
-            expires_delta=access_token_expires
-        )
-        
         logger.info(f"User {login_data.username} logged in successfully")
         
-        return {
-            "access_token": access_token,
-            "token_type": "bearer",
-            "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60
-        }
+        # A new refresh token family starts at every login
+        return issue_tokens(user, refresh_tokens.create_refresh_token(user["username"]))
         
     except HTTPException:
         raise
@@ -103,7 +148,51 @@ async def get_current_user_info(current_user: AdminUser = Depends(get_current_us
     """Get current user information"""
     return current_user
 
+@router.post("/refresh", response_model=Token)
+async def refresh(
+    refresh_data: RefreshRequest,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Exchange a refresh token for a new access token and the next refresh token"""
+    try:
+        try:
+            claims = await refresh_tokens.rotate(db, refresh_data.refresh_token)
+        except RefreshTokenError as e:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=str(e),
+            )
+        
+        # Deactivated or deleted admins can't renew their session
+        user = await load_principal(db, claims["sub"])
+        if user is None or not user.is_active:
+            await refresh_tokens.revoke_family(db, claims, "inactive")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Inactive user",
+            )
+        
+        return issue_tokens(user.dict(), claims["next_token"])
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Token refresh error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Token refresh failed"
+        )
+
 @router.post("/logout")
-async def logout():
-    """Logout user (client should delete token)"""
+async def logout(
+    refresh_data: Optional[RefreshRequest] = None,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Logout user (revokes the session's refresh tokens, client should delete its tokens)"""
+    if refresh_data is not None:
+        try:
+            claims = refresh_tokens.decode_refresh_token(refresh_data.refresh_token)
+            await refresh_tokens.revoke_family(db, claims, "logout")
+        except RefreshTokenError:
+            pass
     return {"message": "Successfully logged out"}
\ No newline at end of file
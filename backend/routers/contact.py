@@ -1,37 +1,51 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import TypeAdapter
 from typing import List
 from models.contact_models import ContactRequest, ContactRequestCreate, Booking, BookingCreate
+from services.database import get_database
+from services import analytics, dashboard_counters, write_behind
+from services.serialization import fields_projection, json_response, list_body
 import logging
-import os
 
 router = APIRouter(prefix="/api", tags=["contact"])
 logger = logging.getLogger(__name__)
 
-async def get_database() -> AsyncIOMotorDatabase:
-    from motor.motor_asyncio import AsyncIOMotorClient
-    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
-    return client[os.environ['DB_NAME']]
+contact_requests_adapter = TypeAdapter(List[ContactRequest])
 
 @router.post("/contact-request", response_model=ContactRequest)
 async def create_contact_request(
     contact_data: ContactRequestCreate, 
+    response: Response,
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
-    """Create a new contact request"""
+    """Create a new contact request (202 when accepted for a batched insert)"""
     try:
         # Create contact request object
         contact_request = ContactRequest(**contact_data.dict())
         
+        if write_behind.is_enabled():
+            try:
+                await write_behind.submit("contact_requests", contact_request)
+            except write_behind.QueueFull:
+                raise HTTPException(status_code=503, detail="Too many submissions, please retry", headers={"Retry-After": "5"})
+            
+            response.status_code = 202
+            logger.info(f"New contact request accepted: {contact_request.id}")
+            return contact_request
+        
         # Insert into database
         result = await db.contact_requests.insert_one(contact_request.dict())
         
         if result.inserted_id:
+            await dashboard_counters.contact_request_created(db, contact_request.dict())
             logger.info(f"New contact request created: {contact_request.id}")
             return contact_request
         else:
             raise HTTPException(status_code=500, detail="Failed to create contact request")
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating contact request: {e}")
         raise HTTPException(status_code=500, detail="Error creating contact request")
@@ -47,10 +61,10 @@ async def get_contact_requests(
         if status:
             filter_query["status"] = status
             
-        cursor = db.contact_requests.find(filter_query).sort("created_at", -1)
+        cursor = db.contact_requests.find(filter_query, fields_projection(ContactRequest)).sort("created_at", -1)
         requests = await cursor.to_list(length=100)
         
-        return [ContactRequest(**req) for req in requests]
+        return json_response(list_body(contact_requests_adapter, ContactRequest, requests))
         
     except Exception as e:
         logger.error(f"Error fetching contact requests: {e}")
@@ -75,6 +89,9 @@ async def create_booking(
         result = await db.bookings.insert_one(booking.dict())
         
         if result.inserted_id:
+            await dashboard_counters.booking_created(db)
+            # The request's conversion bucket may already be cached
+            await analytics.invalidate(db, ("conversion",), contact_request["created_at"])
             logger.info(f"New booking created: {booking.id}")
             return booking
         else:
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Response
+from services import metrics
+import logging
+
+router = APIRouter(tags=["metrics"])
+logger = logging.getLogger(__name__)
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus metrics of this process"""
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
\ No newline at end of file
@@ -1,42 +1,71 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import List
+from pydantic import TypeAdapter
+from typing import List, Optional, Tuple
+from datetime import datetime
 from models.event_models import EventPackage, PhotoboothPackage, AdditionalService
+from services.database import get_database
+from services import catalog_cache
+from services.http_cache import conditional_response, max_updated_at, CATALOG_CACHE_CONTROL
 import logging
-import os
 
 router = APIRouter(prefix="/api/packages", tags=["packages"])
 logger = logging.getLogger(__name__)
 
-async def get_database() -> AsyncIOMotorDatabase:
-    from motor.motor_asyncio import AsyncIOMotorClient
-    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
-    return client[os.environ['DB_NAME']]
+event_packages_adapter = TypeAdapter(List[EventPackage])
+
+async def load_event_packages(db: AsyncIOMotorDatabase, query: dict) -> Tuple[bytes, Optional[datetime]]:
+    """Fetch event packages and serialize them to JSON"""
+    cursor = db.event_packages.find(query)
+    packages = await cursor.to_list(length=100)
+    
+    body = event_packages_adapter.dump_json([EventPackage(**pkg) for pkg in packages])
+    return body, max_updated_at(packages)
 
 @router.get("/{event_type}", response_model=List[EventPackage])
-async def get_event_packages(event_type: str, db: AsyncIOMotorDatabase = Depends(get_database)):
+async def get_event_packages(event_type: str, request: Request, db: AsyncIOMotorDatabase = Depends(get_database)):
     """Get all packages for a specific event type"""
     try:
         valid_types = ["mariage", "anniversaire", "bapteme"]
         if event_type not in valid_types:
             raise HTTPException(status_code=400, detail=f"Invalid event type. Must be one of: {valid_types}")
         
-        cursor = db.event_packages.find({"type": event_type, "is_active": True})
-        packages = await cursor.to_list(length=100)
+        entry = await catalog_cache.get_or_load(
+            f"packages:{event_type}",
+            lambda: load_event_packages(db, {"type": event_type, "is_active": True})
+        )
         
-        return [EventPackage(**pkg) for pkg in packages]
+        return conditional_response(
+            request,
+            entry.body,
+            CATALOG_CACHE_CONTROL,
+            etag=entry.etag,
+            last_modified=entry.last_modified,
+            variants=entry.variants
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching packages for type {event_type}: {e}")
         raise HTTPException(status_code=500, detail="Error fetching packages")
 
 @router.get("/", response_model=List[EventPackage])
-async def get_all_event_packages(db: AsyncIOMotorDatabase = Depends(get_database)):
+async def get_all_event_packages(request: Request, db: AsyncIOMotorDatabase = Depends(get_database)):
     """Get all active event packages"""
     try:
-        cursor = db.event_packages.find({"is_active": True})
-        packages = await cursor.to_list(length=100)
+        entry = await catalog_cache.get_or_load(
+            "packages:all",
+            lambda: load_event_packages(db, {"is_active": True})
+        )
         
-        return [EventPackage(**pkg) for pkg in packages]
+        return conditional_response(
+            request,
+            entry.body,
+            CATALOG_CACHE_CONTROL,
+            etag=entry.etag,
+            last_modified=entry.last_modified,
+            variants=entry.variants
+        )
     except Exception as e:
         logger.error(f"Error fetching all packages: {e}")
         raise HTTPException(status_code=500, detail="Error fetching packages")
\ No newline at end of file
@@ -1,38 +1,74 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import List
+from pydantic import TypeAdapter
+from typing import List, Optional, Tuple
+from datetime import datetime
 from models.event_models import PhotoboothPackage, AdditionalService
+from services.database import get_database
+from services import catalog_cache
+from services.http_cache import conditional_response, max_updated_at, CATALOG_CACHE_CONTROL
 import logging
-import os
 
 router = APIRouter(prefix="/api", tags=["photobooth"])
 logger = logging.getLogger(__name__)
 
-async def get_database() -> AsyncIOMotorDatabase:
-    from motor.motor_asyncio import AsyncIOMotorClient
-    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
-    return client[os.environ['DB_NAME']]
+photobooth_packages_adapter = TypeAdapter(List[PhotoboothPackage])
+additional_services_adapter = TypeAdapter(List[AdditionalService])
+
+async def load_photobooth_packages(db: AsyncIOMotorDatabase) -> Tuple[bytes, Optional[datetime]]:
+    """Fetch active photobooth packages and serialize them to JSON"""
+    cursor = db.photobooth_packages.find({"is_active": True})
+    packages = await cursor.to_list(length=100)
+    
+    body = photobooth_packages_adapter.dump_json([PhotoboothPackage(**pkg) for pkg in packages])
+    return body, max_updated_at(packages)
+
+async def load_additional_services(db: AsyncIOMotorDatabase) -> Tuple[bytes, Optional[datetime]]:
+    """Fetch active additional services and serialize them to JSON"""
+    cursor = db.additional_services.find({"is_active": True})
+    services = await cursor.to_list(length=100)
+    
+    body = additional_services_adapter.dump_json([AdditionalService(**service) for service in services])
+    return body, max_updated_at(services)
 
 @router.get("/photobooth-packages", response_model=List[PhotoboothPackage])
-async def get_photobooth_packages(db: AsyncIOMotorDatabase = Depends(get_database)):
+async def get_photobooth_packages(request: Request, db: AsyncIOMotorDatabase = Depends(get_database)):
     """Get all active photobooth packages"""
     try:
-        cursor = db.photobooth_packages.find({"is_active": True})
-        packages = await cursor.to_list(length=100)
+        entry = await catalog_cache.get_or_load(
+            "photobooth-packages",
+            lambda: load_photobooth_packages(db)
+        )
         
-        return [PhotoboothPackage(**pkg) for pkg in packages]
+        return conditional_response(
+            request,
+            entry.body,
+            CATALOG_CACHE_CONTROL,
+            etag=entry.etag,
+            last_modified=entry.last_modified,
+            variants=entry.variants
+        )
     except Exception as e:
         logger.error(f"Error fetching photobooth packages: {e}")
         raise HTTPException(status_code=500, detail="Error fetching photobooth packages")
 
 @router.get("/additional-services", response_model=List[AdditionalService])
-async def get_additional_services(db: AsyncIOMotorDatabase = Depends(get_database)):
+async def get_additional_services(request: Request, db: AsyncIOMotorDatabase = Depends(get_database)):
     """Get all active additional services"""
     try:
-        cursor = db.additional_services.find({"is_active": True})
-        services = await cursor.to_list(length=100)
+        entry = await catalog_cache.get_or_load(
+            "additional-services",
+            lambda: load_additional_services(db)
+        )
         
-        return [AdditionalService(**service) for service in services]
+        return conditional_response(
+            request,
+            entry.body,
+            CATALOG_CACHE_CONTROL,
+            etag=entry.etag,
+            last_modified=entry.last_modified,
+            variants=entry.variants
+        )
     except Exception as e:
         logger.error(f"Error fetching additional services: {e}")
         raise HTTPException(status_code=500, detail="Error fetching additional services")
\ No newline at end of file
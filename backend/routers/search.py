@@ -0,0 +1,119 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import TypeAdapter
+from typing import Optional
+from models.admin_models import AdminUser, GalleryItemSummary
+from models.contact_models import CONTACT_REQUEST_SUMMARY_FIELDS, ContactRequestSummary, Testimonial
+from models.pagination_models import SearchResults
+from routers.auth import get_current_user
+from services.database import get_database
+from services.pagination import DEFAULT_PAGE_SIZE
+from services.search import MAX_SEARCH_LIMIT, search
+from services.serialization import fields_projection, json_response, list_body
+import logging
+
+router = APIRouter(prefix="/api/admin/search", tags=["search"])
+logger = logging.getLogger(__name__)
+
+gallery_results_adapter = TypeAdapter(SearchResults[GalleryItemSummary])
+contact_results_adapter = TypeAdapter(SearchResults[ContactRequestSummary])
+testimonial_results_adapter = TypeAdapter(SearchResults[Testimonial])
+
+@router.get("/gallery", response_model=SearchResults[GalleryItemSummary])
+async def search_gallery_items(
+    q: Optional[str] = None,
+    file_type: Optional[str] = None,
+    event_type: Optional[str] = None,
+    is_featured: Optional[bool] = None,
+    is_active: Optional[bool] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_SEARCH_LIMIT),
+    offset: int = Query(0, ge=0),
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Search gallery items by title/description, ranked by relevance, with facet counts"""
+    try:
+        filters = {}
+        if file_type:
+            filters["file_type"] = file_type
+        if event_type:
+            filters["event_type"] = event_type
+        if is_featured is not None:
+            filters["is_featured"] = is_featured
+        if is_active is not None:
+            filters["is_active"] = is_active
+        
+        items, total, facets = await search(
+            db.gallery_items, q, filters, ("file_type", "event_type", "is_featured"), limit, offset,
+            fields_projection(GalleryItemSummary)
+        )
+        
+        return json_response(list_body(
+            gallery_results_adapter, GalleryItemSummary, items, total=total, limit=limit, offset=offset, facets=facets
+        ))
+        
+    except Exception as e:
+        logger.error(f"Error searching gallery items: {e}")
+        raise HTTPException(status_code=500, detail="Failed to search gallery items")
+
+@router.get("/contact-requests", response_model=SearchResults[ContactRequestSummary])
+async def search_contact_requests(
+    q: Optional[str] = None,
+    status: Optional[str] = None,
+    event_type: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_SEARCH_LIMIT),
+    offset: int = Query(0, ge=0),
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Search contact requests by name/email/message, ranked by relevance, with facet counts"""
+    try:
+        filters = {}
+        if status:
+            filters["status"] = status
+        if event_type:
+            filters["event_type"] = event_type
+        
+        requests, total, facets = await search(
+            db.contact_requests, q, filters, ("status", "event_type"), limit, offset,
+            fields_projection(ContactRequestSummary, **CONTACT_REQUEST_SUMMARY_FIELDS)
+        )
+        
+        return json_response(list_body(
+            contact_results_adapter, ContactRequestSummary, requests, total=total, limit=limit, offset=offset, facets=facets
+        ))
+        
+    except Exception as e:
+        logger.error(f"Error searching contact requests: {e}")
+        raise HTTPException(status_code=500, detail="Failed to search contact requests")
+
+@router.get("/testimonials", response_model=SearchResults[Testimonial])
+async def search_testimonials(
+    q: Optional[str] = None,
+    approved: Optional[bool] = None,
+    rating: Optional[int] = Query(None, ge=1, le=5),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_SEARCH_LIMIT),
+    offset: int = Query(0, ge=0),
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Search testimonials by name/event/text, ranked by relevance, with facet counts"""
+    try:
+        filters = {}
+        if approved is not None:
+            filters["is_approved"] = approved
+        if rating is not None:
+            filters["rating"] = rating
+        
+        testimonials, total, facets = await search(
+            db.testimonials, q, filters, ("is_approved", "rating"), limit, offset,
+            fields_projection(Testimonial)
+        )
+        
+        return json_response(list_body(
+            testimonial_results_adapter, Testimonial, testimonials, total=total, limit=limit, offset=offset, facets=facets
+        ))
+        
+    except Exception as e:
+        logger.error(f"Error searching testimonials: {e}")
+        raise HTTPException(status_code=500, detail="Failed to search testimonials")
\ No newline at end of file
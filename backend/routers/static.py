@@ -1,43 +1,41 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
-from pathlib import Path
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import RedirectResponse
+from services.media_server import get_media_file, is_safe_filename, serve_media_file
+from services.storage import LocalStorage, get_storage
 import logging
-import mimetypes
 
 router = APIRouter(prefix="/uploads", tags=["static"])
 logger = logging.getLogger(__name__)
 
-UPLOAD_DIR = Path("/app/uploads")
+# How long browsers may reuse a redirect to object storage (presigned URLs last longer)
+REDIRECT_CACHE_CONTROL = "private, max-age=300"
 
-@router.get("/{file_type}/{filename}")
-async def get_uploaded_file(file_type: str, filename: str):
-    """Serve uploaded files"""
+MEDIA_DIRECTORIES = {"image", "video", "derived"}
+
+@router.api_route("/{file_type}/{filename}", methods=["GET", "HEAD"])
+async def get_uploaded_file(file_type: str, filename: str, request: Request):
+    """Serve uploaded files (supports Range, If-Range and conditional requests)"""
     try:
         # Validate file type
-        if file_type not in ["image", "video"]:
+        if file_type not in MEDIA_DIRECTORIES:
             raise HTTPException(status_code=400, detail="Invalid file type")
         
-        # Construct file path
-        file_path = UPLOAD_DIR / file_type / filename
+        # The name must not be able to leave the directory (checked without touching the disk)
+        if not is_safe_filename(filename):
+            raise HTTPException(status_code=403, detail="Access denied")
         
-        # Check if file exists
-        if not file_path.exists():
-            raise HTTPException(status_code=404, detail="File not found")
+        storage = get_storage()
         
-        # Check if file is within allowed directory (security)
-        try:
-            file_path.resolve().relative_to(UPLOAD_DIR.resolve())
-        except ValueError:
-            raise HTTPException(status_code=403, detail="Access denied")
+        # Object storage: send the client to the bucket so the bytes never go through the API
+        if not isinstance(storage, LocalStorage):
+            url = await storage.download_url(f"{file_type}/{filename}")
+            return RedirectResponse(url, status_code=307, headers={"Cache-Control": REDIRECT_CACHE_CONTROL})
         
-        # Guess media type
-        media_type, _ = mimetypes.guess_type(str(file_path))
+        media_file = await get_media_file(storage.path(f"{file_type}/{filename}"))
+        if media_file is None:
+            raise HTTPException(status_code=404, detail="File not found")
         
-        return FileResponse(
-            path=str(file_path),
-            media_type=media_type,
-            headers={"Cache-Control": "public, max-age=3600"}  # 1 hour cache
-        )
+        return serve_media_file(request, media_file)
         
     except HTTPException:
         raise
@@ -1,26 +1,47 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import List
+from pydantic import TypeAdapter
+from typing import List, Optional, Tuple
+from datetime import datetime
 from models.contact_models import Testimonial, TestimonialCreate
+from services.database import get_database
+from services import catalog_cache, dashboard_counters, write_behind
+from services.http_cache import conditional_response, max_updated_at, TESTIMONIALS_CACHE_CONTROL
+from services.serialization import fields_projection, list_body
 import logging
-import os
 
 router = APIRouter(prefix="/api", tags=["testimonials"])
 logger = logging.getLogger(__name__)
 
-async def get_database() -> AsyncIOMotorDatabase:
-    from motor.motor_asyncio import AsyncIOMotorClient
-    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
-    return client[os.environ['DB_NAME']]
+testimonials_adapter = TypeAdapter(List[Testimonial])
+
+# Catalog cache key of the public list, dropped whenever an approval changes
+APPROVED_TESTIMONIALS_CACHE_KEY = "testimonials:approved"
+
+async def load_approved_testimonials(db: AsyncIOMotorDatabase) -> Tuple[bytes, Optional[datetime]]:
+    """Fetch approved testimonials and serialize them to JSON"""
+    cursor = db.testimonials.find({"is_approved": True}, fields_projection(Testimonial)).sort("created_at", -1)
+    testimonials = await cursor.to_list(length=100)
+    
+    return list_body(testimonials_adapter, Testimonial, testimonials), max_updated_at(testimonials)
 
 @router.get("/testimonials", response_model=List[Testimonial])
-async def get_approved_testimonials(db: AsyncIOMotorDatabase = Depends(get_database)):
+async def get_approved_testimonials(request: Request, db: AsyncIOMotorDatabase = Depends(get_database)):
     """Get all approved testimonials"""
     try:
-        cursor = db.testimonials.find({"is_approved": True}).sort("created_at", -1)
-        testimonials = await cursor.to_list(length=100)
+        entry = await catalog_cache.get_or_load(
+            APPROVED_TESTIMONIALS_CACHE_KEY,
+            lambda: load_approved_testimonials(db)
+        )
         
-        return [Testimonial(**testimonial) for testimonial in testimonials]
+        return conditional_response(
+            request,
+            entry.body,
+            TESTIMONIALS_CACHE_CONTROL,
+            etag=entry.etag,
+            last_modified=entry.last_modified,
+            variants=entry.variants
+        )
         
     except Exception as e:
         logger.error(f"Error fetching testimonials: {e}")
@@ -29,22 +50,36 @@ async def get_approved_testimonials(db: AsyncIOMotorDatabase = Depends(get_datab
 @router.post("/testimonials", response_model=Testimonial)
 async def create_testimonial(
     testimonial_data: TestimonialCreate,
+    response: Response,
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
-    """Create a new testimonial (requires admin approval)"""
+    """Create a new testimonial (requires admin approval, 202 when accepted for a batched insert)"""
     try:
         # Create testimonial (not approved by default)
         testimonial = Testimonial(**testimonial_data.dict(), is_approved=False)
         
+        if write_behind.is_enabled():
+            try:
+                await write_behind.submit("testimonials", testimonial)
+            except write_behind.QueueFull:
+                raise HTTPException(status_code=503, detail="Too many submissions, please retry", headers={"Retry-After": "5"})
+            
+            response.status_code = 202
+            logger.info(f"New testimonial accepted: {testimonial.id} (pending approval)")
+            return testimonial
+        
         # Insert into database
         result = await db.testimonials.insert_one(testimonial.dict())
         
         if result.inserted_id:
+            await dashboard_counters.testimonial_created(db, testimonial.is_approved)
             logger.info(f"New testimonial created: {testimonial.id} (pending approval)")
             return testimonial
         else:
             raise HTTPException(status_code=500, detail="Failed to create testimonial")
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating testimonial: {e}")
         raise HTTPException(status_code=500, detail="Error creating testimonial")
\ No newline at end of file
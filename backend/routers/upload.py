@@ -1,21 +1,33 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Request
+from starlette.concurrency import run_in_threadpool
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from models.admin_models import AdminUser
+from pymongo import ReturnDocument
+from models.admin_models import (
+    AdminUser, DirectUploadCreate, GalleryItem, UploadSession, UploadSessionCreate, UploadSessionStatus
+)
 from routers.auth import get_current_user
+from services.database import get_database
+from services import blob_store, dashboard_counters, media_jobs, metrics
+from services.storage import SCRATCH_DIR, UPLOAD_DIR, get_storage, remove_quietly
 import os
-import shutil
 import uuid
+import base64
+import shutil
+import asyncio
 import logging
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 import mimetypes
 
 router = APIRouter(prefix="/api/upload", tags=["upload"])
 logger = logging.getLogger(__name__)
 
-# Upload directory
-UPLOAD_DIR = Path("/app/uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
+# Partially written uploads live here until they are complete
+UPLOAD_TMP_DIR = SCRATCH_DIR
+
+# Chunks of resumable uploads, one directory per session
+UPLOAD_SESSIONS_DIR = UPLOAD_TMP_DIR / "sessions"
 
 # Allowed file types
 ALLOWED_IMAGE_TYPES = {
@@ -29,10 +41,16 @@ ALL_ALLOWED_TYPES = ALLOWED_IMAGE_TYPES | ALLOWED_VIDEO_TYPES
 # Max file size (50MB)
 MAX_FILE_SIZE = 50 * 1024 * 1024
 
-async def get_database() -> AsyncIOMotorDatabase:
-    from motor.motor_asyncio import AsyncIOMotorClient
-    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
-    return client[os.environ['DB_NAME']]
+# Uploads are copied to disk in chunks of this size (1MB)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Resumable uploads (1GB max, 8MB chunks by default, abandoned after 24h)
+MAX_RESUMABLE_FILE_SIZE = 1024 * 1024 * 1024
+DEFAULT_RESUMABLE_CHUNK_SIZE = 8 * 1024 * 1024
+MIN_RESUMABLE_CHUNK_SIZE = 1024 * 1024
+MAX_RESUMABLE_CHUNK_SIZE = 64 * 1024 * 1024
+UPLOAD_SESSION_TTL = timedelta(hours=24)
+UPLOAD_SESSION_GC_INTERVAL_SECONDS = 15 * 60
 
 def get_file_type(content_type: str) -> str:
     """Determine if file is image or video"""
@@ -43,61 +61,90 @@ def get_file_type(content_type: str) -> str:
     else:
         raise ValueError("Unsupported file type")
 
-def validate_file(file: UploadFile) -> None:
-    """Validate uploaded file"""
-    # Check content type
-    if file.content_type not in ALL_ALLOWED_TYPES:
+def file_too_large() -> HTTPException:
+    """Error raised when an upload exceeds MAX_FILE_SIZE"""
+    return HTTPException(
+        status_code=400,
+        detail=f"Fichier trop volumineux. Taille maximum: {MAX_FILE_SIZE // (1024*1024)}MB"
+    )
+
+def validate_content_type(content_type: str) -> None:
+    """Reject content types that are neither supported images nor videos"""
+    if content_type not in ALL_ALLOWED_TYPES:
         raise HTTPException(
             status_code=400, 
             detail=f"Type de fichier non supporté. Types autorisés: {', '.join(ALL_ALLOWED_TYPES)}"
         )
+
+def validate_file(file: UploadFile) -> None:
+    """Validate uploaded file"""
+    # Check content type
+    validate_content_type(file.content_type)
     
     # Check file size (this is approximate, actual check happens during read)
     if hasattr(file, 'size') and file.size and file.size > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Fichier trop volumineux. Taille maximum: {MAX_FILE_SIZE // (1024*1024)}MB"
-        )
+        raise file_too_large()
+
+def file_extension(filename: Optional[str], content_type: str) -> str:
+    """Extension of the original filename, guessed from the content type when missing"""
+    extension = Path(filename or "").suffix.lower()
+    if not extension:
+        # Try to guess extension from content type
+        extension = mimetypes.guess_extension(content_type) or ".bin"
+    
+    return extension
+
+async def stream_to_temp_file(file: UploadFile, max_size: int = MAX_FILE_SIZE) -> tuple[Path, int, str]:
+    """Copy an upload to a temporary file chunk by chunk and return its path, size and SHA-256
 
-async def save_file(file: UploadFile, file_type: str) -> tuple[str, str]:
-    """Save uploaded file and return file path and URL"""
+    Writes and hashing run in the thread pool so the event loop never blocks, and the copy
+    stops as soon as the running size passes max_size.
+    """
+    temp_path = UPLOAD_TMP_DIR / f"{uuid.uuid4()}.part"
+    buffer = await run_in_threadpool(open, temp_path, "wb")
+    hasher = blob_store.new_hasher()
+    size = 0
+    
     try:
-        # Generate unique filename
-        file_extension = Path(file.filename).suffix.lower()
-        if not file_extension:
-            # Try to guess extension from content type
-            extension = mimetypes.guess_extension(file.content_type)
-            if extension:
-                file_extension = extension
-            else:
-                file_extension = ".bin"
-        
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        
-        # Create type-specific directory
-        type_dir = UPLOAD_DIR / file_type
-        type_dir.mkdir(exist_ok=True)
-        
-        file_path = type_dir / unique_filename
-        
-        # Save file
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
             
-            # Check actual file size
-            if len(content) > MAX_FILE_SIZE:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Fichier trop volumineux. Taille maximum: {MAX_FILE_SIZE // (1024*1024)}MB"
-                )
+            size += len(chunk)
+            metrics.record_upload_bytes("multipart", len(chunk))
+            if size > max_size:
+                raise file_too_large()
             
-            buffer.write(content)
+            await run_in_threadpool(blob_store.write_and_hash, buffer, hasher, chunk)
         
-        # Generate URL (relative path from uploads)
-        file_url = f"/uploads/{file_type}/{unique_filename}"
+        await run_in_threadpool(buffer.close)
+        return temp_path, size, hasher.hexdigest()
+        
+    except BaseException:
+        await run_in_threadpool(buffer.close)
+        await run_in_threadpool(remove_quietly, temp_path)
+        raise
+
+async def save_file(db: AsyncIOMotorDatabase, file: UploadFile, file_type: str) -> tuple[str, str, str, bool]:
+    """Save uploaded file in the content-addressed store
+
+    Returns the storage key, its URL, the content hash and whether the content was new.
+    """
+    try:
+        # Stream to a temporary file while hashing, then move it into place atomically
+        temp_path, size, digest = await stream_to_temp_file(file)
+        try:
+            file_key, file_url, created = await blob_store.store_blob(
+                db, temp_path, digest, size, file_type,
+                file_extension(file.filename, file.content_type), file.content_type
+            )
+        except BaseException:
+            await run_in_threadpool(remove_quietly, temp_path)
+            raise
         
-        logger.info(f"File saved: {file_path}")
-        return str(file_path), file_url
+        logger.info(f"File saved: {file_key} ({size} bytes)")
+        return file_key, file_url, digest, created
         
     except HTTPException:
         raise
@@ -105,6 +152,55 @@ async def save_file(file: UploadFile, file_type: str) -> tuple[str, str]:
         logger.error(f"Error saving file: {e}")
         raise HTTPException(status_code=500, detail="Erreur lors de la sauvegarde du fichier")
 
+async def schedule_derivatives(
+    db: AsyncIOMotorDatabase,
+    gallery_item: GalleryItem,
+    blob_created: bool
+) -> None:
+    """Queue thumbnail/variant generation for images and poster/preview extraction for videos
+
+    Content that was already stored reuses the derivatives of an existing gallery item.
+    """
+    if not blob_created:
+        source = await db.gallery_items.find_one(
+            {"content_hash": gallery_item.content_hash, "derivatives_status": "ready", "id": {"$ne": gallery_item.id}}
+        )
+        if source:
+            derived_fields = ["thumbnail_url", "variants", "placeholder", "preview_url", "duration", "width", "height"]
+            await db.gallery_items.update_one(
+                {"id": gallery_item.id},
+                {"$set": {**{field: source.get(field) for field in derived_fields}, "derivatives_status": "ready"}}
+            )
+            return
+    
+    if gallery_item.file_type in ("image", "video"):
+        await media_jobs.enqueue_job(db, gallery_item.file_type, gallery_item.id, gallery_item.file_url)
+
+async def create_gallery_item(
+    db: AsyncIOMotorDatabase,
+    gallery_item: GalleryItem,
+    blob_created: bool
+) -> None:
+    """Insert the gallery item of a stored blob, count it and queue its derivatives
+
+    The caller already holds a reference to the blob: on failure the item and its counter
+    are undone and the reference is released, so the blob can still be removed later.
+    """
+    inserted = counted = False
+    try:
+        await db.gallery_items.insert_one(gallery_item.dict())
+        inserted = True
+        await dashboard_counters.gallery_item_activity_changed(db, False, gallery_item.is_active)
+        counted = True
+        await schedule_derivatives(db, gallery_item, blob_created)
+    except BaseException:
+        if inserted:
+            await db.gallery_items.delete_one({"id": gallery_item.id})
+        if counted:
+            await dashboard_counters.gallery_item_activity_changed(db, gallery_item.is_active, False)
+        await blob_store.release_blob(db, gallery_item.content_hash)
+        raise
+
 @router.post("/file")
 async def upload_file(
     file: UploadFile = File(...),
@@ -124,23 +220,23 @@ async def upload_file(
         file_type = get_file_type(file.content_type)
         
         # Save file
-        file_path, file_url = await save_file(file, file_type)
+        _, file_url, content_hash, blob_created = await save_file(db, file, file_type)
         
         # Create gallery item
-        from models.admin_models import GalleryItem
-        
         gallery_item = GalleryItem(
             title=title,
             description=description,
             file_type=file_type,
             file_url=file_url,
+            content_hash=content_hash,
             event_type=event_type,
             is_featured=is_featured,
+            derivatives_status="pending",
             created_by=current_user.id
         )
         
-        # Save to database
-        await db.gallery_items.insert_one(gallery_item.dict())
+        # Save to database; thumbnails, variants and video previews are generated in the background
+        await create_gallery_item(db, gallery_item, blob_created)
         
         logger.info(f"Gallery item created by {current_user.username}: {gallery_item.id}")
         
@@ -166,5 +262,438 @@ async def get_upload_info():
         "max_file_size_mb": MAX_FILE_SIZE // (1024 * 1024),
         "allowed_image_types": list(ALLOWED_IMAGE_TYPES),
         "allowed_video_types": list(ALLOWED_VIDEO_TYPES),
-        "upload_dir": str(UPLOAD_DIR)
-    }
\ No newline at end of file
+        "upload_dir": str(UPLOAD_DIR),
+        "max_resumable_file_size": MAX_RESUMABLE_FILE_SIZE,
+        "default_chunk_size": DEFAULT_RESUMABLE_CHUNK_SIZE,
+        "storage_backend": get_storage().name,
+        "direct_upload": get_storage().supports_presigned_urls
+    }
+
+# Resumable uploads
+#
+# 1. POST   /sessions                       create a session for a file of known size
+# 2. PUT    /sessions/{id}/chunks/{index}   send numbered chunks (any order, in parallel, retried freely)
+# 3. GET    /sessions/{id}                  list received chunks/ranges to resume after a failure
+# 4. POST   /sessions/{id}/complete         assemble the chunks and create the gallery item
+
+def session_dir(session_id: str) -> Path:
+    return UPLOAD_SESSIONS_DIR / session_id
+
+def chunk_path(session_id: str, index: int) -> Path:
+    return session_dir(session_id) / f"{index:06d}.part"
+
+def expected_chunk_size(session: dict, index: int) -> int:
+    """Size every chunk must have; only the last one may be shorter"""
+    if index < session["total_chunks"] - 1:
+        return session["chunk_size"]
+    return session["total_size"] - session["chunk_size"] * (session["total_chunks"] - 1)
+
+def received_ranges(session: dict) -> List[List[int]]:
+    """Merge the received chunks into contiguous inclusive byte ranges"""
+    ranges: List[List[int]] = []
+    for index in sorted(session["received_chunks"]):
+        start = index * session["chunk_size"]
+        end = start + expected_chunk_size(session, index) - 1
+        if ranges and ranges[-1][1] + 1 == start:
+            ranges[-1][1] = end
+        else:
+            ranges.append([start, end])
+    return ranges
+
+def session_status(session: dict) -> UploadSessionStatus:
+    received = set(session["received_chunks"])
+    return UploadSessionStatus(
+        id=session["id"],
+        status=session["status"],
+        total_size=session["total_size"],
+        chunk_size=session["chunk_size"],
+        total_chunks=session["total_chunks"],
+        received_chunks=sorted(received),
+        missing_chunks=[i for i in range(session["total_chunks"]) if i not in received],
+        received_ranges=received_ranges(session),
+        received_bytes=sum(expected_chunk_size(session, i) for i in received),
+        expires_at=session["expires_at"],
+        gallery_item_id=session.get("gallery_item_id")
+    )
+
+async def get_open_session(db: AsyncIOMotorDatabase, session_id: str) -> dict:
+    session = await db.upload_sessions.find_one({"id": session_id})
+    if not session or session["expires_at"] < datetime.utcnow():
+        raise HTTPException(status_code=404, detail="Session d'upload introuvable ou expirée")
+    if session["status"] != "open":
+        raise HTTPException(status_code=409, detail="Session d'upload déjà finalisée")
+    return session
+
+def assemble_chunks(session: dict) -> tuple[Path, str]:
+    """Concatenate the chunk files of a session into a temp file (runs in the thread pool)
+
+    Returns the temp file path and the SHA-256 of the assembled content.
+    """
+    temp_path = UPLOAD_TMP_DIR / f"{session['id']}.assembling"
+    hasher = blob_store.new_hasher()
+    try:
+        with open(temp_path, "wb") as output:
+            for index in range(session["total_chunks"]):
+                with open(chunk_path(session["id"], index), "rb") as part:
+                    while True:
+                        data = part.read(UPLOAD_CHUNK_SIZE)
+                        if not data:
+                            break
+                        blob_store.write_and_hash(output, hasher, data)
+        return temp_path, hasher.hexdigest()
+    except BaseException:
+        remove_quietly(temp_path)
+        raise
+
+@router.post("/sessions", response_model=UploadSessionStatus)
+async def create_upload_session(
+    session_data: UploadSessionCreate,
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Start a resumable upload"""
+    try:
+        validate_content_type(session_data.content_type)
+        
+        if session_data.total_size > MAX_RESUMABLE_FILE_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Fichier trop volumineux. Taille maximum: {MAX_RESUMABLE_FILE_SIZE // (1024*1024)}MB"
+            )
+        
+        chunk_size = session_data.chunk_size or DEFAULT_RESUMABLE_CHUNK_SIZE
+        if not MIN_RESUMABLE_CHUNK_SIZE <= chunk_size <= MAX_RESUMABLE_CHUNK_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Taille de morceau invalide (entre {MIN_RESUMABLE_CHUNK_SIZE} et {MAX_RESUMABLE_CHUNK_SIZE} octets)"
+            )
+        
+        session = UploadSession(
+            **session_data.dict(exclude={"chunk_size"}),
+            file_type=get_file_type(session_data.content_type),
+            chunk_size=chunk_size,
+            total_chunks=-(-session_data.total_size // chunk_size),
+            created_by=current_user.id,
+            expires_at=datetime.utcnow() + UPLOAD_SESSION_TTL
+        )
+        
+        await run_in_threadpool(session_dir(session.id).mkdir, exist_ok=True)
+        await db.upload_sessions.insert_one(session.dict())
+        
+        logger.info(f"Upload session {session.id} created by {current_user.username} ({session.total_chunks} chunks)")
+        
+        return session_status(session.dict())
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating upload session: {e}")
+        raise HTTPException(status_code=500, detail="Erreur lors de la création de la session d'upload")
+
+@router.put("/sessions/{session_id}/chunks/{index}", response_model=UploadSessionStatus)
+async def upload_chunk(
+    session_id: str,
+    index: int,
+    request: Request,
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Receive one chunk of a resumable upload (raw request body)"""
+    try:
+        session = await get_open_session(db, session_id)
+        
+        if not 0 <= index < session["total_chunks"]:
+            raise HTTPException(status_code=400, detail="Numéro de morceau invalide")
+        
+        expected_size = expected_chunk_size(session, index)
+        
+        # Write to a private temp name so retries of the same chunk never interleave
+        temp_path = session_dir(session_id) / f"{index:06d}.{uuid.uuid4()}.tmp"
+        buffer = await run_in_threadpool(open, temp_path, "wb")
+        size = 0
+        try:
+            async for data in request.stream():
+                size += len(data)
+                metrics.record_upload_bytes("resumable", len(data))
+                if size > expected_size:
+                    raise HTTPException(status_code=400, detail="Morceau plus grand que prévu")
+                await run_in_threadpool(buffer.write, data)
+            await run_in_threadpool(buffer.close)
+            
+            if size != expected_size:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Morceau incomplet: {size} octets reçus, {expected_size} attendus"
+                )
+            
+            await run_in_threadpool(os.replace, temp_path, chunk_path(session_id, index))
+        except BaseException:
+            await run_in_threadpool(buffer.close)
+            await run_in_threadpool(remove_quietly, temp_path)
+            raise
+        
+        # Each accepted chunk extends the session, so a long upload still in progress isn't purged
+        now = datetime.utcnow()
+        updated_session = await db.upload_sessions.find_one_and_update(
+            {"id": session_id},
+            {
+                "$addToSet": {"received_chunks": index},
+                "$set": {"updated_at": now, "expires_at": now + UPLOAD_SESSION_TTL}
+            },
+            return_document=ReturnDocument.AFTER
+        )
+        
+        return session_status(updated_session)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error receiving chunk {index} of upload session {session_id}: {e}")
+        raise HTTPException(status_code=500, detail="Erreur lors de la réception du morceau")
+
+@router.get("/sessions/{session_id}", response_model=UploadSessionStatus)
+async def get_upload_session(
+    session_id: str,
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Report which chunks of a resumable upload have been received"""
+    session = await db.upload_sessions.find_one({"id": session_id})
+    if not session:
+        raise HTTPException(status_code=404, detail="Session d'upload introuvable ou expirée")
+    
+    return session_status(session)
+
+@router.post("/sessions/{session_id}/complete")
+async def complete_upload_session(
+    session_id: str,
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Assemble the chunks of a resumable upload and create the gallery item"""
+    try:
+        session = await get_open_session(db, session_id)
+        
+        missing = session_status(session).missing_chunks
+        if missing:
+            raise HTTPException(status_code=409, detail=f"Morceaux manquants: {missing[:20]}")
+        
+        # Claim the session so a concurrent complete can't assemble it twice
+        session = await db.upload_sessions.find_one_and_update(
+            {"id": session_id, "status": "open"},
+            {"$set": {"status": "assembling", "updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
+        )
+        if session is None:
+            raise HTTPException(status_code=409, detail="Session d'upload déjà finalisée")
+        
+        file_type = session["file_type"]
+        
+        try:
+            temp_path, content_hash = await run_in_threadpool(assemble_chunks, session)
+            try:
+                _, file_url, blob_created = await blob_store.store_blob(
+                    db, temp_path, content_hash, session["total_size"], file_type,
+                    file_extension(session["filename"], session["content_type"]), session["content_type"]
+                )
+            except BaseException:
+                await run_in_threadpool(remove_quietly, temp_path)
+                raise
+        except BaseException:
+            await db.upload_sessions.update_one({"id": session_id}, {"$set": {"status": "open"}})
+            raise
+        
+        gallery_item = GalleryItem(
+            title=session["title"],
+            description=session.get("description"),
+            file_type=file_type,
+            file_url=file_url,
+            content_hash=content_hash,
+            event_type=session.get("event_type"),
+            is_featured=session.get("is_featured", False),
+            derivatives_status="pending",
+            created_by=current_user.id
+        )
+        try:
+            await create_gallery_item(db, gallery_item, blob_created)
+        except BaseException:
+            # The item and its blob reference are undone: the session can be completed again
+            await db.upload_sessions.update_one({"id": session_id}, {"$set": {"status": "open"}})
+            raise
+        
+        await db.upload_sessions.update_one(
+            {"id": session_id},
+            {"$set": {"status": "completed", "gallery_item_id": gallery_item.id, "updated_at": datetime.utcnow()}}
+        )
+        await run_in_threadpool(shutil.rmtree, session_dir(session_id), True)
+        
+        logger.info(f"Upload session {session_id} completed by {current_user.username}: {gallery_item.id}")
+        
+        return {
+            "id": gallery_item.id,
+            "title": gallery_item.title,
+            "file_type": gallery_item.file_type,
+            "file_url": gallery_item.file_url,
+            "message": "Fichier uploadé avec succès"
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error completing upload session {session_id}: {e}")
+        raise HTTPException(status_code=500, detail="Erreur lors de l'assemblage du fichier")
+
+@router.delete("/sessions/{session_id}")
+async def abort_upload_session(
+    session_id: str,
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Abort a resumable upload and discard its chunks"""
+    result = await db.upload_sessions.delete_one({"id": session_id, "status": "open"})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Session d'upload introuvable ou expirée")
+    
+    await run_in_threadpool(shutil.rmtree, session_dir(session_id), True)
+    
+    logger.info(f"Upload session {session_id} aborted by {current_user.username}")
+    
+    return {"message": "Session d'upload annulée"}
+
+async def purge_expired_upload_sessions(db: AsyncIOMotorDatabase) -> int:
+    """Delete expired upload sessions and their chunk files
+
+    Sessions being assembled are left alone: their completion is still reading the chunks.
+    """
+    purgeable = {"expires_at": {"$lt": datetime.utcnow()}, "status": {"$in": ["open", "completed"]}}
+    cursor = db.upload_sessions.find(purgeable, {"id": 1})
+    expired_ids = [session["id"] for session in await cursor.to_list(None)]
+    
+    purged = 0
+    for session_id in expired_ids:
+        # Deleted one by one with the same filter, so a session claimed since isn't touched
+        result = await db.upload_sessions.delete_one({"id": session_id, **purgeable})
+        if result.deleted_count:
+            await run_in_threadpool(shutil.rmtree, session_dir(session_id), True)
+            purged += 1
+    if purged:
+        logger.info(f"Purged {purged} expired upload sessions")
+    
+    return purged
+
+async def create_upload_dirs() -> None:
+    """Create the upload directory and its scratch and session directories (at startup)"""
+    await run_in_threadpool(UPLOAD_SESSIONS_DIR.mkdir, parents=True, exist_ok=True)
+
+async def run_upload_session_gc(db: AsyncIOMotorDatabase) -> None:
+    """Periodically purge expired upload sessions (runs for the lifetime of the app)"""
+    while True:
+        try:
+            await purge_expired_upload_sessions(db)
+        except Exception as e:
+            logger.error(f"Error purging upload sessions: {e}")
+        await asyncio.sleep(UPLOAD_SESSION_GC_INTERVAL_SECONDS)
+
+
+# Direct-to-storage uploads
+#
+# With an object-storage backend the browser PUTs the bytes straight to the bucket using a
+# presigned URL, then calls /direct/complete. The SHA-256 is part of the signed request, so the
+# bucket itself guarantees the object matches its content-addressed key.
+
+def validate_direct_upload(upload_data: DirectUploadCreate) -> str:
+    """Check a direct upload request and return its file type"""
+    if not get_storage().supports_presigned_urls:
+        raise HTTPException(status_code=400, detail="Upload direct non disponible avec ce stockage")
+    
+    validate_content_type(upload_data.content_type)
+    
+    if upload_data.size > MAX_RESUMABLE_FILE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Fichier trop volumineux. Taille maximum: {MAX_RESUMABLE_FILE_SIZE // (1024*1024)}MB"
+        )
+    
+    return get_file_type(upload_data.content_type)
+
+@router.post("/direct")
+async def create_direct_upload(
+    upload_data: DirectUploadCreate,
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Return a presigned URL to upload a file directly to object storage"""
+    try:
+        file_type = validate_direct_upload(upload_data)
+        
+        # Content already stored: nothing to send
+        if await db.blobs.find_one({"digest": upload_data.sha256}):
+            return {"upload_required": False}
+        
+        key = blob_store.blob_key(
+            file_type, upload_data.sha256, file_extension(upload_data.filename, upload_data.content_type)
+        )
+        upload = await get_storage().presigned_upload(
+            key,
+            upload_data.content_type,
+            upload_data.size,
+            base64.b64encode(bytes.fromhex(upload_data.sha256)).decode("ascii")
+        )
+        
+        return {"upload_required": True, "upload": upload}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error presigning upload: {e}")
+        raise HTTPException(status_code=500, detail="Erreur lors de la préparation de l'upload")
+
+@router.post("/direct/complete")
+async def complete_direct_upload(
+    upload_data: DirectUploadCreate,
+    current_user: AdminUser = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Register a file uploaded directly to object storage and create the gallery item"""
+    try:
+        file_type = validate_direct_upload(upload_data)
+        extension = file_extension(upload_data.filename, upload_data.content_type)
+        
+        if not await db.blobs.find_one({"digest": upload_data.sha256}):
+            stored_size = await get_storage().size(blob_store.blob_key(file_type, upload_data.sha256, extension))
+            if stored_size != upload_data.size:
+                raise HTTPException(status_code=409, detail="Fichier non reçu par le stockage")
+        
+        file_key, blob_created = await blob_store.add_reference(
+            db, upload_data.sha256, upload_data.size, file_type, extension
+        )
+        
+        gallery_item = GalleryItem(
+            title=upload_data.title,
+            description=upload_data.description,
+            file_type=file_type,
+            file_url=f"/uploads/{file_key}",
+            content_hash=upload_data.sha256,
+            event_type=upload_data.event_type,
+            is_featured=upload_data.is_featured,
+            derivatives_status="pending",
+            created_by=current_user.id
+        )
+        await create_gallery_item(db, gallery_item, blob_created)
+        metrics.record_upload_bytes("direct", upload_data.size)
+        
+        logger.info(f"Gallery item created by {current_user.username} (direct upload): {gallery_item.id}")
+        
+        return {
+            "id": gallery_item.id,
+            "title": gallery_item.title,
+            "file_type": gallery_item.file_type,
+            "file_url": gallery_item.file_url,
+            "message": "Fichier uploadé avec succès"
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error completing direct upload: {e}")
+        raise HTTPException(status_code=500, detail="Erreur lors de l'upload")
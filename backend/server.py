@@ -1,26 +1,22 @@
 from fastapi import FastAPI, APIRouter
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import asyncio
 import logging
 from pathlib import Path
 from contextlib import asynccontextmanager
 
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
 # Import routers
-from routers import packages, photobooth, contact, testimonials, auth, admin, upload, static
+from routers import packages, photobooth, contact, testimonials, auth, admin, analytics, search, upload, static, metrics as metrics_router
 
 # Import services
 from services.data_seeder import seed_initial_data
 from services.admin_seeder import seed_admin_user
-
-ROOT_DIR = Path(__file__).parent
-load_dotenv(ROOT_DIR / '.env')
-
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+from services import compression, dashboard_counters, database, diagnostics, image_derivatives, indexes, media_jobs, metrics, password_pool, refresh_tokens, serialization, write_behind
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -28,6 +24,19 @@ async def lifespan(app: FastAPI):
     # Startup
     logging.info("Starting up JSEVENT backend...")
     
+    # Upload, scratch and session directories (off the event loop)
+    await upload.create_upload_dirs()
+    
+    # MongoDB connection (shared pool for every router)
+    database.connect(os.environ['MONGO_URL'], os.environ['DB_NAME'])
+    db = database.get_db()
+    
+    # Indexes for every query shape (only missing ones are built)
+    try:
+        await indexes.ensure_indexes(db)
+    except Exception as e:
+        logging.error(f"Error creating indexes: {e}")
+    
     # Seed initial data
     try:
         await seed_initial_data(db)
@@ -36,14 +45,47 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logging.error(f"Error seeding database: {e}")
     
+    # Batched public submissions (replays the journal left by a previous run)
+    await write_behind.start(db)
+    
+    # Gallery items left pending by in-process derivative tasks get a durable job
+    try:
+        await media_jobs.enqueue_orphaned_items(db)
+    except Exception as e:
+        logging.error(f"Error queueing pending media jobs: {e}")
+    
+    # Background maintenance
+    upload_session_gc = asyncio.create_task(upload.run_upload_session_gc(db))
+    media_workers = media_jobs.start_workers(db)
+    counters_reconciliation = asyncio.create_task(dashboard_counters.run_reconciliation(db))
+    revocation_sync = asyncio.create_task(refresh_tokens.run_revocation_sync(db))
+    loop_lag_monitor = asyncio.create_task(metrics.run_loop_lag_monitor()) if metrics.METRICS_ENABLED else None
+    await diagnostics.start()
+    
     yield
     
     # Shutdown
     logging.info("Shutting down JSEVENT backend...")
-    client.close()
+    upload_session_gc.cancel()
+    counters_reconciliation.cancel()
+    revocation_sync.cancel()
+    if loop_lag_monitor is not None:
+        loop_lag_monitor.cancel()
+    await diagnostics.stop()
+    await write_behind.stop()
+    for task in media_workers:
+        task.cancel()
+    await image_derivatives.shutdown()
+    password_pool.shutdown()
+    database.close()
 
 # Create the main app with lifespan
-app = FastAPI(title="JSEVENT API", version="1.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="JSEVENT API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=serialization.default_response_class()
+)
 
 # Create a router with the /api prefix for existing endpoints
 api_router = APIRouter(prefix="/api")
@@ -57,7 +99,7 @@ async def health_check():
     """Health check endpoint"""
     try:
         # Test database connection
-        await client.admin.command('ismaster')
+        await database.get_client().admin.command('ismaster')
         return {"status": "healthy", "database": "connected"}
     except Exception as e:
         return {"status": "unhealthy", "database": "disconnected", "error": str(e)}
@@ -72,8 +114,13 @@ app.include_router(contact.router)
 app.include_router(testimonials.router)
 app.include_router(auth.router)
 app.include_router(admin.router)
+app.include_router(analytics.router)
+app.include_router(search.router)
 app.include_router(upload.router)
 app.include_router(static.router)
+if metrics.METRICS_ENABLED:
+    app.include_router(metrics_router.router)
+    metrics.set_areas(route.path for route in app.routes)
 
 app.add_middleware(
     CORSMiddleware,
@@ -83,6 +130,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli for JSON and text responses (media under /uploads is left alone)
+app.add_middleware(compression.CompressionMiddleware)
+
+# Slow request profiles (diagnostics mode)
+if diagnostics.DIAGNOSTICS_ENABLED:
+    app.add_middleware(diagnostics.DiagnosticsMiddleware)
+
+# Request counts and latency per route template, outermost so compression is included
+if metrics.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -1,6 +1,6 @@
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from models.admin_models import AdminUser
-from services.auth_service import get_password_hash
+from services.password_pool import hash_password_async
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,7 +20,7 @@ async def seed_admin_user(db: AsyncIOMotorDatabase):
     default_admin = AdminUser(
         username="admin",
         email="admin@jsevent.fr",
-        hashed_password=get_password_hash("jsevent2025"),  # Default password - CHANGE IN PRODUCTION
+        hashed_password=await hash_password_async("jsevent2025"),  # Default password - CHANGE IN PRODUCTION
         is_superuser=True
     )
     
@@ -0,0 +1,224 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Time-series analytics computed with aggregation pipelines and cached per time bucket.
+# A closed bucket (entirely in the past) is aggregated once and stored in `analytics_buckets`;
+# only the current bucket is recomputed on each request. Writes that change the past (a
+# contact request's status, a booking for an older request) drop the buckets they affect.
+
+GRANULARITIES = ("day", "week", "month")
+MAX_BUCKETS = 400
+
+# metric -> source collection, allowed group_by fields and the counters accumulated per group
+METRICS = {
+    "contact_requests": {
+        "collection": "contact_requests",
+        "dimensions": ("event_type", "status"),
+        "accumulators": {"count": {"$sum": 1}},
+    },
+    "bookings": {
+        "collection": "bookings",
+        "dimensions": ("package_id", "package_type", "status"),
+        "accumulators": {"count": {"$sum": 1}, "revenue": {"$sum": "$total_price"}},
+    },
+    # Contact requests of the bucket that led to at least one booking
+    "conversion": {
+        "collection": "contact_requests",
+        "dimensions": ("event_type",),
+        "accumulators": {
+            "requests": {"$sum": 1},
+            "booked": {"$sum": {"$cond": [{"$gt": [{"$size": "$bookings"}, 0]}, 1, 0]}},
+        },
+        "lookup": [
+            {"$lookup": {
+                "from": "bookings",
+                "localField": "id",
+                "foreignField": "contact_request_id",
+                "as": "bookings",
+                "pipeline": [{"$limit": 1}, {"$project": {"_id": 1}}],
+            }},
+        ],
+    },
+}
+
+# Metrics whose past buckets depend on a contact request's current state
+CONTACT_REQUEST_METRICS = ("contact_requests", "conversion")
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    """Start of the UTC bucket containing moment (weeks start on Monday)"""
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def next_bucket(start: datetime, granularity: str) -> datetime:
+    if granularity == "day":
+        return start + timedelta(days=1)
+    if granularity == "week":
+        return start + timedelta(weeks=1)
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+def bucket_range(start: datetime, end: datetime, granularity: str) -> List[datetime]:
+    """Bucket starts covering [start, end)"""
+    buckets = []
+    current = bucket_start(start, granularity)
+    while current < end:
+        buckets.append(current)
+        if len(buckets) > MAX_BUCKETS:
+            raise ValueError(f"Range too large (more than {MAX_BUCKETS} buckets)")
+        current = next_bucket(current, granularity)
+    return buckets
+
+
+def default_range(granularity: str, buckets: int = 12) -> Tuple[datetime, datetime]:
+    """The last `buckets` buckets, current one included"""
+    now = datetime.utcnow()
+    start = bucket_start(now, granularity)
+    for _ in range(buckets - 1):
+        start = bucket_start(start - timedelta(days=1), granularity)
+    return start, now
+
+
+def build_pipeline(metric: str, granularity: str, group_by: Optional[str], start: datetime, end: datetime) -> list:
+    """Aggregation computing every (bucket, group) of metric in [start, end)"""
+    spec = METRICS[metric]
+    trunc = {"date": "$created_at", "unit": granularity, "timezone": "UTC"}
+    if granularity == "week":
+        trunc["startOfWeek"] = "monday"
+
+    return [
+        {"$match": {"created_at": {"$gte": start, "$lt": end}}},
+        *spec.get("lookup", []),
+        {"$group": {
+            "_id": {"bucket": {"$dateTrunc": trunc}, "key": f"${group_by}" if group_by else "all"},
+            **spec["accumulators"],
+        }},
+    ]
+
+
+async def aggregate_buckets(
+    db: AsyncIOMotorDatabase,
+    metric: str,
+    granularity: str,
+    group_by: Optional[str],
+    start: datetime,
+    end: datetime
+) -> Dict[datetime, List[dict]]:
+    """Run the pipeline and return the groups of each bucket that has data"""
+    pipeline = build_pipeline(metric, granularity, group_by, start, end)
+    rows = await db[METRICS[metric]["collection"]].aggregate(pipeline).to_list(None)
+
+    buckets: Dict[datetime, List[dict]] = {}
+    for row in rows:
+        group = row.pop("_id")
+        buckets.setdefault(group["bucket"].replace(tzinfo=None), []).append({"key": group["key"], **row})
+    return buckets
+
+
+def cache_filter(metric: str, granularity: str, group_by: Optional[str]) -> dict:
+    return {"metric": metric, "granularity": granularity, "group_by": group_by or "all"}
+
+
+async def get_series(
+    db: AsyncIOMotorDatabase,
+    metric: str,
+    granularity: str,
+    group_by: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> List[dict]:
+    """Return one entry per bucket in [start, end) with its groups
+
+    Closed buckets come from the cache, missing ones are aggregated in a single pipeline over
+    their span and stored, and the current bucket is always aggregated live.
+    """
+    now = datetime.utcnow()
+    if start is None:
+        start, default_end = default_range(granularity)
+        end = end or default_end
+    end = min(end or now, now)
+
+    buckets = bucket_range(start, end, granularity)
+    if not buckets:
+        return []
+
+    current = bucket_start(now, granularity)
+    closed = [bucket for bucket in buckets if bucket < current]
+
+    groups: Dict[datetime, List[dict]] = {}
+    if closed:
+        cursor = db.analytics_buckets.find({
+            **cache_filter(metric, granularity, group_by),
+            "bucket_start": {"$gte": closed[0], "$lte": closed[-1]},
+        })
+        async for cached in cursor:
+            groups[cached["bucket_start"]] = cached["groups"]
+
+        missing = [bucket for bucket in closed if bucket not in groups]
+        if missing:
+            computed = await aggregate_buckets(
+                db, metric, granularity, group_by, missing[0], next_bucket(missing[-1], granularity)
+            )
+            operations = []
+            for bucket in missing:
+                groups[bucket] = computed.get(bucket, [])
+                operations.append(UpdateOne(
+                    {**cache_filter(metric, granularity, group_by), "bucket_start": bucket},
+                    {"$set": {
+                        "bucket_end": next_bucket(bucket, granularity),
+                        "groups": groups[bucket],
+                        "computed_at": now,
+                    }},
+                    upsert=True,
+                ))
+            await db.analytics_buckets.bulk_write(operations, ordered=False)
+            logger.info(f"Cached {len(missing)} {granularity} buckets of {metric} by {group_by or 'all'}")
+
+    if buckets[-1] >= current:
+        live = await aggregate_buckets(db, metric, granularity, group_by, current, next_bucket(current, granularity))
+        groups[current] = live.get(current, [])
+
+    return [
+        {"bucket": bucket, "groups": groups.get(bucket, []), **bucket_totals(groups.get(bucket, []))}
+        for bucket in buckets
+    ]
+
+
+def bucket_totals(groups: List[dict]) -> dict:
+    """Sum of each counter over the groups of a bucket (plus the conversion rate when relevant)"""
+    totals: Dict[str, float] = {}
+    for group in groups:
+        for field, value in group.items():
+            if field != "key":
+                totals[field] = totals.get(field, 0) + value
+    if "requests" in totals:
+        totals["rate"] = round(totals["booked"] / totals["requests"], 4) if totals["requests"] else 0.0
+    return {"totals": totals}
+
+
+async def invalidate(db: AsyncIOMotorDatabase, metrics: Tuple[str, ...], moment: datetime) -> None:
+    """Drop cached buckets of metrics that contain moment, after a write changed the past"""
+    await invalidate_many(db, metrics, [moment])
+
+
+async def invalidate_many(db: AsyncIOMotorDatabase, metrics: Tuple[str, ...], moments: List[datetime]) -> None:
+    """Drop cached buckets of metrics containing any of moments (one delete for a bulk write)"""
+    if not moments:
+        return
+    try:
+        await db.analytics_buckets.delete_many({
+            "metric": {"$in": list(metrics)},
+            "$or": [{"bucket_start": {"$lte": moment}, "bucket_end": {"$gt": moment}} for moment in set(moments)],
+        })
+    except Exception as e:
+        logger.error(f"Error invalidating analytics buckets: {e}")
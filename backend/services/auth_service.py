@@ -25,17 +25,35 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def principal_claims(user: dict) -> dict:
+    """Token claims describing the admin, enough to authenticate without a lookup"""
+    return {
+        "sub": user["username"],
+        "uid": user["id"],
+        "email": user["email"],
+        "su": user.get("is_superuser", False),
+    }
+
 def verify_token(token: str) -> Optional[dict]:
     """Verify and decode a JWT token"""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
-        if username is None:
+        # Refresh tokens are signed with the same key but only accepted by /api/auth/refresh
+        if username is None or payload.get("typ") == "refresh":
             return None
-        return {"username": username, "exp": payload.get("exp")}
+        return {
+            "username": username,
+            "exp": payload.get("exp"),
+            "iat": payload.get("iat"),
+            # Principal claims (see principal_claims), absent from older tokens
+            "user_id": payload.get("uid"),
+            "email": payload.get("email"),
+            "is_superuser": payload.get("su", False),
+        }
     except JWTError:
         return None
\ No newline at end of file
@@ -0,0 +1,148 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from starlette.concurrency import run_in_threadpool
+from services.storage import get_storage, remove_quietly, url_for
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+import hashlib
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Content-addressed media: each distinct file is stored once under {file_type}/{sha256}{ext}
+TRASH_PREFIX = ".trash/"
+
+
+def new_hasher():
+    return hashlib.sha256()
+
+
+def write_and_hash(buffer, hasher, chunk: bytes) -> None:
+    """Write a chunk and feed it to the digest (runs in the thread pool, hashlib releases the GIL)"""
+    hasher.update(chunk)
+    buffer.write(chunk)
+
+
+def blob_key(file_type: str, digest: str, extension: str) -> str:
+    return f"{file_type}/{digest}{extension}"
+
+
+async def derived_keys(digest: str) -> List[str]:
+    """Objects generated from a blob (image variants, video poster and preview)"""
+    storage = get_storage()
+    keys = await storage.list_keys(f"derived/{digest}-")
+    keys += await storage.list_keys(f"video/{digest}.poster.")
+    keys += await storage.list_keys(f"video/{digest}.preview.")
+    return keys
+
+
+async def add_reference(
+    db: AsyncIOMotorDatabase,
+    digest: str,
+    size: int,
+    file_type: str,
+    extension: str
+) -> Tuple[str, bool]:
+    """Take a reference on a blob, registering it on first use
+
+    Returns the blob key and whether this reference created it. An existing blob keeps its
+    original extension, so identical bytes share one key and URL.
+    """
+    now = datetime.utcnow()
+    key = blob_key(file_type, digest, extension)
+    blob = await db.blobs.find_one_and_update(
+        {"digest": digest},
+        {
+            "$inc": {"ref_count": 1},
+            "$set": {"updated_at": now},
+            "$setOnInsert": {
+                "digest": digest,
+                "file_type": file_type,
+                "filename": f"{digest}{extension}",
+                "url": url_for(key),
+                "size": size,
+                "created_at": now,
+            },
+        },
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return f"{blob['file_type']}/{blob['filename']}", blob["ref_count"] == 1
+
+
+async def store_blob(
+    db: AsyncIOMotorDatabase,
+    temp_path: Path,
+    digest: str,
+    size: int,
+    file_type: str,
+    extension: str,
+    content_type: Optional[str] = None
+) -> Tuple[str, str, bool]:
+    """Move a fully written temp file into the content-addressed store and take a reference
+
+    Returns the blob key, its public URL and whether this upload created the blob. The temp
+    file is consumed either way.
+    """
+    key, created = await add_reference(db, digest, size, file_type, extension)
+    storage = get_storage()
+
+    try:
+        # Existing content is only sent again when its object is missing (a concurrent release
+        # removed it just before our reference landed), so duplicates cost no upload
+        if created or not await storage.exists(key):
+            await storage.put_file(temp_path, key, content_type)
+        else:
+            await run_in_threadpool(remove_quietly, temp_path)
+    except BaseException:
+        await release_blob(db, digest)
+        raise
+
+    if not created:
+        logger.info(f"Upload deduplicated against blob {digest}")
+    return key, url_for(key), created
+
+
+async def release_blob(db: AsyncIOMotorDatabase, digest: str) -> bool:
+    """Drop one reference to a blob and delete its objects when it was the last one
+
+    Returns True when the blob was removed.
+    """
+    blob = await db.blobs.find_one_and_update(
+        {"digest": digest},
+        {"$inc": {"ref_count": -1}, "$set": {"updated_at": datetime.utcnow()}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if blob is None or blob["ref_count"] > 0:
+        return False
+
+    result = await db.blobs.delete_one({"digest": digest, "ref_count": {"$lte": 0}})
+    if result.deleted_count == 0:
+        # Someone took a new reference in the meantime
+        return False
+
+    storage = get_storage()
+    key = f"{blob['file_type']}/{blob['filename']}"
+    trash_key = f"{TRASH_PREFIX}{digest}.{uuid.uuid4()}"
+
+    # Move aside first: if a concurrent upload recreated the blob, put the bytes back
+    moved = await storage.move(key, trash_key)
+
+    if await db.blobs.find_one({"digest": digest}):
+        # Recreated by a concurrent upload: keep (or restore) its bytes and derivatives
+        if moved:
+            if await storage.exists(key):
+                await storage.delete(trash_key)
+            else:
+                await storage.move(trash_key, key)
+        return False
+
+    if moved:
+        await storage.delete(trash_key)
+    for derived_key in await derived_keys(digest):
+        await storage.delete(derived_key)
+
+    logger.info(f"Blob {digest} deleted (no references left)")
+    return True
@@ -0,0 +1,111 @@
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import DeleteOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from models.bulk_models import BulkItemResult, BulkRequest, BulkResult
+from datetime import datetime
+from typing import List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# A change applied by a bulk request: the item's tracked fields before and after
+# (after is None for a deletion), for the counter and cache hooks of the caller
+AppliedChange = Tuple[dict, Optional[dict]]
+
+
+def patch_fields(patch) -> dict:
+    """$set of a partial update model (unset fields are left alone), with updated_at"""
+    fields = {k: v for k, v in (patch.dict() if patch else {}).items() if v is not None}
+    fields["updated_at"] = datetime.utcnow()
+    return fields
+
+
+async def update_tracked(
+    collection: AsyncIOMotorCollection,
+    item_id: str,
+    fields: dict,
+    projection: dict
+) -> Optional[Tuple[dict, dict]]:
+    """$set fields on one item in one round trip; return the document before and after
+
+    find_one_and_update only returns one version of the document. BEFORE is kept because
+    the counter and cache hooks of the caller need the previous values, and the stored
+    document after the update is that one with the $set applied: the fields are literal
+    values, so this is exactly what MongoDB wrote. None when the item doesn't exist.
+    """
+    before = await collection.find_one_and_update(
+        {"id": item_id},
+        {"$set": fields},
+        projection=projection,
+        return_document=ReturnDocument.BEFORE
+    )
+    if before is None:
+        return None
+    return before, {**before, **fields}
+
+
+async def apply_bulk(
+    collection: AsyncIOMotorCollection,
+    bulk: BulkRequest,
+    tracked_fields: Tuple[str, ...],
+    allow_delete: bool = False
+) -> Tuple[BulkResult, List[AppliedChange]]:
+    """Apply a bulk request as one bulk_write and report the outcome of every item
+
+    The tracked fields of all targeted items are read in one query beforehand; they give
+    not-found results up front and the before/after states returned for the hooks. Items
+    changed by someone else between that read and the write only skew the counters until
+    their next reconciliation.
+    """
+    ids = [item.id for item in bulk.items]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Each id may appear only once")
+    if not allow_delete and any(item.delete for item in bulk.items):
+        raise HTTPException(status_code=400, detail="Delete is not supported here")
+
+    projection = {"_id": 0, "id": 1, **{field: 1 for field in tracked_fields}}
+    existing = {doc["id"]: doc async for doc in collection.find({"id": {"$in": ids}}, projection)}
+
+    results: List[BulkItemResult] = []
+    # (index in results, operation, state after) of each item sent to MongoDB
+    planned: List[Tuple[int, object, Optional[dict]]] = []
+    stopped = False
+    for item in bulk.items:
+        if stopped:
+            results.append(BulkItemResult(id=item.id, status="skipped"))
+            continue
+        if item.id not in existing:
+            results.append(BulkItemResult(id=item.id, status="not_found"))
+            stopped = bulk.ordered
+            continue
+
+        results.append(BulkItemResult(id=item.id, status="deleted" if item.delete else "updated"))
+        if item.delete:
+            planned.append((len(results) - 1, DeleteOne({"id": item.id}), None))
+        else:
+            fields = patch_fields(item.patch)
+            planned.append((len(results) - 1, UpdateOne({"id": item.id}, {"$set": fields}), {**existing[item.id], **fields}))
+
+    errors = {}
+    if planned:
+        try:
+            await collection.bulk_write([operation for _, operation, _ in planned], ordered=bulk.ordered)
+        except BulkWriteError as e:
+            errors = {error["index"]: error.get("errmsg", "Write failed") for error in e.details.get("writeErrors", [])}
+
+    applied: List[AppliedChange] = []
+    first_error = min(errors, default=None)
+    for position, (index, _, after) in enumerate(planned):
+        result = results[index]
+        if position in errors:
+            result.status, result.error = "failed", errors[position]
+        elif bulk.ordered and first_error is not None and position > first_error:
+            result.status = "skipped"
+        else:
+            applied.append((existing[result.id], after))
+
+    summary = BulkResult(ordered=bulk.ordered, results=results)
+    for result in results:
+        setattr(summary, result.status, getattr(summary, result.status) + 1)
+    return summary, applied
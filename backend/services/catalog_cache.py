@@ -0,0 +1,101 @@
+from datetime import datetime
+from starlette.concurrency import run_in_threadpool
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from services import compression
+from services.http_cache import make_etag
+import asyncio
+import logging
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+# How long a serialized catalog payload is served from memory
+CATALOG_CACHE_TTL_SECONDS = float(os.environ.get("CATALOG_CACHE_TTL_SECONDS", "300"))
+
+
+class CatalogEntry:
+    """Pre-serialized JSON payload for one catalog endpoint, with its HTTP validators
+
+    variants holds the body precompressed in every supported encoding, built once per load.
+    """
+
+    __slots__ = ("body", "variants", "last_modified", "etag", "expires_at")
+
+    def __init__(self, body: bytes, variants: Dict[str, bytes], last_modified: Optional[datetime], ttl: float):
+        self.body = body
+        self.variants = variants
+        self.last_modified = last_modified
+        self.etag = make_etag(body, last_modified)
+        self.expires_at = time.monotonic() + ttl
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+_entries: Dict[str, CatalogEntry] = {}
+_locks: Dict[str, asyncio.Lock] = {}
+_generation = 0
+_hits = 0
+_misses = 0
+
+
+async def get_or_load(
+    key: str,
+    loader: Callable[[], Awaitable[Tuple[bytes, Optional[datetime]]]]
+) -> CatalogEntry:
+    """Return the cached entry for key, calling loader to rebuild it when missing or expired
+
+    The loader returns the serialized body and the newest modification time of the documents.
+    """
+    global _hits, _misses
+
+    entry = _entries.get(key)
+    if entry is not None and entry.is_fresh:
+        _hits += 1
+        return entry
+
+    # Only one coroutine rebuilds a given key, the others wait for its result
+    lock = _locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        entry = _entries.get(key)
+        if entry is not None and entry.is_fresh:
+            _hits += 1
+            return entry
+
+        _misses += 1
+        generation = _generation
+        body, last_modified = await loader()
+        variants = await run_in_threadpool(compression.precompress, body)
+        entry = CatalogEntry(body, variants, last_modified, CATALOG_CACHE_TTL_SECONDS)
+
+        # Don't store a payload built from data that was invalidated meanwhile
+        if generation == _generation:
+            _entries[key] = entry
+        return entry
+
+
+def invalidate(key: Optional[str] = None) -> None:
+    """Drop one cached catalog payload, or all of them when no key is given"""
+    global _generation
+
+    _generation += 1
+    if key is None:
+        _entries.clear()
+        logger.info("Catalog cache invalidated")
+    else:
+        _entries.pop(key, None)
+        logger.info(f"Catalog cache invalidated for {key}")
+
+
+def get_cache_stats() -> dict:
+    """Return catalog cache statistics"""
+    lookups = _hits + _misses
+    return {
+        "entries": len(_entries),
+        "ttl_seconds": CATALOG_CACHE_TTL_SECONDS,
+        "hits": _hits,
+        "misses": _misses,
+        "hit_ratio": round(_hits / lookups, 4) if lookups else 0.0,
+    }
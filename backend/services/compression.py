@@ -0,0 +1,203 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Dict, Optional, Tuple
+import gzip
+import os
+
+try:
+    import brotli
+except ImportError:  # optional, gzip only without it
+    brotli = None
+
+# Negotiated response compression (brotli when the client accepts it and the module is
+# installed, gzip otherwise). Only complete bodies of an allowed content type and at least
+# COMPRESSION_MIN_SIZE bytes are compressed; streamed and media responses pass through.
+COMPRESSION_ENABLED = os.environ.get("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))
+# Per-request levels stay cheap; cached payloads are compressed once at the best ratio
+COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "5"))
+PRECOMPRESSED_GZIP_LEVEL = 9
+PRECOMPRESSED_BROTLI_QUALITY = 11
+
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/css",
+    "text/csv",
+    "text/html",
+    "text/plain",
+    "text/xml",
+})
+# Media files (already compressed formats, Range requests)
+EXCLUDED_PATH_PREFIXES = ("/uploads",)
+
+_responses_compressed = 0
+_precompressed_served = 0
+_bytes_in = 0
+_bytes_out = 0
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """Encodings we can produce, in order of preference"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Pick the preferred supported encoding of an Accept-Encoding header, None for identity"""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for coding in supported_encodings():
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return media_type in COMPRESSIBLE_TYPES
+
+
+def compress(body: bytes, encoding: str, best: bool = False) -> bytes:
+    """Compress body with encoding ("br" or "gzip"), at the best ratio for cached payloads"""
+    if encoding == "br":
+        return brotli.compress(body, quality=PRECOMPRESSED_BROTLI_QUALITY if best else COMPRESSION_BROTLI_QUALITY)
+    # mtime=0 keeps the output stable for a given body
+    return gzip.compress(body, compresslevel=PRECOMPRESSED_GZIP_LEVEL if best else COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def precompress(body: bytes) -> Dict[str, bytes]:
+    """Every supported encoding of a cacheable body (empty when it isn't worth compressing)
+
+    CPU heavy at these levels, run it in the threadpool.
+    """
+    if not COMPRESSION_ENABLED or len(body) < COMPRESSION_MIN_SIZE:
+        return {}
+    return {encoding: compress(body, encoding, best=True) for encoding in supported_encodings()}
+
+
+def weak_etag(etag: str) -> str:
+    """ETag of an encoded representation: weak, it still validates the identity one"""
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+def select_variant(accept_encoding: str, variants: Dict[str, bytes]) -> Optional[str]:
+    """Encoding of a precompressed variant to serve, None for the identity body"""
+    encoding = negotiate(accept_encoding) if variants else None
+    return encoding if encoding in variants else None
+
+
+def record_compressed(identity_size: int, encoded_size: int) -> None:
+    global _responses_compressed, _bytes_in, _bytes_out
+    _responses_compressed += 1
+    _bytes_in += identity_size
+    _bytes_out += encoded_size
+
+
+def record_precompressed(identity_size: int, encoded_size: int) -> None:
+    global _precompressed_served, _bytes_in, _bytes_out
+    _precompressed_served += 1
+    _bytes_in += identity_size
+    _bytes_out += encoded_size
+
+
+def add_vary(headers: MutableHeaders) -> None:
+    vary = headers.get("vary")
+    if not vary:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower() and vary.strip() != "*":
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete, compressible response bodies
+
+    Responses already carrying a Content-Encoding (precompressed cached payloads) are left
+    alone, like streamed ones: the start message is held until the first body chunk shows
+    whether the whole body is there.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not COMPRESSION_ENABLED
+            or scope["path"].startswith(EXCLUDED_PATH_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        start_message: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(scope=start)
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or not is_compressible(headers.get("content-type"))
+                or len(body) < self.minimum_size
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            # The representation depends on Accept-Encoding even when sent as identity
+            add_vary(headers)
+            if encoding is not None:
+                compressed = compress(body, encoding)
+                record_compressed(len(body), len(compressed))
+                body = compressed
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                if "etag" in headers:
+                    headers["ETag"] = weak_etag(headers["etag"])
+
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+def get_compression_stats() -> dict:
+    """Return response compression statistics"""
+    return {
+        "enabled": COMPRESSION_ENABLED,
+        "encodings": list(supported_encodings()),
+        "minimum_size": COMPRESSION_MIN_SIZE,
+        "responses_compressed": _responses_compressed,
+        "precompressed_served": _precompressed_served,
+        "bytes_in": _bytes_in,
+        "bytes_out": _bytes_out,
+        "ratio": round(_bytes_out / _bytes_in, 4) if _bytes_in else 0.0,
+    }
@@ -0,0 +1,241 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from datetime import datetime
+from typing import List, Optional, Tuple
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# The dashboard reads one document kept up to date with $inc by every write path;
+# a periodic reconciliation recomputes it from the collections to correct any drift
+COUNTERS_ID = "dashboard"
+COUNTER_FIELDS = (
+    "total_contact_requests",
+    "pending_contact_requests",
+    "total_testimonials",
+    "pending_testimonials",
+    "total_gallery_items",
+    "total_bookings",
+)
+RECENT_REQUESTS_LIMIT = 5
+DASHBOARD_RECONCILE_INTERVAL_SECONDS = int(os.environ.get("DASHBOARD_RECONCILE_INTERVAL_SECONDS", "3600"))
+
+
+def recent_request_summary(contact_request: dict) -> dict:
+    """Fields of a contact request shown in the dashboard's recent list"""
+    return {
+        "id": contact_request["id"],
+        "name": contact_request["name"],
+        "event_type": contact_request["event_type"],
+        "status": contact_request["status"],
+        "created_at": contact_request.get("created_at"),
+    }
+
+
+async def increment(db: AsyncIOMotorDatabase, extra_update: Optional[dict] = None, **deltas: int) -> None:
+    """Apply counter deltas atomically
+
+    A failed update is only logged: the write it describes already happened, and the next
+    reconciliation brings the counters back in line.
+    """
+    update = dict(extra_update or {})
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if deltas:
+        update["$inc"] = deltas
+    if not update:
+        return
+
+    update.setdefault("$set", {})["updated_at"] = datetime.utcnow()
+    try:
+        await db.stats.update_one({"_id": COUNTERS_ID}, update, upsert=True)
+    except Exception as e:
+        logger.error(f"Error updating dashboard counters {deltas}: {e}")
+
+
+async def contact_request_created(db: AsyncIOMotorDatabase, contact_request: dict) -> None:
+    await increment(
+        db,
+        {"$push": {"recent_requests": {
+            "$each": [recent_request_summary(contact_request)],
+            "$sort": {"created_at": -1},
+            "$slice": RECENT_REQUESTS_LIMIT,
+        }}},
+        total_contact_requests=1,
+        pending_contact_requests=int(contact_request["status"] == "new"),
+    )
+
+
+async def contact_requests_created(db: AsyncIOMotorDatabase, contact_requests: List[dict]) -> None:
+    """Bulk form of contact_request_created: one update for a batch of new requests"""
+    if not contact_requests:
+        return
+    await increment(
+        db,
+        {"$push": {"recent_requests": {
+            "$each": [recent_request_summary(contact_request) for contact_request in contact_requests],
+            "$sort": {"created_at": -1},
+            "$slice": RECENT_REQUESTS_LIMIT,
+        }}},
+        total_contact_requests=len(contact_requests),
+        pending_contact_requests=sum(int(contact_request["status"] == "new") for contact_request in contact_requests),
+    )
+
+
+async def contact_request_status_changed(db: AsyncIOMotorDatabase, request_id: str, old_status: str, new_status: str) -> None:
+    if old_status == new_status:
+        return
+    await increment(db, pending_contact_requests=int(new_status == "new") - int(old_status == "new"))
+    try:
+        # Keep the status shown in the recent list in step (no-op when the request isn't in it)
+        await db.stats.update_one(
+            {"_id": COUNTERS_ID, "recent_requests.id": request_id},
+            {"$set": {"recent_requests.$.status": new_status}}
+        )
+    except Exception as e:
+        logger.error(f"Error updating dashboard recent requests: {e}")
+
+
+async def contact_request_statuses_changed(db: AsyncIOMotorDatabase, changes: List[Tuple[str, str, str]]) -> None:
+    """Bulk form of contact_request_status_changed for (request_id, old_status, new_status) changes"""
+    changes = [change for change in changes if change[1] != change[2]]
+    if not changes:
+        return
+    await increment(db, pending_contact_requests=sum(int(new == "new") - int(old == "new") for _, old, new in changes))
+
+    by_status = {}
+    for request_id, _, new_status in changes:
+        by_status.setdefault(new_status, []).append(request_id)
+    try:
+        for new_status, request_ids in by_status.items():
+            await db.stats.update_one(
+                {"_id": COUNTERS_ID},
+                {"$set": {"recent_requests.$[request].status": new_status}},
+                array_filters=[{"request.id": {"$in": request_ids}}]
+            )
+    except Exception as e:
+        logger.error(f"Error updating dashboard recent requests: {e}")
+
+
+async def testimonial_created(db: AsyncIOMotorDatabase, is_approved: bool) -> None:
+    await increment(db, total_testimonials=1, pending_testimonials=int(not is_approved))
+
+
+async def testimonials_created(db: AsyncIOMotorDatabase, testimonials: List[dict]) -> None:
+    """Bulk form of testimonial_created for a batch of new testimonials"""
+    await increment(
+        db,
+        total_testimonials=len(testimonials),
+        pending_testimonials=sum(int(not testimonial["is_approved"]) for testimonial in testimonials),
+    )
+
+
+async def testimonial_approval_changed(db: AsyncIOMotorDatabase, was_approved: bool, is_approved: bool) -> None:
+    await increment(db, pending_testimonials=int(not is_approved) - int(not was_approved))
+
+
+async def testimonial_approvals_changed(db: AsyncIOMotorDatabase, changes: List[Tuple[bool, bool]]) -> None:
+    """Bulk form of testimonial_approval_changed for (was_approved, is_approved) changes"""
+    await increment(db, pending_testimonials=sum(int(not new) - int(not old) for old, new in changes))
+
+
+async def gallery_item_activity_changed(db: AsyncIOMotorDatabase, was_active: bool, is_active: bool) -> None:
+    """Creation is (False -> active), deletion is (active -> False)"""
+    await increment(db, total_gallery_items=int(is_active) - int(was_active))
+
+
+async def gallery_items_activity_changed(db: AsyncIOMotorDatabase, changes: List[Tuple[bool, bool]]) -> None:
+    """Bulk form of gallery_item_activity_changed for (was_active, is_active) changes"""
+    await increment(db, total_gallery_items=sum(int(new) - int(old) for old, new in changes))
+
+
+async def booking_created(db: AsyncIOMotorDatabase) -> None:
+    await increment(db, total_bookings=1)
+
+
+def facet_count(match: Optional[dict] = None) -> list:
+    return ([{"$match": match}] if match else []) + [{"$count": "n"}]
+
+
+def facet_value(result: dict, name: str) -> int:
+    return result[name][0]["n"] if result[name] else 0
+
+
+async def compute_counters(db: AsyncIOMotorDatabase) -> dict:
+    """Recompute every counter from the collections (one $facet aggregation per collection)"""
+    contact, testimonials, gallery, bookings = await asyncio.gather(
+        db.contact_requests.aggregate([{"$facet": {
+            "total": facet_count(),
+            "pending": facet_count({"status": "new"}),
+            "recent": [
+                {"$sort": {"created_at": -1, "id": -1}},
+                {"$limit": RECENT_REQUESTS_LIMIT},
+                {"$project": {"_id": 0, "id": 1, "name": 1, "event_type": 1, "status": 1, "created_at": 1}},
+            ],
+        }}]).to_list(1),
+        db.testimonials.aggregate([{"$facet": {
+            "total": facet_count(),
+            "pending": facet_count({"is_approved": False}),
+        }}]).to_list(1),
+        db.gallery_items.aggregate([{"$facet": {
+            "active": facet_count({"is_active": True}),
+        }}]).to_list(1),
+        db.bookings.aggregate([{"$facet": {
+            "total": facet_count(),
+        }}]).to_list(1),
+    )
+    contact, testimonials, gallery, bookings = contact[0], testimonials[0], gallery[0], bookings[0]
+
+    return {
+        "total_contact_requests": facet_value(contact, "total"),
+        "pending_contact_requests": facet_value(contact, "pending"),
+        "total_testimonials": facet_value(testimonials, "total"),
+        "pending_testimonials": facet_value(testimonials, "pending"),
+        "total_gallery_items": facet_value(gallery, "active"),
+        "total_bookings": facet_value(bookings, "total"),
+        "recent_requests": [recent_request_summary(request) for request in contact["recent"]],
+    }
+
+
+async def reconcile(db: AsyncIOMotorDatabase) -> dict:
+    """Overwrite the counters document with freshly computed values and return it
+
+    Writes landing while the aggregation runs may be counted twice or missed; the error is
+    bounded by the writes of that window and disappears at the next reconciliation.
+    """
+    counters = await compute_counters(db)
+    current = await db.stats.find_one({"_id": COUNTERS_ID}) or {}
+
+    drift = {
+        field: counters[field] - current.get(field, 0)
+        for field in COUNTER_FIELDS
+        if counters[field] != current.get(field, 0)
+    }
+    if current and drift:
+        logger.warning(f"Dashboard counters drifted, corrected by {drift}")
+
+    now = datetime.utcnow()
+    await db.stats.update_one(
+        {"_id": COUNTERS_ID},
+        {"$set": {**counters, "updated_at": now, "reconciled_at": now}},
+        upsert=True
+    )
+    return {**counters, "reconciled_at": now}
+
+
+async def get_counters(db: AsyncIOMotorDatabase) -> dict:
+    """Current counters in a single read (computed on first use)"""
+    counters = await db.stats.find_one({"_id": COUNTERS_ID})
+    if counters is None or "reconciled_at" not in counters:
+        counters = await reconcile(db)
+    return counters
+
+
+async def run_reconciliation(db: AsyncIOMotorDatabase) -> None:
+    """Periodically reconcile the counters (runs for the lifetime of the app)"""
+    while True:
+        try:
+            await reconcile(db)
+        except Exception as e:
+            logger.error(f"Error reconciling dashboard counters: {e}")
+        await asyncio.sleep(DASHBOARD_RECONCILE_INTERVAL_SECONDS)
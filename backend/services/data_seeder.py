@@ -1,6 +1,7 @@
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from models.event_models import EventPackage, PhotoboothPackage, AdditionalService
 from models.contact_models import Testimonial
+from services import catalog_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -303,4 +304,7 @@ async def seed_initial_data(db: AsyncIOMotorDatabase):
     for testimonial in testimonials:
         await db.testimonials.insert_one(testimonial.dict())
     
+    # Catalog data changed, drop any payload cached before the seed
+    catalog_cache.invalidate()
+    
     logger.info("Initial data seeded successfully")
\ No newline at end of file
@@ -0,0 +1,159 @@
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
+from typing import Optional
+from services import metrics
+import threading
+import logging
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+# Connection pool sizing (overridable through the environment)
+MONGO_MIN_POOL_SIZE = int(os.environ.get("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_POOL_SIZE = int(os.environ.get("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MAX_IDLE_TIME_MS = int(os.environ.get("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+
+_client: Optional[AsyncIOMotorClient] = None
+_db: Optional[AsyncIOMotorDatabase] = None
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Collect connection pool statistics from pymongo pool events"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.open_connections = 0
+        self.checked_out = 0
+        self.total_checkouts = 0
+        self.failed_checkouts = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def _record_wait(self) -> None:
+        started = getattr(self._local, "checkout_started", None)
+        if started is None:
+            return
+        self._local.checkout_started = None
+        waited = time.perf_counter() - started
+        self.total_wait_time += waited
+        self.max_wait_time = max(self.max_wait_time, waited)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections = max(0, self.open_connections - 1)
+
+    def connection_check_out_started(self, event):
+        self._local.checkout_started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.failed_checkouts += 1
+            self._record_wait()
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checked_out += 1
+            self.total_checkouts += 1
+            self._record_wait()
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def snapshot(self) -> dict:
+        """Return a point-in-time view of the pool counters"""
+        with self._lock:
+            average_wait = self.total_wait_time / self.total_checkouts if self.total_checkouts else 0.0
+            return {
+                "min_pool_size": MONGO_MIN_POOL_SIZE,
+                "max_pool_size": MONGO_MAX_POOL_SIZE,
+                "open_connections": self.open_connections,
+                "checked_out": self.checked_out,
+                "available": max(0, self.open_connections - self.checked_out),
+                "total_checkouts": self.total_checkouts,
+                "failed_checkouts": self.failed_checkouts,
+                "average_wait_ms": round(average_wait * 1000, 3),
+                "max_wait_ms": round(self.max_wait_time * 1000, 3),
+            }
+
+
+pool_stats = PoolStatsListener()
+
+
+def connect(mongo_url: Optional[str] = None, db_name: Optional[str] = None) -> AsyncIOMotorClient:
+    """Create the application-wide MongoDB client with a sized connection pool"""
+    global _client, _db
+
+    if _client is not None:
+        return _client
+
+    _client = AsyncIOMotorClient(
+        mongo_url or os.environ['MONGO_URL'],
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+        waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        event_listeners=[pool_stats, *metrics.listeners()],
+    )
+    _db = _client[db_name or os.environ['DB_NAME']]
+
+    logger.info(
+        f"MongoDB client created (minPoolSize={MONGO_MIN_POOL_SIZE}, maxPoolSize={MONGO_MAX_POOL_SIZE})"
+    )
+    return _client
+
+
+def close() -> None:
+    """Close the application-wide MongoDB client"""
+    global _client, _db
+
+    if _client is not None:
+        _client.close()
+    _client = None
+    _db = None
+
+
+def get_client() -> AsyncIOMotorClient:
+    """Return the shared MongoDB client"""
+    if _client is None:
+        raise RuntimeError("Database client is not initialized")
+    return _client
+
+
+def get_db() -> AsyncIOMotorDatabase:
+    """Return the shared application database"""
+    if _db is None:
+        raise RuntimeError("Database client is not initialized")
+    return _db
+
+
+async def get_database() -> AsyncIOMotorDatabase:
+    """FastAPI dependency returning the shared application database"""
+    return get_db()
+
+
+def get_pool_stats() -> dict:
+    """Return connection pool statistics"""
+    return pool_stats.snapshot()
@@ -0,0 +1,247 @@
+from collections import Counter, deque
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
+from datetime import datetime
+from types import CodeType, FrameType
+from typing import Deque, Optional, Tuple
+import asyncio
+import json
+import logging
+import sys
+import threading
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+# Diagnostics mode, cheap enough to leave on: one background thread watches an event-loop
+# heartbeat and reports stalls with the stack the loop was stuck in, and while requests are
+# in flight it samples the loop thread's stack so requests slower than the threshold come
+# with a profile of what the loop was doing meanwhile (their own code or whatever blocked it).
+DIAGNOSTICS_ENABLED = os.environ.get("DIAGNOSTICS_ENABLED", "false").lower() in ("1", "true", "yes")
+LOOP_STALL_THRESHOLD_MS = float(os.environ.get("LOOP_STALL_THRESHOLD_MS", "100"))
+SLOW_REQUEST_THRESHOLD_MS = float(os.environ.get("SLOW_REQUEST_THRESHOLD_MS", "1000"))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.environ.get("PROFILE_SAMPLE_INTERVAL_MS", "10"))
+# Reports are kept in memory for the admin endpoint and appended as JSON lines to this file
+DIAGNOSTICS_LOG_FILE = Path(os.environ.get("DIAGNOSTICS_LOG_FILE", "/app/logs/diagnostics.log"))
+DIAGNOSTICS_LOG_MAX_BYTES = 10 * 1024 * 1024
+DIAGNOSTICS_LOG_BACKUPS = 5
+MAX_REPORTS = 50
+# Samples older than this are dropped (bounds memory for very slow requests)
+SAMPLE_HISTORY_SECONDS = 60.0
+MAX_STACK_DEPTH = 40
+HEARTBEAT_INTERVAL_SECONDS = LOOP_STALL_THRESHOLD_MS / 4000
+TOP_STACKS = 15
+
+# One sample: when it was taken and the loop thread's stack, innermost frame first
+Sample = Tuple[float, Tuple[Tuple[CodeType, int], ...]]
+
+_loop_thread_id: Optional[int] = None
+_last_beat = 0.0
+_in_flight = 0
+_samples: Deque[Sample] = deque()
+_loop_stalls: Deque[dict] = deque(maxlen=MAX_REPORTS)
+_slow_requests: Deque[dict] = deque(maxlen=MAX_REPORTS)
+_heartbeat: Optional[asyncio.Task] = None
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+_report_logger = logging.getLogger("diagnostics.reports")
+_stall_count = 0
+_slow_request_count = 0
+
+
+def capture_stack(frame: Optional[FrameType]) -> Tuple[Tuple[CodeType, int], ...]:
+    """Code objects and line numbers of a stack, innermost first (formatted only when reported)"""
+    stack = []
+    while frame is not None and len(stack) < MAX_STACK_DEPTH:
+        stack.append((frame.f_code, frame.f_lineno))
+        frame = frame.f_back
+    return tuple(stack)
+
+
+def format_frame(code: CodeType, lineno: int) -> str:
+    return f"{code.co_filename}:{lineno} {code.co_name}"
+
+
+def is_idle(stack: Tuple[Tuple[CodeType, int], ...]) -> bool:
+    """Whether the loop was waiting for I/O rather than running code"""
+    if not stack:
+        return True
+    code = stack[0][0]
+    return code.co_filename.endswith("selectors.py") or code.co_name in ("run_forever", "run_until_complete")
+
+
+def loop_frame() -> Optional[FrameType]:
+    return sys._current_frames().get(_loop_thread_id)
+
+
+def write_report(report: dict) -> None:
+    try:
+        _report_logger.info(json.dumps(report, default=str))
+    except Exception as e:
+        logger.error(f"Error writing diagnostics report: {e}")
+
+
+def watch() -> None:
+    """Diagnostics thread: stall detection on every tick, stack sampling while requests run"""
+    global _stall_count
+    interval = PROFILE_SAMPLE_INTERVAL_MS / 1000
+    threshold = LOOP_STALL_THRESHOLD_MS / 1000
+    # Heartbeat seen stalled, with the stack found when the stall was detected
+    stalled_beat: Optional[float] = None
+    stall_stack: Tuple[Tuple[CodeType, int], ...] = ()
+
+    while not _stop.wait(interval):
+        now = time.monotonic()
+        beat = _last_beat
+
+        if stalled_beat is not None and beat != stalled_beat:
+            # The loop is running again: report the whole stall once
+            _stall_count += 1
+            report = {
+                "type": "loop_stall",
+                "at": datetime.utcnow().isoformat(),
+                "stalled_ms": round(max(0.0, beat - stalled_beat - HEARTBEAT_INTERVAL_SECONDS) * 1000, 1),
+                "stack": [format_frame(code, lineno) for code, lineno in stall_stack],
+            }
+            _loop_stalls.append(report)
+            write_report(report)
+            logger.warning(
+                f"Event loop blocked for {report['stalled_ms']}ms in "
+                f"{report['stack'][0] if report['stack'] else 'unknown code'}"
+            )
+            stalled_beat = None
+        elif stalled_beat is None and now - beat > threshold:
+            stalled_beat, stall_stack = beat, capture_stack(loop_frame())
+
+        if _in_flight:
+            _samples.append((now, capture_stack(loop_frame())))
+        while _samples and _samples[0][0] < now - SAMPLE_HISTORY_SECONDS:
+            _samples.popleft()
+
+
+async def run_heartbeat() -> None:
+    """Mark the loop as alive a few times per stall threshold until cancelled"""
+    global _last_beat
+    while True:
+        _last_beat = time.monotonic()
+        await asyncio.sleep(HEARTBEAT_INTERVAL_SECONDS)
+
+
+def profile(started: float, finished: float) -> dict:
+    """Fold the samples taken between two instants into their most frequent stacks"""
+    stacks = [stack for taken, stack in list(_samples) if started <= taken <= finished]
+    busy = [stack for stack in stacks if not is_idle(stack)]
+    folded = Counter(
+        ";".join(format_frame(code, lineno) for code, lineno in reversed(stack)) for stack in busy
+    )
+    return {
+        "samples": len(stacks),
+        "idle_ratio": round(1 - len(busy) / len(stacks), 3) if stacks else None,
+        # Outermost frame first, as flame graph tools expect
+        "stacks": [{"stack": stack, "count": count} for stack, count in folded.most_common(TOP_STACKS)],
+    }
+
+
+class DiagnosticsMiddleware:
+    """ASGI middleware reporting requests slower than SLOW_REQUEST_THRESHOLD_MS with a profile"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        global _in_flight, _slow_request_count
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        _in_flight += 1
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _in_flight -= 1
+            finished = time.monotonic()
+            elapsed_ms = (finished - started) * 1000
+            if elapsed_ms >= SLOW_REQUEST_THRESHOLD_MS:
+                _slow_request_count += 1
+                route = scope.get("route")
+                report = {
+                    "type": "slow_request",
+                    "at": datetime.utcnow().isoformat(),
+                    "method": scope["method"],
+                    "route": getattr(route, "path", None),
+                    "path": scope["path"],
+                    "duration_ms": round(elapsed_ms, 1),
+                    **profile(started, finished),
+                }
+                _slow_requests.append(report)
+                await run_in_threadpool(write_report, report)
+
+
+def open_report_file() -> None:
+    DIAGNOSTICS_LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    handler = RotatingFileHandler(
+        DIAGNOSTICS_LOG_FILE, maxBytes=DIAGNOSTICS_LOG_MAX_BYTES, backupCount=DIAGNOSTICS_LOG_BACKUPS, encoding="utf-8"
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _report_logger.addHandler(handler)
+    _report_logger.setLevel(logging.INFO)
+    # Reports only go to the file, not to the application log
+    _report_logger.propagate = False
+
+
+async def start() -> None:
+    """Start the heartbeat and the diagnostics thread (no-op unless enabled)"""
+    global _heartbeat, _thread, _last_beat, _loop_thread_id
+    if not DIAGNOSTICS_ENABLED:
+        return
+
+    try:
+        await run_in_threadpool(open_report_file)
+    except OSError as e:
+        logger.error(f"Diagnostics reports kept in memory only, can't open {DIAGNOSTICS_LOG_FILE}: {e}")
+
+    # Set before the thread starts so it doesn't see a stall until the first beat
+    _loop_thread_id = threading.get_ident()
+    _last_beat = time.monotonic()
+    _heartbeat = asyncio.create_task(run_heartbeat())
+    _stop.clear()
+    _thread = threading.Thread(target=watch, name="diagnostics", daemon=True)
+    _thread.start()
+    logger.info(
+        f"Diagnostics enabled (loop stalls > {LOOP_STALL_THRESHOLD_MS}ms, "
+        f"slow requests > {SLOW_REQUEST_THRESHOLD_MS}ms)"
+    )
+
+
+async def stop() -> None:
+    """Stop the diagnostics thread and close the report file"""
+    global _heartbeat, _thread
+    if _thread is not None:
+        _stop.set()
+        await run_in_threadpool(_thread.join)
+        _thread = None
+    if _heartbeat is not None:
+        _heartbeat.cancel()
+        _heartbeat = None
+    for handler in list(_report_logger.handlers):
+        _report_logger.removeHandler(handler)
+        handler.close()
+
+
+def get_diagnostics(limit: int = MAX_REPORTS) -> dict:
+    """Return the latest diagnostics reports, newest first"""
+    return {
+        "enabled": DIAGNOSTICS_ENABLED,
+        "loop_stall_threshold_ms": LOOP_STALL_THRESHOLD_MS,
+        "slow_request_threshold_ms": SLOW_REQUEST_THRESHOLD_MS,
+        "sample_interval_ms": PROFILE_SAMPLE_INTERVAL_MS,
+        "report_file": str(DIAGNOSTICS_LOG_FILE),
+        "loop_stalls_total": _stall_count,
+        "slow_requests_total": _slow_request_count,
+        "loop_stalls": list(reversed(_loop_stalls))[:limit],
+        "slow_requests": list(reversed(_slow_requests))[:limit],
+    }
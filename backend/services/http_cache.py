@@ -0,0 +1,104 @@
+from fastapi import Request, Response
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, Optional
+from services import compression
+import hashlib
+
+# Cache-Control policies for the public listings
+CATALOG_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=600"
+TESTIMONIALS_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def max_updated_at(documents: Iterable[dict]) -> Optional[datetime]:
+    """Return the most recent updated_at (or created_at) of a result set"""
+    latest = None
+    for doc in documents:
+        stamp = doc.get("updated_at") or doc.get("created_at")
+        if isinstance(stamp, datetime) and (latest is None or stamp > latest):
+            latest = stamp
+    return latest
+
+
+def make_etag(body: bytes, last_modified: Optional[datetime] = None) -> str:
+    """Build a strong ETag from the newest modification time and a hash of the body"""
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    if last_modified is None:
+        return f'"{digest}"'
+    return f'"{int(_as_utc(last_modified).timestamp())}-{digest}"'
+
+
+def format_http_date(value: datetime) -> str:
+    """Format a datetime as an HTTP-date"""
+    return format_datetime(_as_utc(value).replace(microsecond=0), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the current validators"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110, 13.2.2)
+        if if_none_match.strip() == "*":
+            return True
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return any(_strip_weak(tag) == _strip_weak(etag) for tag in candidates)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return _as_utc(last_modified).replace(microsecond=0) <= since
+
+    return False
+
+
+def conditional_response(
+    request: Request,
+    body: bytes,
+    cache_control: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[datetime] = None,
+    media_type: str = "application/json",
+    variants: Optional[Dict[str, bytes]] = None,
+) -> Response:
+    """Return a 304 when the client copy is current, the full body otherwise
+
+    variants are precompressed encodings of body, served as negotiated with Accept-Encoding.
+    """
+    if etag is None:
+        etag = make_etag(body, last_modified)
+
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_http_date(last_modified)
+
+    encoding = compression.select_variant(request.headers.get("accept-encoding", ""), variants or {})
+    if variants:
+        headers["Vary"] = "Accept-Encoding"
+    if encoding is not None:
+        headers["ETag"] = compression.weak_etag(etag)
+
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    if encoding is not None:
+        compression.record_precompressed(len(body), len(variants[encoding]))
+        headers["Content-Encoding"] = encoding
+        body = variants[encoding]
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def _strip_weak(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Mongo returns naive datetimes that are in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
@@ -0,0 +1,140 @@
+from concurrent.futures import ProcessPoolExecutor
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from starlette.concurrency import run_in_threadpool
+from services.storage import SCRATCH_DIR, get_storage, url_for
+from pathlib import Path
+from typing import Optional
+from datetime import datetime
+import asyncio
+import base64
+import io
+import logging
+import shutil
+import uuid
+import os
+
+logger = logging.getLogger(__name__)
+
+# Responsive widths generated for every gallery image (the smallest WebP is the thumbnail)
+DERIVATIVE_WIDTHS = (320, 640, 1280, 1920)
+PLACEHOLDER_WIDTH = 16
+WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+
+# Resizing is CPU-bound, so it runs in worker processes rather than threads
+IMAGE_WORKERS = int(os.environ.get("IMAGE_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def derivative_formats() -> tuple:
+    """Output formats supported by the installed Pillow build"""
+    from PIL import features
+
+    formats = ["webp"]
+    if features.check("avif"):
+        formats.append("avif")
+    return tuple(formats)
+
+
+def generate_derivatives(source_path: str, output_dir: str, stem: str, url_prefix: str) -> dict:
+    """Resize one image into responsive WebP/AVIF variants and a blur placeholder
+
+    Runs in a worker process. Widths larger than the original are skipped, so small
+    images get fewer variants. Returns the fields to record on the gallery document.
+    """
+    from PIL import Image, ImageOps
+
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original)
+        image.load()
+
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+    width, height = image.size
+    widths = [w for w in DERIVATIVE_WIDTHS if w < width] or [width]
+
+    variants = []
+    for target_width in widths:
+        target_height = max(1, round(height * target_width / width))
+        resized = image if target_width == width else image.resize((target_width, target_height), Image.LANCZOS)
+
+        for fmt in derivative_formats():
+            filename = f"{stem}-{target_width}w.{fmt}"
+            quality = AVIF_QUALITY if fmt == "avif" else WEBP_QUALITY
+            temp_path = output / f".{filename}.tmp"
+            resized.save(temp_path, format=fmt.upper(), quality=quality)
+            os.replace(temp_path, output / filename)
+            variants.append({
+                "width": target_width,
+                "height": target_height,
+                "format": fmt,
+                "url": f"{url_prefix}/{filename}",
+            })
+
+    # Tiny blurred preview inlined as a data URI while the real image loads
+    placeholder_height = max(1, round(height * PLACEHOLDER_WIDTH / width))
+    tiny = image.convert("RGB").resize((PLACEHOLDER_WIDTH, placeholder_height), Image.BILINEAR)
+    buffer = io.BytesIO()
+    tiny.save(buffer, format="WEBP", quality=30)
+    placeholder = "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+    thumbnail = next(v for v in variants if v["format"] == "webp")
+    return {
+        "width": width,
+        "height": height,
+        "variants": variants,
+        "thumbnail_url": thumbnail["url"],
+        "placeholder": placeholder,
+    }
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=IMAGE_WORKERS)
+    return _executor
+
+
+async def process_gallery_image(db: AsyncIOMotorDatabase, item_id: str, source_key: str) -> None:
+    """Generate derivatives for a gallery item, store them and record them on its document
+
+    Run by the media job workers, which retry it when it raises.
+    """
+    storage = get_storage()
+    stem = Path(source_key).stem
+    work_dir = SCRATCH_DIR / f"derive-{uuid.uuid4()}"
+    loop = asyncio.get_running_loop()
+
+    try:
+        async with storage.local_copy(source_key) as source_path:
+            result = await loop.run_in_executor(
+                get_executor(), generate_derivatives, str(source_path), str(work_dir), stem, url_for("derived")
+            )
+
+        for variant in result["variants"]:
+            filename = variant["url"].rsplit("/", 1)[1]
+            await storage.put_file(work_dir / filename, f"derived/{filename}", f"image/{variant['format']}")
+
+        await db.gallery_items.update_one(
+            {"id": item_id},
+            {"$set": {**result, "derivatives_status": "ready", "updated_at": datetime.utcnow()}}
+        )
+        logger.info(f"Generated {len(result['variants'])} image variants for gallery item {item_id}")
+    finally:
+        await run_in_threadpool(shutil.rmtree, work_dir, True)
+
+
+async def shutdown() -> None:
+    """Stop the worker processes (after the media job workers were cancelled)"""
+    global _executor
+
+    if _executor is not None:
+        # Joining the worker processes blocks, keep it off the event loop
+        await run_in_threadpool(_executor.shutdown, wait=True)
+        _executor = None
@@ -0,0 +1,251 @@
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+from typing import Dict, List
+import argparse
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Declarative index registry: one entry per query shape used by the routers and services.
+# Every index is named so the registry can be diffed against what the server actually has.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "admin_users": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+    ],
+    "contact_requests": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # Admin pages filtered by status (keyset on created_at, id) and the dashboard's pending count
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="status_created_at_id"),
+        # Unfiltered pages and dashboard's recent requests
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+        IndexModel(
+            [("name", TEXT), ("email", TEXT), ("message", TEXT)],
+            name="search_text",
+            default_language="french",
+            weights={"name": 10, "email": 5, "message": 1},
+        ),
+    ],
+    "bookings": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("contact_request_id", ASCENDING)], name="contact_request_id"),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="status_created_at_id"),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+    ],
+    "testimonials": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # Public approved list and admin pages filtered by approval, newest first
+        IndexModel(
+            [("is_approved", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="is_approved_created_at_id"
+        ),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+        IndexModel(
+            [("name", TEXT), ("event", TEXT), ("text", TEXT)],
+            name="search_text",
+            default_language="french",
+            weights={"name": 5, "event": 3, "text": 1},
+        ),
+    ],
+    "gallery_items": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+        IndexModel([("is_active", ASCENDING), ("created_at", DESCENDING)], name="is_active_created_at"),
+        # Derivative reuse when the same content is uploaded again
+        IndexModel([("content_hash", ASCENDING), ("derivatives_status", ASCENDING)], name="content_hash_status"),
+        IndexModel(
+            [("title", TEXT), ("description", TEXT), ("event_type", TEXT)],
+            name="search_text",
+            default_language="french",
+            weights={"title": 10, "event_type": 3, "description": 1},
+        ),
+    ],
+    "event_packages": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("type", ASCENDING), ("is_active", ASCENDING)], name="type_is_active"),
+        IndexModel([("is_active", ASCENDING)], name="is_active"),
+    ],
+    "photobooth_packages": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("is_active", ASCENDING)], name="is_active"),
+    ],
+    "additional_services": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("is_active", ASCENDING)], name="is_active"),
+    ],
+    "upload_sessions": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # Expired session sweep (the GC also removes chunk files, so no TTL index here)
+        IndexModel([("expires_at", ASCENDING)], name="expires_at"),
+    ],
+    "blobs": [
+        IndexModel([("digest", ASCENDING)], name="digest_unique", unique=True),
+    ],
+    "analytics_buckets": [
+        IndexModel(
+            [("metric", ASCENDING), ("granularity", ASCENDING), ("group_by", ASCENDING), ("bucket_start", ASCENDING)],
+            name="bucket_unique",
+            unique=True,
+        ),
+        # Invalidation of the buckets containing a given date
+        IndexModel([("metric", ASCENDING), ("bucket_start", ASCENDING)], name="metric_bucket_start"),
+    ],
+    "revoked_tokens": [
+        # Revocations disappear with the tokens they cover
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+        # Incremental sync of the in-memory revocation list
+        IndexModel([("revoked_at", ASCENDING)], name="revoked_at"),
+    ],
+    "media_jobs": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # Job claim per kind: due queued jobs and expired leases
+        IndexModel([("kind", ASCENDING), ("status", ASCENDING), ("run_after", ASCENDING)], name="kind_status_run_after"),
+        IndexModel(
+            [("kind", ASCENDING), ("status", ASCENDING), ("locked_until", ASCENDING)], name="kind_status_locked_until"
+        ),
+    ],
+}
+
+# Options that make two indexes with the same keys different
+COMPARED_OPTIONS = (
+    "unique", "sparse", "expireAfterSeconds", "partialFilterExpression", "collation", "weights", "default_language"
+)
+
+
+def index_signature(spec: dict) -> tuple:
+    """Comparable form of an index (keys in order plus the options that matter)
+
+    The server reports text indexes as {"_fts": "text", "_ftsx": 1} plus weights, so their
+    fields are compared through the weights instead.
+    """
+    key = spec["key"]
+    keys = tuple(
+        (field, int(direction) if isinstance(direction, (int, float)) else direction)
+        for field, direction in key.items()
+        if direction != "text" and field not in ("_fts", "_ftsx")
+    )
+    options = {option: spec[option] for option in COMPARED_OPTIONS if spec.get(option) not in (None, False)}
+
+    if "_fts" in key or "text" in key.values():
+        weights = spec.get("weights") or {field: 1 for field, direction in key.items() if direction == "text"}
+        options["weights"] = sorted((field, int(weight)) for field, weight in weights.items())
+    return keys, repr(sorted(options.items()))
+
+
+async def existing_indexes(db: AsyncIOMotorDatabase, collection: str) -> Dict[str, dict]:
+    """Indexes currently on a collection, by name (without the _id index)"""
+    indexes = {}
+    async for index in db[collection].list_indexes():
+        if index["name"] != "_id_":
+            indexes[index["name"]] = dict(index)
+    return indexes
+
+
+async def diff_indexes(db: AsyncIOMotorDatabase) -> Dict[str, dict]:
+    """Compare the registry with the database
+
+    Returns, per collection, the names of indexes that are missing, that exist with a different
+    definition, and that exist on the server without being declared.
+    """
+    diff = {}
+    for collection, models in INDEXES.items():
+        existing = await existing_indexes(db, collection)
+        declared = {model.document["name"]: model.document for model in models}
+
+        missing = [name for name in declared if name not in existing]
+        changed = [
+            name for name in declared
+            if name in existing and index_signature(existing[name]) != index_signature(declared[name])
+        ]
+        extra = [name for name in existing if name not in declared]
+
+        if missing or changed or extra:
+            diff[collection] = {"missing": missing, "changed": changed, "extra": extra}
+    return diff
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase, rebuild_changed: bool = False) -> List[str]:
+    """Create missing indexes (idempotent) and return the names created as "collection.name"
+
+    Indexes whose definition changed are only dropped and rebuilt when rebuild_changed is set,
+    since that briefly leaves the collection without them; otherwise they are logged.
+    """
+    created = []
+    for collection, changes in (await diff_indexes(db)).items():
+        declared = {model.document["name"]: model for model in INDEXES[collection]}
+
+        for name in changes["changed"]:
+            if not rebuild_changed:
+                logger.warning(f"Index {collection}.{name} differs from its declaration (run the index CLI to rebuild)")
+                continue
+            await db[collection].drop_index(name)
+            changes["missing"].append(name)
+
+        if changes["missing"]:
+            await db[collection].create_indexes([declared[name] for name in changes["missing"]])
+            created.extend(f"{collection}.{name}" for name in changes["missing"])
+
+    if created:
+        logger.info(f"Created indexes: {', '.join(created)}")
+    return created
+
+
+async def index_usage(db: AsyncIOMotorDatabase) -> Dict[str, Dict[str, int]]:
+    """Operations served by each index since the server started ($indexStats)"""
+    usage = {}
+    for collection in INDEXES:
+        try:
+            stats = await db[collection].aggregate([{"$indexStats": {}}]).to_list(None)
+        except OperationFailure as e:
+            logger.warning(f"$indexStats unavailable on {collection}: {e}")
+            continue
+        usage[collection] = {
+            stat["name"]: int(stat["accesses"]["ops"]) for stat in stats if stat["name"] != "_id_"
+        }
+    return usage
+
+
+async def unused_indexes(db: AsyncIOMotorDatabase) -> List[str]:
+    """Indexes that haven't served a single operation since the server started"""
+    return [
+        f"{collection}.{name}"
+        for collection, indexes in (await index_usage(db)).items()
+        for name, ops in indexes.items()
+        if ops == 0
+    ]
+
+
+async def main(command: str) -> None:
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"])
+    db = client[os.environ["DB_NAME"]]
+
+    try:
+        if command == "diff":
+            diff = await diff_indexes(db)
+            if not diff:
+                print("Indexes are up to date")
+            for collection, changes in diff.items():
+                for kind, names in changes.items():
+                    for name in names:
+                        print(f"{kind:8} {collection}.{name}")
+        elif command == "apply":
+            created = await ensure_indexes(db, rebuild_changed=True)
+            print("\n".join(created) if created else "Nothing to apply")
+        elif command == "unused":
+            unused = await unused_indexes(db)
+            print("\n".join(unused) if unused else "No unused indexes")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    # Usage (from backend/): python -m services.indexes {diff,apply,unused}
+    from dotenv import load_dotenv
+    from pathlib import Path
+
+    load_dotenv(Path(__file__).parent.parent / ".env")
+    parser = argparse.ArgumentParser(description="Manage MongoDB indexes")
+    parser.add_argument("command", choices=["diff", "apply", "unused"])
+    asyncio.run(main(parser.parse_args().command))
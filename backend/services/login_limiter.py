@@ -0,0 +1,164 @@
+from collections import OrderedDict
+from fastapi import Request
+from typing import Optional
+import logging
+import math
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+# Failed logins tolerated per key within the window. An address, or a username tried from
+# one address, is locked out beyond its allowance; the per-IP allowance is larger so a shared
+# address (office, NAT) isn't locked by one typo-prone user. A username alone is never locked
+# (anyone could lock a known account on purpose): beyond the allowance its attempts are slowed.
+LOGIN_MAX_FAILURES_PER_USER = int(os.environ.get("LOGIN_MAX_FAILURES_PER_USER", "5"))
+LOGIN_MAX_FAILURES_PER_IP = int(os.environ.get("LOGIN_MAX_FAILURES_PER_IP", "20"))
+LOGIN_FAILURE_WINDOW_SECONDS = float(os.environ.get("LOGIN_FAILURE_WINDOW_SECONDS", "900"))
+# Lockout after the allowance is spent: base, doubled with every further failure, capped
+LOGIN_BACKOFF_BASE_SECONDS = float(os.environ.get("LOGIN_BACKOFF_BASE_SECONDS", "2"))
+LOGIN_BACKOFF_MAX_SECONDS = float(os.environ.get("LOGIN_BACKOFF_MAX_SECONDS", "900"))
+# Delay added to every attempt on a username past its allowance (same doubling, lower cap)
+LOGIN_USER_DELAY_MAX_SECONDS = float(os.environ.get("LOGIN_USER_DELAY_MAX_SECONDS", "5"))
+# Reverse proxies in front of the API that append to X-Forwarded-For (0: use the peer address)
+TRUSTED_PROXY_COUNT = int(os.environ.get("TRUSTED_PROXY_COUNT", "0"))
+TRACKED_KEYS = 10000
+
+
+class FailureRecord:
+    __slots__ = ("failures", "first_failure", "locked_until")
+
+    def __init__(self, now: float):
+        self.failures = 0
+        self.first_failure = now
+        self.locked_until = 0.0
+
+
+# Keyed "ip:<address>", "user_ip:<username>|<address>" and "user:<username>", least
+# recently failed first
+_records: "OrderedDict[str, FailureRecord]" = OrderedDict()
+_blocked = 0
+_delayed = 0
+
+
+def client_ip(request: Request) -> Optional[str]:
+    """Address of the client, taken from X-Forwarded-For hops added by trusted proxies
+
+    Each trusted proxy appends the address it received the request from, so the client is
+    the entry added by the outermost one; entries before it are client supplied.
+    """
+    peer = request.client.host if request.client else None
+    if TRUSTED_PROXY_COUNT <= 0:
+        return peer
+    hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    if not hops:
+        return peer
+    return hops[-min(TRUSTED_PROXY_COUNT, len(hops))]
+
+
+def user_key(username: str) -> str:
+    return f"user:{username.lower()}"
+
+
+def keys_for(ip: Optional[str], username: str) -> dict:
+    """Keys locked out after too many failures, with the failure allowance of each"""
+    if not ip:
+        return {}
+    return {
+        f"ip:{ip}": LOGIN_MAX_FAILURES_PER_IP,
+        f"user_ip:{username.lower()}|{ip}": LOGIN_MAX_FAILURES_PER_USER,
+    }
+
+
+def backoff(excess: int, cap: float) -> float:
+    return min(LOGIN_BACKOFF_BASE_SECONDS * 2 ** (excess - 1), cap)
+
+
+def _record(key: str, now: float) -> Optional[FailureRecord]:
+    record = _records.get(key)
+    # A quiet window forgets earlier failures (a running lockout still applies)
+    if record is not None and now - record.first_failure > LOGIN_FAILURE_WINDOW_SECONDS and now >= record.locked_until:
+        del _records[key]
+        return None
+    return record
+
+
+def retry_after(ip: Optional[str], username: str) -> float:
+    """Seconds before this attempt may be made, 0 when it is allowed now
+
+    Checked before the password is hashed, so a locked out client costs no bcrypt work.
+    """
+    global _blocked
+
+    now = time.monotonic()
+    wait = 0.0
+    for key in keys_for(ip, username):
+        record = _record(key, now)
+        if record is not None:
+            wait = max(wait, record.locked_until - now)
+    if wait > 0:
+        _blocked += 1
+    return max(wait, 0.0)
+
+
+def login_delay(username: str) -> float:
+    """Seconds to hold an attempt on a username that failed too often (from any address)"""
+    global _delayed
+
+    record = _record(user_key(username), time.monotonic())
+    excess = record.failures - LOGIN_MAX_FAILURES_PER_USER if record is not None else 0
+    if excess <= 0:
+        return 0.0
+    _delayed += 1
+    return backoff(excess, LOGIN_USER_DELAY_MAX_SECONDS)
+
+
+def count_failure(key: str, now: float) -> FailureRecord:
+    record = _record(key, now)
+    if record is None:
+        record = _records[key] = FailureRecord(now)
+    record.failures += 1
+    _records.move_to_end(key)
+    return record
+
+
+def record_failure(ip: Optional[str], username: str) -> None:
+    """Count a failed attempt, locking keys that exceeded their allowance"""
+    now = time.monotonic()
+    count_failure(user_key(username), now)
+    for key, allowance in keys_for(ip, username).items():
+        record = count_failure(key, now)
+        excess = record.failures - allowance
+        if excess > 0:
+            lockout = backoff(excess, LOGIN_BACKOFF_MAX_SECONDS)
+            record.locked_until = now + lockout
+            logger.warning(f"Login locked for {key} during {lockout:.0f}s after {record.failures} failures")
+
+    while len(_records) > TRACKED_KEYS:
+        _records.popitem(last=False)
+
+
+def record_success(ip: Optional[str], username: str) -> None:
+    """Clear the username's failures (the address keeps its own until the window passes)"""
+    _records.pop(user_key(username), None)
+    if ip:
+        _records.pop(f"user_ip:{username.lower()}|{ip}", None)
+
+
+def retry_after_header(seconds: float) -> dict:
+    return {"Retry-After": str(max(1, math.ceil(seconds)))}
+
+
+def get_limiter_stats() -> dict:
+    """Return login rate limiter statistics"""
+    now = time.monotonic()
+    return {
+        "tracked_keys": len(_records),
+        "locked_keys": sum(1 for record in _records.values() if record.locked_until > now),
+        "blocked_attempts": _blocked,
+        "delayed_attempts": _delayed,
+        "max_failures_per_user": LOGIN_MAX_FAILURES_PER_USER,
+        "max_failures_per_ip": LOGIN_MAX_FAILURES_PER_IP,
+        "window_seconds": LOGIN_FAILURE_WINDOW_SECONDS,
+        "trusted_proxy_count": TRUSTED_PROXY_COUNT,
+    }
@@ -0,0 +1,296 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from starlette.concurrency import run_in_threadpool
+from services import image_derivatives
+from services.storage import SCRATCH_DIR, get_storage, key_from_url, url_for
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+import asyncio
+import json
+import logging
+import shutil
+import uuid
+import os
+
+logger = logging.getLogger(__name__)
+
+# External tools
+FFMPEG_PATH = os.environ.get("FFMPEG_PATH", "ffmpeg")
+FFPROBE_PATH = os.environ.get("FFPROBE_PATH", "ffprobe")
+
+# Worker limits: few concurrent video jobs, each ffmpeg process niced and capped in threads,
+# so a burst of video uploads can't starve the API process. Image jobs have their own
+# workers, one per image process, so they don't wait behind long video jobs.
+MEDIA_JOB_CONCURRENCY = int(os.environ.get("MEDIA_JOB_CONCURRENCY", "1"))
+MEDIA_JOB_FFMPEG_THREADS = int(os.environ.get("MEDIA_JOB_FFMPEG_THREADS", "2"))
+MEDIA_JOB_TIMEOUT_SECONDS = 10 * 60
+MEDIA_JOB_LEASE = timedelta(seconds=MEDIA_JOB_TIMEOUT_SECONDS + 60)
+MEDIA_JOB_MAX_ATTEMPTS = 5
+MEDIA_JOB_BACKOFF_BASE_SECONDS = 30
+MEDIA_JOB_BACKOFF_MAX_SECONDS = 60 * 60
+MEDIA_JOB_POLL_INTERVAL_SECONDS = 5
+
+# Preview loop settings
+PREVIEW_DURATION_SECONDS = 4
+PREVIEW_WIDTH = 480
+POSTER_MAX_WIDTH = 1280
+
+# Set when a job is queued so idle workers don't wait for the next poll
+_wake_up: Optional[asyncio.Event] = None
+
+
+class MediaJobError(Exception):
+    """A media job step failed"""
+
+
+async def enqueue_job(db: AsyncIOMotorDatabase, kind: str, gallery_item_id: str, file_url: str) -> str:
+    """Queue derivative generation for an upload and return the job id
+
+    kind is "image" (responsive variants and placeholder) or "video" (poster, preview loop).
+    Jobs live in MongoDB, so those interrupted by a restart are picked up again.
+    """
+    now = datetime.utcnow()
+    job = {
+        "id": str(uuid.uuid4()),
+        "kind": kind,
+        "gallery_item_id": gallery_item_id,
+        "file_url": file_url,
+        "status": "queued",  # "queued", "running", "done", "failed"
+        "attempts": 0,
+        "max_attempts": MEDIA_JOB_MAX_ATTEMPTS,
+        "run_after": now,
+        "locked_until": None,
+        "last_error": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+    await db.media_jobs.insert_one(job)
+    notify()
+
+    logger.info(f"Queued {kind} job {job['id']} for gallery item {gallery_item_id}")
+    return job["id"]
+
+
+async def enqueue_orphaned_items(db: AsyncIOMotorDatabase) -> int:
+    """Queue a job for gallery items still pending without one; returns how many were queued
+
+    Image derivatives used to be generated by in-process tasks, lost when the process stopped.
+    """
+    cursor = db.gallery_items.find(
+        {"derivatives_status": "pending", "file_type": {"$in": list(JOB_PROCESSORS)}},
+        {"_id": 0, "id": 1, "file_type": 1, "file_url": 1}
+    )
+    count = 0
+    async for item in cursor:
+        if not await db.media_jobs.find_one({"gallery_item_id": item["id"]}, {"_id": 1}):
+            await enqueue_job(db, item["file_type"], item["id"], item["file_url"])
+            count += 1
+    return count
+
+
+async def claim_next_job(db: AsyncIOMotorDatabase, kind: str) -> Optional[dict]:
+    """Atomically take the next due job of a kind, or one whose worker died holding its lease"""
+    now = datetime.utcnow()
+    return await db.media_jobs.find_one_and_update(
+        {
+            "kind": kind,
+            "$or": [
+                {"status": "queued", "run_after": {"$lte": now}},
+                {"status": "running", "locked_until": {"$lt": now}},
+            ]
+        },
+        {
+            "$set": {"status": "running", "locked_until": now + MEDIA_JOB_LEASE, "updated_at": now},
+            "$inc": {"attempts": 1},
+        },
+        sort=[("run_after", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """Exponential backoff between attempts"""
+    seconds = MEDIA_JOB_BACKOFF_BASE_SECONDS * 2 ** max(0, attempts - 1)
+    return timedelta(seconds=min(seconds, MEDIA_JOB_BACKOFF_MAX_SECONDS))
+
+
+async def run_tool(args: List[str]) -> bytes:
+    """Run ffmpeg/ffprobe at low CPU priority and return its stdout"""
+    if shutil.which("nice"):
+        args = ["nice", "-n", "10", *args]
+
+    process = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), MEDIA_JOB_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise MediaJobError(f"{args[0]} timed out")
+
+    if process.returncode != 0:
+        raise MediaJobError(stderr.decode(errors="replace").strip()[-500:])
+    return stdout
+
+
+async def probe_video(source_path: str) -> dict:
+    """Read duration and resolution with ffprobe"""
+    output = await run_tool([
+        FFPROBE_PATH, "-v", "error", "-print_format", "json",
+        "-show_format", "-show_streams", "-select_streams", "v:0", source_path,
+    ])
+    info = json.loads(output)
+    stream = (info.get("streams") or [{}])[0]
+    duration = info.get("format", {}).get("duration") or stream.get("duration")
+
+    return {
+        "duration": round(float(duration), 3) if duration else None,
+        "width": stream.get("width"),
+        "height": stream.get("height"),
+    }
+
+
+async def process_video_job(db: AsyncIOMotorDatabase, job: dict) -> None:
+    """Extract a poster frame, a short preview loop and metadata, stored next to the original video"""
+    storage = get_storage()
+    source_key = key_from_url(job["file_url"])
+    if not await storage.exists(source_key):
+        raise MediaJobError(f"Source file missing: {source_key}")
+
+    directory, _, filename = source_key.rpartition("/")
+    stem = Path(filename).stem
+    work_dir = SCRATCH_DIR / f"video-{job['id']}"
+    await run_in_threadpool(work_dir.mkdir, parents=True, exist_ok=True)
+
+    try:
+        async with storage.local_copy(source_key) as source:
+            metadata = await probe_video(str(source))
+            duration = metadata["duration"] or 0
+
+            # Poster from a frame a little into the video (the very first one is often black)
+            poster_name = f"{stem}.poster.jpg"
+            await run_tool([
+                FFMPEG_PATH, "-y", "-v", "error", "-threads", str(MEDIA_JOB_FFMPEG_THREADS),
+                "-ss", str(min(1.0, duration / 2)), "-i", str(source),
+                "-frames:v", "1", "-vf", f"scale='min({POSTER_MAX_WIDTH},iw)':-2", "-q:v", "3",
+                str(work_dir / poster_name),
+            ])
+
+            # Muted, low-bitrate preview loop for hover/autoplay in grids
+            preview_name = f"{stem}.preview.mp4"
+            await run_tool([
+                FFMPEG_PATH, "-y", "-v", "error", "-threads", str(MEDIA_JOB_FFMPEG_THREADS),
+                "-ss", str(min(1.0, duration / 4)), "-t", str(PREVIEW_DURATION_SECONDS), "-i", str(source),
+                "-an", "-vf", f"scale={PREVIEW_WIDTH}:-2,fps=15",
+                "-c:v", "libx264", "-preset", "veryfast", "-crf", "32", "-pix_fmt", "yuv420p",
+                "-movflags", "+faststart", str(work_dir / preview_name),
+            ])
+
+        poster_key = f"{directory}/{poster_name}"
+        preview_key = f"{directory}/{preview_name}"
+        await storage.put_file(work_dir / poster_name, poster_key, "image/jpeg")
+        await storage.put_file(work_dir / preview_name, preview_key, "video/mp4")
+    finally:
+        await run_in_threadpool(shutil.rmtree, work_dir, True)
+
+    await db.gallery_items.update_one(
+        {"id": job["gallery_item_id"]},
+        {"$set": {
+            **metadata,
+            "thumbnail_url": url_for(poster_key),
+            "preview_url": url_for(preview_key),
+            "derivatives_status": "ready",
+            "updated_at": datetime.utcnow(),
+        }}
+    )
+
+
+async def process_image_job(db: AsyncIOMotorDatabase, job: dict) -> None:
+    """Generate the responsive variants and placeholder of an uploaded image"""
+    await image_derivatives.process_gallery_image(db, job["gallery_item_id"], key_from_url(job["file_url"]))
+
+
+JOB_PROCESSORS = {
+    "image": process_image_job,
+    "video": process_video_job,
+}
+
+
+async def run_job(db: AsyncIOMotorDatabase, job: dict) -> None:
+    """Run one claimed job and record its outcome, rescheduling it on failure"""
+    label = f"{job['kind'].capitalize()} job {job['id']}"
+    try:
+        await JOB_PROCESSORS[job["kind"]](db, job)
+        await db.media_jobs.update_one(
+            {"id": job["id"]},
+            {"$set": {"status": "done", "locked_until": None, "last_error": None, "updated_at": datetime.utcnow()}}
+        )
+        logger.info(f"{label} done (gallery item {job['gallery_item_id']})")
+
+    except Exception as e:
+        now = datetime.utcnow()
+        if job["attempts"] >= job.get("max_attempts", MEDIA_JOB_MAX_ATTEMPTS):
+            logger.error(f"{label} failed permanently: {e}")
+            await db.media_jobs.update_one(
+                {"id": job["id"]},
+                {"$set": {"status": "failed", "locked_until": None, "last_error": str(e), "updated_at": now}}
+            )
+            await db.gallery_items.update_one(
+                {"id": job["gallery_item_id"]},
+                {"$set": {"derivatives_status": "failed", "updated_at": now}}
+            )
+        else:
+            delay = backoff_delay(job["attempts"])
+            logger.warning(f"{label} attempt {job['attempts']} failed, retrying in {delay}: {e}")
+            await db.media_jobs.update_one(
+                {"id": job["id"]},
+                {"$set": {
+                    "status": "queued",
+                    "run_after": now + delay,
+                    "locked_until": None,
+                    "last_error": str(e),
+                    "updated_at": now,
+                }}
+            )
+
+
+async def worker(db: AsyncIOMotorDatabase, kind: str, wake_up: asyncio.Event) -> None:
+    """Process jobs of one kind one at a time until cancelled"""
+    while True:
+        try:
+            job = await claim_next_job(db, kind)
+            if job is not None:
+                await run_job(db, job)
+                continue
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Media job worker error: {e}")
+
+        # Nothing due: sleep until the next poll or until a new job is queued
+        wake_up.clear()
+        try:
+            await asyncio.wait_for(wake_up.wait(), MEDIA_JOB_POLL_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+def notify() -> None:
+    """Wake idle workers after a job was queued"""
+    if _wake_up is not None:
+        _wake_up.set()
+
+
+def start_workers(db: AsyncIOMotorDatabase) -> List[asyncio.Task]:
+    """Start the media job workers (cancel the returned tasks to stop them)"""
+    global _wake_up
+
+    _wake_up = asyncio.Event()
+    concurrency = {"image": image_derivatives.IMAGE_WORKERS, "video": MEDIA_JOB_CONCURRENCY}
+    return [
+        asyncio.create_task(worker(db, kind, _wake_up))
+        for kind, count in concurrency.items()
+        for _ in range(count)
+    ]
@@ -0,0 +1,233 @@
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.types import Receive, Scope, Send
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Optional, Tuple
+import anyio
+import logging
+import mimetypes
+import os
+import re
+import stat
+import time
+
+logger = logging.getLogger(__name__)
+
+# Cache policies: content-addressed names never change, everything else is revalidated hourly
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "public, max-age=3600"
+
+# Stat/MIME metadata cache
+MEDIA_METADATA_CACHE_SIZE = 4096
+MEDIA_METADATA_CACHE_TTL_SECONDS = 60
+
+MEDIA_CHUNK_SIZE = 256 * 1024
+
+# A filename whose stem is a SHA-256 hex digest (optionally followed by a variant suffix)
+CONTENT_ADDRESSED_NAME = re.compile(r"^[0-9a-f]{64}([.-][A-Za-z0-9.-]*)?$")
+SAFE_FILENAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+RANGE_HEADER = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class MediaFile:
+    """Cached filesystem metadata and HTTP validators for one media file"""
+
+    __slots__ = ("path", "stat_result", "media_type", "etag", "last_modified", "cache_control", "expires_at")
+
+    def __init__(self, path: Path, stat_result: os.stat_result):
+        self.path = path
+        self.stat_result = stat_result
+        self.media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        self.etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+        self.last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+        self.cache_control = (
+            IMMUTABLE_CACHE_CONTROL if CONTENT_ADDRESSED_NAME.match(path.name) else DEFAULT_CACHE_CONTROL
+        )
+        self.expires_at = time.monotonic() + MEDIA_METADATA_CACHE_TTL_SECONDS
+
+    @property
+    def size(self) -> int:
+        return self.stat_result.st_size
+
+    def headers(self) -> dict:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": self.last_modified,
+            "Cache-Control": self.cache_control,
+            "Accept-Ranges": "bytes",
+        }
+
+
+_metadata: "OrderedDict[Path, MediaFile]" = OrderedDict()
+
+
+def is_safe_filename(filename: str) -> bool:
+    """Reject names that could escape the media directory (no separators, no leading dot)"""
+    return bool(SAFE_FILENAME.match(filename)) and ".." not in filename
+
+
+async def get_media_file(path: Path) -> Optional[MediaFile]:
+    """Return metadata for path from the cache, calling stat off the event loop on a miss"""
+    media_file = _metadata.get(path)
+    if media_file is not None and media_file.expires_at > time.monotonic():
+        _metadata.move_to_end(path)
+        return media_file
+
+    try:
+        stat_result = await run_in_threadpool(os.stat, path)
+    except (FileNotFoundError, NotADirectoryError):
+        _metadata.pop(path, None)
+        return None
+    if not stat.S_ISREG(stat_result.st_mode):
+        return None
+
+    media_file = MediaFile(path, stat_result)
+    _metadata[path] = media_file
+    _metadata.move_to_end(path)
+    while len(_metadata) > MEDIA_METADATA_CACHE_SIZE:
+        _metadata.popitem(last=False)
+    return media_file
+
+
+def forget_media_file(path: Path) -> None:
+    """Drop cached metadata after a file was replaced or deleted"""
+    _metadata.pop(path, None)
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single bytes range into inclusive (start, end)
+
+    Returns None when the header should be ignored (malformed or multiple ranges) and
+    raises ValueError when the range can't be satisfied.
+    """
+    match = RANGE_HEADER.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if first == "" and last == "":
+        return None
+    if size == 0:
+        # No range of an empty file can be satisfied (RFC 9110, 14.1.1)
+        raise ValueError("Empty file")
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError("Range not satisfiable")
+    return start, min(end, size - 1)
+
+
+def if_range_matches(request: Request, media_file: MediaFile) -> bool:
+    """If-Range: only honour the range when the client's validator is still current"""
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        # Weak validators never match for If-Range (RFC 9110, 13.1.5)
+        return if_range == media_file.etag
+    try:
+        return parsedate_to_datetime(if_range) == parsedate_to_datetime(media_file.last_modified)
+    except (TypeError, ValueError):
+        return False
+
+
+def is_not_modified(request: Request, media_file: MediaFile) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or media_file.etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            return int(media_file.stat_result.st_mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class FileRangeResponse(Response):
+    """206 response streaming one byte range of a file
+
+    Uses the ASGI zero-copy send extension when the server offers it, so the kernel
+    copies the bytes, and falls back to chunked reads in a worker thread otherwise.
+    """
+
+    def __init__(self, media_file: MediaFile, start: int, end: int):
+        super().__init__(status_code=206, media_type=media_file.media_type)
+        self.path = media_file.path
+        self.start = start
+        self.count = end - start + 1
+        self.headers.update(media_file.headers())
+        self.headers["Content-Range"] = f"bytes {start}-{end}/{media_file.size}"
+        self.headers["Content-Length"] = str(self.count)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            file = await run_in_threadpool(open, self.path, "rb")
+            try:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file.fileno(),
+                    "offset": self.start,
+                    "count": self.count,
+                    "more_body": False,
+                })
+            finally:
+                file.close()
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            remaining = self.count
+            while remaining > 0:
+                chunk = await file.read(min(MEDIA_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                # File shrank under us: close the body rather than hang the client
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def serve_media_file(request: Request, media_file: MediaFile) -> Response:
+    """Build the response for a media file, honouring conditional and Range requests"""
+    headers = media_file.headers()
+
+    if is_not_modified(request, media_file):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if range_header is not None and if_range_matches(request, media_file):
+        try:
+            byte_range = parse_range(range_header, media_file.size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{media_file.size}"})
+        if byte_range is not None:
+            return FileRangeResponse(media_file, *byte_range)
+
+    # Whole file: FileResponse reuses our stat result and uses pathsend when the server supports it
+    return FileResponse(
+        path=media_file.path,
+        media_type=media_file.media_type,
+        headers=headers,
+        stat_result=media_file.stat_result,
+    )
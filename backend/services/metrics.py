@@ -0,0 +1,189 @@
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from pymongo import monitoring
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Dict, Iterable, Tuple
+import asyncio
+import logging
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+# Prometheus metrics served on /metrics. Each worker process keeps its own values, so with
+# several workers every process has to be scraped (or run a single worker per container).
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+# How often the event loop is asked to wake up to measure its lag (seconds)
+LOOP_LAG_INTERVAL_SECONDS = float(os.environ.get("LOOP_LAG_INTERVAL_SECONDS", "0.5"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ["method", "route"],
+    buckets=LATENCY_BUCKETS
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests being handled, by API area", ["area"]
+)
+MONGO_COMMAND_LATENCY = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency by collection and command", ["collection", "command"],
+    buckets=MONGO_BUCKETS
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "mongo_command_failures_total", "Failed MongoDB commands by collection and command", ["collection", "command"]
+)
+UPLOAD_BYTES = Counter(
+    "upload_bytes_total", "Uploaded bytes by upload path (direct uploads go to the bucket)", ["path"]
+)
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "Delay of the event loop waking up past its scheduled time",
+    buckets=LOOP_LAG_BUCKETS
+)
+
+# Path prefixes used as in-flight areas (the route template is only known after routing)
+_areas: frozenset = frozenset()
+
+
+def set_areas(paths: Iterable[str]) -> None:
+    """Derive the in-flight areas from the app's route paths (first two segments)"""
+    global _areas
+    _areas = frozenset("/".join(path.split("/")[:3]) for path in paths)
+
+
+def area_of(path: str) -> str:
+    area = "/".join(path.split("/")[:3])
+    return area if area in _areas else "other"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts, latency and in-flight requests
+
+    Requests are labelled with their route template (/api/admin/gallery/{item_id}), never the
+    raw path, so the label set stays bounded; unmatched paths are counted as "unmatched".
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels(area_of(scope["path"]))
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec()
+            # FastAPI stores the matched route in the scope while routing
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUESTS.labels(scope["method"], template, str(status_code)).inc()
+            HTTP_LATENCY.labels(scope["method"], template).observe(elapsed)
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Time MongoDB commands per collection from pymongo command events"""
+
+    def __init__(self):
+        # (connection, request id) of started commands -> (collection, command)
+        self._started: Dict[Tuple[object, int], Tuple[str, str]] = {}
+
+    @staticmethod
+    def collection_of(event: monitoring.CommandStartedEvent) -> str:
+        if event.command_name == "getMore":
+            return event.command.get("collection", "")
+        target = event.command.get(event.command_name)
+        return target if isinstance(target, str) else ""
+
+    def started(self, event):
+        self._started[(event.connection_id, event.request_id)] = (self.collection_of(event), event.command_name)
+
+    def succeeded(self, event):
+        labels = self._started.pop((event.connection_id, event.request_id), None)
+        if labels is not None:
+            MONGO_COMMAND_LATENCY.labels(*labels).observe(event.duration_micros / 1_000_000)
+
+    def failed(self, event):
+        labels = self._started.pop((event.connection_id, event.request_id), None)
+        if labels is not None:
+            MONGO_COMMAND_LATENCY.labels(*labels).observe(event.duration_micros / 1_000_000)
+            MONGO_COMMAND_FAILURES.labels(*labels).inc()
+
+
+command_listener = CommandMetricsListener()
+
+
+class StatsCollector:
+    """Expose the in-process statistics (caches, connection pool, queues) at scrape time"""
+
+    def describe(self):
+        # Nothing to collect at registration, while the services are still being imported
+        return []
+
+    def collect(self):
+        # Imported at scrape time: the database layer imports this module
+        from services import catalog_cache, database, principal_cache, write_behind
+
+        hits = CounterMetricFamily("cache_hits_total", "Cache lookups served from memory", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses_total", "Cache lookups that had to load", labels=["cache"])
+        ratio = GaugeMetricFamily("cache_hit_ratio", "Cache hits over lookups since start", labels=["cache"])
+        for name, stats in (("catalog", catalog_cache.get_cache_stats()), ("principal", principal_cache.get_cache_stats())):
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            ratio.add_metric([name], stats["hit_ratio"])
+        yield hits
+        yield misses
+        yield ratio
+
+        pool = database.get_pool_stats()
+        yield GaugeMetricFamily("mongo_pool_open_connections", "Open MongoDB connections", value=pool["open_connections"])
+        yield GaugeMetricFamily("mongo_pool_checked_out", "MongoDB connections in use", value=pool["checked_out"])
+
+        queued = GaugeMetricFamily("write_behind_queued", "Accepted submissions not inserted yet", labels=["collection"])
+        for collection, stats in write_behind.get_queue_stats()["queues"].items():
+            queued.add_metric([collection], stats["queued"])
+        yield queued
+
+
+async def run_loop_lag_monitor() -> None:
+    """Measure how late the event loop wakes up from a sleep until cancelled"""
+    loop = asyncio.get_running_loop()
+    while True:
+        scheduled = loop.time() + LOOP_LAG_INTERVAL_SECONDS
+        await asyncio.sleep(LOOP_LAG_INTERVAL_SECONDS)
+        LOOP_LAG.observe(max(0.0, loop.time() - scheduled))
+
+
+def record_upload_bytes(path: str, size: int) -> None:
+    UPLOAD_BYTES.labels(path).inc(size)
+
+
+def render() -> Tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, with its content type"""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def listeners() -> list:
+    """pymongo event listeners to install on the client (none when metrics are off)"""
+    return [command_listener] if METRICS_ENABLED else []
+
+
+if METRICS_ENABLED:
+    REGISTRY.register(StatsCollector())
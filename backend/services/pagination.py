@@ -0,0 +1,83 @@
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorCollection
+from datetime import datetime
+from typing import List, Optional, Tuple
+import base64
+import json
+
+# Page size limits shared by the admin listings
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Keyset order: newest first, id breaks ties between documents created in the same millisecond
+SORT_ORDER = [("created_at", -1), ("id", -1)]
+
+
+def encode_cursor(document: dict) -> str:
+    """Opaque cursor pointing at a document's position in the (created_at, id) order"""
+    payload = json.dumps({"c": document["created_at"].isoformat(), "i": document["id"]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(payload["c"]), str(payload["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(cursor: str, operator: str) -> dict:
+    """Documents strictly after ($lt, older) or before ($gt, newer) the cursor position"""
+    created_at, item_id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {"created_at": {operator: created_at}},
+            {"created_at": created_at, "id": {operator: item_id}},
+        ]
+    }
+
+
+async def paginate(
+    collection: AsyncIOMotorCollection,
+    filter_query: dict,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    projection: Optional[dict] = None
+) -> Tuple[List[dict], Optional[str], Optional[str]]:
+    """Fetch one page in (created_at, id) descending order
+
+    `after` continues towards older documents (the next page), `before` goes back towards
+    newer ones. One extra document is read to know whether another page exists, so every
+    page costs an index seek plus `limit + 1` reads whatever the collection size.
+    Returns (documents, next_cursor, prev_cursor).
+    """
+    if after and before:
+        raise HTTPException(status_code=400, detail="Use either after or before, not both")
+
+    query = dict(filter_query)
+    if after:
+        query = {"$and": [filter_query, keyset_filter(after, "$lt")]}
+    elif before:
+        query = {"$and": [filter_query, keyset_filter(before, "$gt")]}
+
+    # Going backwards reads in ascending order from the cursor, then flips the page
+    sort = [(field, -direction) for field, direction in SORT_ORDER] if before else SORT_ORDER
+    documents = await collection.find(query, projection).sort(sort).limit(limit + 1).to_list(limit + 1)
+
+    has_more = len(documents) > limit
+    documents = documents[:limit]
+    if before:
+        documents.reverse()
+
+    if not documents:
+        return documents, None, None
+
+    if before:
+        next_cursor = encode_cursor(documents[-1])
+        prev_cursor = encode_cursor(documents[0]) if has_more else None
+    else:
+        next_cursor = encode_cursor(documents[-1]) if has_more else None
+        prev_cursor = encode_cursor(documents[0]) if after else None
+    return documents, next_cursor, prev_cursor
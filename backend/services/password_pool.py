@@ -0,0 +1,142 @@
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from typing import Callable, Optional, TypeVar
+from services.auth_service import get_password_hash, verify_password
+import asyncio
+import logging
+import threading
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# bcrypt releases the GIL while hashing, so a few dedicated threads keep ~100-300ms hashes
+# off the event loop without competing with the default thread pool used for file I/O
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "2"))
+# Hashes running or waiting beyond this are refused instead of queueing up behind a burst
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", "16"))
+LATENCY_SAMPLES = 512
+
+
+class PasswordPoolBusy(Exception):
+    """Too many password hashes are already running or waiting"""
+
+
+class HashStats:
+    """Latency and queueing statistics of the password pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.total_wait_time = 0.0
+        self.samples = deque(maxlen=LATENCY_SAMPLES)
+
+    def acquire(self) -> bool:
+        """Take a pending slot, False (counted as rejected) when the pool is saturated"""
+        with self._lock:
+            if self.pending >= PASSWORD_HASH_MAX_PENDING:
+                self.rejected += 1
+                return False
+            self.pending += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def record(self, waited: float, elapsed: float) -> None:
+        with self._lock:
+            self.completed += 1
+            self.total_time += elapsed
+            self.total_wait_time += waited
+            self.max_time = max(self.max_time, elapsed)
+            self.samples.append(elapsed)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = sorted(self.samples)
+            completed = self.completed
+
+            def percentile(p: float) -> float:
+                return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 3) if samples else 0.0
+
+            return {
+                "workers": PASSWORD_HASH_WORKERS,
+                "max_pending": PASSWORD_HASH_MAX_PENDING,
+                "pending": self.pending,
+                "completed": completed,
+                "rejected": self.rejected,
+                "average_ms": round(self.total_time / completed * 1000, 3) if completed else 0.0,
+                "average_wait_ms": round(self.total_wait_time / completed * 1000, 3) if completed else 0.0,
+                "p50_ms": percentile(0.5),
+                "p95_ms": percentile(0.95),
+                "p99_ms": percentile(0.99),
+                "max_ms": round(self.max_time * 1000, 3),
+            }
+
+
+hash_stats = HashStats()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+    return _executor
+
+
+async def run_in_pool(func: Callable[..., T], *args) -> T:
+    """Run a hashing function in the password pool, refusing work when it is saturated"""
+    if not hash_stats.acquire():
+        raise PasswordPoolBusy()
+
+    submitted = time.perf_counter()
+
+    def timed():
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            hash_stats.record(started - submitted, time.perf_counter() - started)
+
+    try:
+        future = get_executor().submit(timed)
+    except BaseException:
+        hash_stats.release()
+        raise
+    # The slot is held until the hash itself is done (or cancelled before it started), not
+    # until the caller stops waiting: a disconnected client doesn't stop a running hash
+    future.add_done_callback(lambda _: hash_stats.release())
+    return await asyncio.wrap_future(future)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop"""
+    return await run_in_pool(verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password without blocking the event loop"""
+    return await run_in_pool(get_password_hash, password)
+
+
+def get_hash_stats() -> dict:
+    """Return password pool statistics"""
+    return hash_stats.snapshot()
+
+
+def shutdown() -> None:
+    """Stop the hashing threads (queued hashes are dropped)"""
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
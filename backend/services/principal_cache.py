@@ -0,0 +1,127 @@
+from models.admin_models import AdminUser
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+# How long an authenticated admin is served from memory before the database is asked again.
+# Invalidation is per process, so this also bounds how long another worker can lag behind.
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.environ.get("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_SIZE = 1024
+
+# Trust the signed claims of tokens issued with them (no lookup at all until invalidated).
+# A deactivation then only takes effect once the token is invalidated here or expires.
+AUTH_TRUST_TOKEN_CLAIMS = os.environ.get("AUTH_TRUST_TOKEN_CLAIMS", "false").lower() in ("1", "true", "yes")
+
+
+class PrincipalEntry:
+    __slots__ = ("user", "expires_at")
+
+    def __init__(self, user: AdminUser, ttl: float):
+        self.user = user
+        self.expires_at = time.monotonic() + ttl
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+_entries: "OrderedDict[str, PrincipalEntry]" = OrderedDict()
+_locks: Dict[str, asyncio.Lock] = {}
+# Tokens issued before these timestamps (seconds since the epoch) can't be trusted on their claims
+_invalidated_at: Dict[str, float] = {}
+_all_invalidated_at = 0.0
+_generation = 0
+_hits = 0
+_misses = 0
+_trusted = 0
+
+
+async def get_or_load(username: str, loader: Callable[[], Awaitable[Optional[AdminUser]]]) -> Optional[AdminUser]:
+    """Return the cached principal for username, calling loader when missing or expired
+
+    Unknown users (loader returns None) are not cached.
+    """
+    global _hits, _misses
+
+    entry = _entries.get(username)
+    if entry is not None and entry.is_fresh:
+        _hits += 1
+        return entry.user
+
+    # Parallel admin calls right after the entry expired share one lookup
+    lock = _locks.setdefault(username, asyncio.Lock())
+    async with lock:
+        entry = _entries.get(username)
+        if entry is not None and entry.is_fresh:
+            _hits += 1
+            return entry.user
+
+        _misses += 1
+        generation = _generation
+        user = await loader()
+
+        # Don't store a user read before an invalidation
+        if user is not None and generation == _generation:
+            _entries[username] = PrincipalEntry(user, PRINCIPAL_CACHE_TTL_SECONDS)
+            _entries.move_to_end(username)
+            while len(_entries) > PRINCIPAL_CACHE_SIZE:
+                _entries.popitem(last=False)
+        return user
+
+
+def from_claims(token_data: dict) -> Optional[AdminUser]:
+    """Build the principal from a token's signed claims, when trusted and still valid"""
+    global _trusted
+
+    if not AUTH_TRUST_TOKEN_CLAIMS or token_data.get("user_id") is None:
+        return None
+
+    invalidated_at = max(_invalidated_at.get(token_data["username"], 0.0), _all_invalidated_at)
+    if (token_data.get("iat") or 0) <= invalidated_at:
+        return None
+
+    _trusted += 1
+    return AdminUser.model_construct(
+        id=token_data["user_id"],
+        username=token_data["username"],
+        email=token_data["email"],
+        hashed_password="",
+        is_active=True,
+        is_superuser=token_data.get("is_superuser", False),
+    )
+
+
+def invalidate(username: Optional[str] = None) -> None:
+    """Forget one principal (after the user was modified or deactivated), or all of them"""
+    global _generation, _all_invalidated_at
+
+    _generation += 1
+    now = time.time()
+    if username is None:
+        _all_invalidated_at = now
+        _invalidated_at.clear()
+        _entries.clear()
+        logger.info("Principal cache invalidated")
+    else:
+        _invalidated_at[username] = now
+        _entries.pop(username, None)
+        logger.info(f"Principal cache invalidated for {username}")
+
+
+def get_cache_stats() -> dict:
+    """Return principal cache statistics"""
+    lookups = _hits + _misses
+    return {
+        "entries": len(_entries),
+        "ttl_seconds": PRINCIPAL_CACHE_TTL_SECONDS,
+        "trust_token_claims": AUTH_TRUST_TOKEN_CLAIMS,
+        "hits": _hits,
+        "misses": _misses,
+        "trusted_claims": _trusted,
+        "hit_ratio": round(_hits / lookups, 4) if lookups else 0.0,
+    }
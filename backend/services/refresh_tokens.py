@@ -0,0 +1,152 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+from jose import JWTError, jwt
+from services.auth_service import SECRET_KEY, ALGORITHM
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import asyncio
+import logging
+import uuid
+import os
+
+logger = logging.getLogger(__name__)
+
+# Refresh tokens are signed JWTs: renewing an access token costs a signature check and one
+# insert, never a bcrypt hash. Each token is single use; presenting it records its jti in
+# `revoked_tokens` (insert on _id, so two workers can't both accept it) and issues a new one
+# of the same family. A token presented twice means it leaked, and the whole family is revoked.
+# Revocations expire with the tokens they cover (TTL index) and are mirrored in memory.
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.environ.get("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+# How often revocations made by other workers are pulled into the in-memory list
+REVOCATION_SYNC_INTERVAL_SECONDS = int(os.environ.get("REVOCATION_SYNC_INTERVAL_SECONDS", "30"))
+TOKEN_TYPE = "refresh"
+
+
+class RefreshTokenError(Exception):
+    """The refresh token is invalid, expired or revoked"""
+
+
+# Revoked token ids ("jti:<id>") and families ("fid:<id>") -> expiry of what they cover
+_revoked: Dict[str, datetime] = {}
+_synced_at: Optional[datetime] = None
+
+
+def create_refresh_token(username: str, family: Optional[str] = None) -> str:
+    """Sign a new refresh token, continuing family when rotating"""
+    now = datetime.utcnow()
+    return jwt.encode(
+        {
+            "sub": username,
+            "typ": TOKEN_TYPE,
+            "jti": str(uuid.uuid4()),
+            "fid": family or str(uuid.uuid4()),
+            "iat": now,
+            "exp": now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        },
+        SECRET_KEY,
+        algorithm=ALGORITHM,
+    )
+
+
+def decode_refresh_token(token: str) -> dict:
+    """Verify a refresh token's signature, type and expiry and return its claims"""
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise RefreshTokenError("Invalid refresh token")
+    if claims.get("typ") != TOKEN_TYPE or not all(claims.get(field) for field in ("sub", "jti", "fid")):
+        raise RefreshTokenError("Invalid refresh token")
+    return claims
+
+
+async def revoke(db: AsyncIOMotorDatabase, key: str, username: str, expires_at: datetime, reason: str) -> bool:
+    """Record a revocation, returning False when key was already revoked
+
+    The in-memory entry is only added once the database has the revocation: after a failed
+    write the token must not look consumed, or the client's retry would revoke its family.
+    """
+    try:
+        await db.revoked_tokens.insert_one({
+            "_id": key,
+            "username": username,
+            "reason": reason,
+            "revoked_at": datetime.utcnow(),
+            "expires_at": expires_at,
+        })
+        revoked = True
+    except DuplicateKeyError:
+        revoked = False
+    _revoked[key] = expires_at
+    return revoked
+
+
+async def revoke_family(db: AsyncIOMotorDatabase, claims: dict, reason: str) -> None:
+    """Revoke every token descending from the same login"""
+    # A family can't outlive its latest token, which expires at most this far from now
+    expires_at = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    await revoke(db, f"fid:{claims['fid']}", claims["sub"], expires_at, reason)
+
+
+async def rotate(db: AsyncIOMotorDatabase, token: str) -> dict:
+    """Consume a refresh token and return its claims with the next token of the family
+
+    Raises RefreshTokenError when the token can't be used; reuse of a consumed token
+    revokes its family.
+    """
+    claims = decode_refresh_token(token)
+    family = f"fid:{claims['fid']}"
+    # The in-memory list lags revocations made by other workers until the next sync
+    if family in _revoked or await db.revoked_tokens.find_one({"_id": family}, {"_id": 1}):
+        raise RefreshTokenError("Refresh token revoked")
+
+    key = f"jti:{claims['jti']}"
+    reused = key in _revoked or not await revoke(
+        db, key, claims["sub"], datetime.utcfromtimestamp(claims["exp"]), "rotated"
+    )
+    if reused:
+        logger.warning(f"Refresh token reused for {claims['sub']}, revoking its family")
+        await revoke_family(db, claims, "reused")
+        raise RefreshTokenError("Refresh token revoked")
+
+    return {**claims, "next_token": create_refresh_token(claims["sub"], claims["fid"])}
+
+
+async def sync_revocations(db: AsyncIOMotorDatabase) -> int:
+    """Pull revocations recorded since the last sync and forget expired ones"""
+    global _synced_at
+
+    now = datetime.utcnow()
+    query = {"expires_at": {"$gt": now}}
+    if _synced_at is not None:
+        # Overlap a little so a revocation committed during the previous read isn't missed
+        query["revoked_at"] = {"$gte": _synced_at - timedelta(seconds=5)}
+
+    count = 0
+    async for entry in db.revoked_tokens.find(query, {"_id": 1, "expires_at": 1}):
+        _revoked[entry["_id"]] = entry["expires_at"]
+        count += 1
+    _synced_at = now
+
+    for key in [key for key, expires_at in _revoked.items() if expires_at <= now]:
+        del _revoked[key]
+    return count
+
+
+async def run_revocation_sync(db: AsyncIOMotorDatabase) -> None:
+    """Keep the in-memory revocation list in step with the database (runs for the lifetime of the app)"""
+    while True:
+        try:
+            await sync_revocations(db)
+        except Exception as e:
+            logger.error(f"Error syncing revoked tokens: {e}")
+        await asyncio.sleep(REVOCATION_SYNC_INTERVAL_SECONDS)
+
+
+def get_revocation_stats() -> dict:
+    """Return in-memory revocation list statistics"""
+    return {
+        "revoked_tokens": sum(1 for key in _revoked if key.startswith("jti:")),
+        "revoked_families": sum(1 for key in _revoked if key.startswith("fid:")),
+        "synced_at": _synced_at,
+        "refresh_token_expire_days": REFRESH_TOKEN_EXPIRE_DAYS,
+    }
@@ -0,0 +1,71 @@
+from motor.motor_asyncio import AsyncIOMotorCollection
+from typing import List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Full-text search relies on the French text indexes declared in services/indexes.py:
+# version 3 text indexes fold case and diacritics ("baptême" matches "bapteme") and the
+# French stemmer matches word variants ("mariages" -> "mariage").
+
+MAX_QUERY_LENGTH = 200
+MAX_SEARCH_LIMIT = 100
+
+
+def build_search_pipeline(
+    query: Optional[str],
+    filters: dict,
+    facet_fields: Tuple[str, ...],
+    limit: int,
+    offset: int,
+    projection: Optional[dict] = None
+) -> list:
+    """One aggregation returning a ranked page, the total and per-field facet counts"""
+    match = dict(filters)
+    if query:
+        match["$text"] = {"$search": query}
+
+    # Best text match first, newest first among equals (or simply newest without a query)
+    sort = {"score": {"$meta": "textScore"}, "created_at": -1, "id": -1} if query else {"created_at": -1, "id": -1}
+
+    items = [{"$sort": sort}, {"$skip": offset}, {"$limit": limit}]
+    if query:
+        items.append({"$addFields": {"score": {"$meta": "textScore"}}})
+    items.append({"$project": {"_id": 0, **(projection or {})}})
+
+    facets = {
+        field: [{"$group": {"_id": f"${field}", "count": {"$sum": 1}}}, {"$sort": {"count": -1}}]
+        for field in facet_fields
+    }
+
+    return [
+        {"$match": match},
+        {"$facet": {"items": items, "total": [{"$count": "n"}], **facets}},
+    ]
+
+
+def facet_key(value) -> str:
+    """Facet values as JSON object keys (booleans as "true"/"false", like query parameters)"""
+    return str(value).lower() if isinstance(value, bool) else str(value)
+
+
+async def search(
+    collection: AsyncIOMotorCollection,
+    query: Optional[str],
+    filters: dict,
+    facet_fields: Tuple[str, ...],
+    limit: int,
+    offset: int,
+    projection: Optional[dict] = None
+) -> Tuple[List[dict], int, dict]:
+    """Run a search and return (documents, total, facets)"""
+    query = (query or "").strip()[:MAX_QUERY_LENGTH] or None
+    pipeline = build_search_pipeline(query, filters, facet_fields, limit, offset, projection)
+    result = (await collection.aggregate(pipeline).to_list(1))[0]
+
+    facets = {
+        field: {facet_key(group["_id"]): group["count"] for group in result[field] if group["_id"] is not None}
+        for field in facet_fields
+    }
+    total = result["total"][0]["n"] if result["total"] else 0
+    return result["items"], total, facets
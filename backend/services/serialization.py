@@ -0,0 +1,78 @@
+from fastapi import Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import PydanticUndefined
+from functools import lru_cache
+from typing import List, Type
+import os
+
+try:
+    import orjson
+except ImportError:  # optional, only used in fast mode
+    orjson = None
+
+# Opt-in fast serialization. Documents read back from our own collections were written from
+# validated models, so in fast mode they are trusted: fetched with a projection on the
+# response fields and encoded as-is by orjson, without building models at all. Off (or
+# without orjson), each document is validated once and encoded by pydantic-core, skipping
+# the second validation pass FastAPI would run for response_model.
+FAST_JSON_ENABLED = os.environ.get("FAST_JSON_ENABLED", "false").lower() in ("1", "true", "yes")
+TRUST_DOCUMENTS = FAST_JSON_ENABLED and orjson is not None
+
+
+def default_response_class() -> Type[JSONResponse]:
+    """Response class for the app: orjson in fast mode when it is installed"""
+    return ORJSONResponse if TRUST_DOCUMENTS else JSONResponse
+
+
+def fields_projection(model: Type[BaseModel], **computed) -> dict:
+    """Projection fetching only the fields of a response model
+
+    computed maps fields that don't exist as such in the documents to their expression.
+    """
+    return {"_id": 0, **{field: 1 for field in model.model_fields}, **computed}
+
+
+@lru_cache(maxsize=None)
+def static_defaults(model: Type[BaseModel]) -> dict:
+    """Plain defaults of a model, for fields older documents may not have yet"""
+    return {
+        name: field.default
+        for name, field in model.model_fields.items()
+        if field.default is not PydanticUndefined
+    }
+
+
+def validated_list_body(adapter: TypeAdapter, model: Type[BaseModel], documents: List[dict], **envelope) -> bytes:
+    items = [model(**document) for document in documents]
+    # The envelope (Page, SearchResults) keeps the item instances as they are
+    value = adapter.validate_python({"items": items, **envelope}) if envelope else items
+    return adapter.dump_json(value)
+
+
+def trusted_list_body(model: Type[BaseModel], documents: List[dict], **envelope) -> bytes:
+    defaults = static_defaults(model)
+    items = [{**defaults, **document} for document in documents]
+    return orjson.dumps({"items": items, **envelope} if envelope else items)
+
+
+def list_body(adapter: TypeAdapter, model: Type[BaseModel], documents: List[dict], **envelope) -> bytes:
+    """JSON of documents as a list of model, inside envelope fields when given (e.g. a Page)
+
+    Documents must come from fields_projection(model).
+    """
+    if TRUST_DOCUMENTS:
+        return trusted_list_body(model, documents, **envelope)
+    return validated_list_body(adapter, model, documents, **envelope)
+
+
+def item_body(model: Type[BaseModel], document: dict) -> bytes:
+    """JSON of one document as model (projected on its fields)"""
+    if TRUST_DOCUMENTS:
+        return orjson.dumps({**static_defaults(model), **document})
+    return model(**document).model_dump_json()
+
+
+def json_response(body: bytes, status_code: int = 200) -> Response:
+    """Response for an already encoded body (response_model then only documents the endpoint)"""
+    return Response(content=body, status_code=status_code, media_type="application/json")
@@ -0,0 +1,284 @@
+from starlette.concurrency import run_in_threadpool
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncContextManager, AsyncIterator, List, Optional
+import logging
+import os
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Backend selection: "local" (files under UPLOAD_DIR) or "s3" (any S3-compatible service)
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "local")
+
+# Files of the local backend; its .tmp is scratch space used by every backend for uploads in
+# progress and derivative generation
+UPLOAD_DIR = Path("/app/uploads")
+SCRATCH_DIR = UPLOAD_DIR / ".tmp"
+
+# S3 settings (MinIO or moto can stand in locally through S3_ENDPOINT_URL)
+S3_BUCKET = os.environ.get("S3_BUCKET", "jsevent-media")
+S3_ENDPOINT_URL = os.environ.get("S3_ENDPOINT_URL") or None
+S3_REGION = os.environ.get("S3_REGION", "eu-west-3")
+S3_PUBLIC_BASE_URL = os.environ.get("S3_PUBLIC_BASE_URL") or None
+S3_PRESIGN_EXPIRES_SECONDS = int(os.environ.get("S3_PRESIGN_EXPIRES_SECONDS", "900"))
+
+MEDIA_URL_PREFIX = "/uploads/"
+
+
+def key_from_url(file_url: str) -> str:
+    """Storage key of a media URL ("/uploads/image/x.jpg" -> "image/x.jpg")"""
+    return file_url[len(MEDIA_URL_PREFIX):] if file_url.startswith(MEDIA_URL_PREFIX) else file_url
+
+
+def remove_quietly(path: Path) -> None:
+    """Delete a file, ignoring a missing one"""
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def url_for(key: str) -> str:
+    """Public API URL of a storage key; the uploads router serves or redirects it"""
+    return f"{MEDIA_URL_PREFIX}{key}"
+
+
+class StorageBackend(ABC):
+    """Where media blobs live. Keys look like "image/<sha256>.jpg" or "derived/<sha256>-320w.webp"."""
+
+    name = "base"
+    supports_presigned_urls = False
+
+    @abstractmethod
+    async def put_file(self, local_path: Path, key: str, content_type: Optional[str] = None) -> None:
+        """Store a local file under key; the local file is consumed"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def size(self, key: str) -> Optional[int]:
+        """Size of the object in bytes, None when it doesn't exist"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def move(self, key: str, new_key: str) -> bool:
+        """Rename an object; returns False when it doesn't exist"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_keys(self, prefix: str) -> List[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def local_copy(self, key: str) -> AsyncContextManager[Path]:
+        """Yield a local path holding the object's bytes (for ffmpeg, Pillow...)"""
+        raise NotImplementedError
+
+    # Direct client transfers, only for backends with supports_presigned_urls
+
+    async def presigned_upload(self, key: str, content_type: str, size: int, sha256_b64: str) -> dict:
+        """Return a URL and headers the client can PUT the object to directly"""
+        raise NotImplementedError
+
+    async def download_url(self, key: str) -> str:
+        """URL the client can fetch the object from without going through the API"""
+        raise NotImplementedError
+
+
+class LocalStorage(StorageBackend):
+    """Files on the local disk, served by the uploads router"""
+
+    name = "local"
+
+    def __init__(self, root: Path = UPLOAD_DIR):
+        self.root = root
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    async def put_file(self, local_path: Path, key: str, content_type: Optional[str] = None) -> None:
+        target = self.path(key)
+        await run_in_threadpool(target.parent.mkdir, parents=True, exist_ok=True)
+        await run_in_threadpool(os.replace, local_path, target)
+        self._forget(target)
+
+    async def delete(self, key: str) -> None:
+        target = self.path(key)
+        try:
+            await run_in_threadpool(target.unlink)
+        except FileNotFoundError:
+            pass
+        self._forget(target)
+
+    async def exists(self, key: str) -> bool:
+        return await run_in_threadpool(self.path(key).is_file)
+
+    async def size(self, key: str) -> Optional[int]:
+        try:
+            return (await run_in_threadpool(os.stat, self.path(key))).st_size
+        except FileNotFoundError:
+            return None
+
+    async def move(self, key: str, new_key: str) -> bool:
+        target = self.path(new_key)
+        try:
+            await run_in_threadpool(target.parent.mkdir, parents=True, exist_ok=True)
+            await run_in_threadpool(os.replace, self.path(key), target)
+        except FileNotFoundError:
+            return False
+        self._forget(self.path(key))
+        return True
+
+    async def list_keys(self, prefix: str) -> List[str]:
+        directory, _, name_prefix = prefix.rpartition("/")
+        base = self.path(directory)
+
+        def scan() -> List[str]:
+            if not base.is_dir():
+                return []
+            return [
+                f"{directory}/{entry.name}" if directory else entry.name
+                for entry in os.scandir(base)
+                if entry.is_file() and entry.name.startswith(name_prefix)
+            ]
+
+        return await run_in_threadpool(scan)
+
+    @asynccontextmanager
+    async def local_copy(self, key: str) -> AsyncIterator[Path]:
+        yield self.path(key)
+
+    @staticmethod
+    def _forget(path: Path) -> None:
+        # The uploads router caches stat results per path
+        from services.media_server import forget_media_file
+        forget_media_file(path)
+
+
+class S3Storage(StorageBackend):
+    """Objects in an S3-compatible bucket; clients upload and download directly with presigned URLs"""
+
+    name = "s3"
+    supports_presigned_urls = True
+
+    def __init__(self, bucket: str = S3_BUCKET, endpoint_url: Optional[str] = S3_ENDPOINT_URL, region: str = S3_REGION):
+        import boto3
+        from botocore.config import Config
+
+        self.bucket = bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            config=Config(signature_version="s3v4", max_pool_connections=32),
+        )
+
+    async def put_file(self, local_path: Path, key: str, content_type: Optional[str] = None) -> None:
+        extra_args = {"ContentType": content_type} if content_type else None
+        await run_in_threadpool(self.client.upload_file, str(local_path), self.bucket, key, ExtraArgs=extra_args)
+        await run_in_threadpool(remove_quietly, local_path)
+
+    async def delete(self, key: str) -> None:
+        await run_in_threadpool(self.client.delete_object, Bucket=self.bucket, Key=key)
+
+    async def exists(self, key: str) -> bool:
+        return await self.size(key) is not None
+
+    async def size(self, key: str) -> Optional[int]:
+        from botocore.exceptions import ClientError
+
+        try:
+            head = await run_in_threadpool(self.client.head_object, Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return head["ContentLength"]
+
+    async def move(self, key: str, new_key: str) -> bool:
+        if not await self.exists(key):
+            return False
+        # Server-side copy: the bytes never leave the bucket
+        await run_in_threadpool(
+            self.client.copy, {"Bucket": self.bucket, "Key": key}, self.bucket, new_key
+        )
+        await self.delete(key)
+        return True
+
+    async def list_keys(self, prefix: str) -> List[str]:
+        def scan() -> List[str]:
+            keys = []
+            paginator = self.client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+                keys.extend(obj["Key"] for obj in page.get("Contents", []))
+            return keys
+
+        return await run_in_threadpool(scan)
+
+    @asynccontextmanager
+    async def local_copy(self, key: str) -> AsyncIterator[Path]:
+        await run_in_threadpool(SCRATCH_DIR.mkdir, parents=True, exist_ok=True)
+        path = SCRATCH_DIR / f"{uuid.uuid4()}{Path(key).suffix}"
+        await run_in_threadpool(self.client.download_file, self.bucket, key, str(path))
+        try:
+            yield path
+        finally:
+            await run_in_threadpool(remove_quietly, path)
+
+    async def presigned_upload(self, key: str, content_type: str, size: int, sha256_b64: str) -> dict:
+        # Content type, length and checksum are signed, so the bucket rejects anything else
+        url = await run_in_threadpool(
+            self.client.generate_presigned_url,
+            "put_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ContentType": content_type,
+                "ContentLength": size,
+                "ChecksumSHA256": sha256_b64,
+            },
+            ExpiresIn=S3_PRESIGN_EXPIRES_SECONDS,
+        )
+        return {
+            "method": "PUT",
+            "url": url,
+            "headers": {"Content-Type": content_type, "x-amz-checksum-sha256": sha256_b64},
+            "expires_in": S3_PRESIGN_EXPIRES_SECONDS,
+        }
+
+    async def download_url(self, key: str) -> str:
+        if S3_PUBLIC_BASE_URL:
+            return f"{S3_PUBLIC_BASE_URL.rstrip('/')}/{key}"
+        return await run_in_threadpool(
+            self.client.generate_presigned_url,
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=S3_PRESIGN_EXPIRES_SECONDS,
+        )
+
+
+_storage: Optional[StorageBackend] = None
+
+
+def get_storage() -> StorageBackend:
+    """Return the configured storage backend"""
+    global _storage
+
+    if _storage is None:
+        if STORAGE_BACKEND == "s3":
+            _storage = S3Storage()
+        elif STORAGE_BACKEND == "local":
+            _storage = LocalStorage()
+        else:
+            raise RuntimeError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+        logger.info(f"Media storage backend: {_storage.name}")
+    return _storage
@@ -0,0 +1,279 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel
+from pymongo.errors import BulkWriteError
+from starlette.concurrency import run_in_threadpool
+from contextlib import suppress
+from models.contact_models import ContactRequest, Testimonial
+from services import dashboard_counters
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Type
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Optional write-behind mode for public submissions: a request is acknowledged (202) once
+# its document is appended and fsynced to a local journal, and a background task inserts
+# queued documents with insert_many when a batch fills up or the flush interval elapses.
+# Journal segments are deleted once every document in them is in MongoDB; at startup the
+# remaining segments are replayed (documents already inserted are skipped on their unique id).
+# Each process needs its own journal directory.
+WRITE_BEHIND_ENABLED = os.environ.get("WRITE_BEHIND_ENABLED", "false").lower() in ("1", "true", "yes")
+WRITE_BEHIND_BATCH_SIZE = int(os.environ.get("WRITE_BEHIND_BATCH_SIZE", "100"))
+WRITE_BEHIND_FLUSH_INTERVAL_SECONDS = float(os.environ.get("WRITE_BEHIND_FLUSH_INTERVAL_SECONDS", "0.5"))
+# Accepted but not yet inserted documents per queue; beyond this submissions are refused (503)
+WRITE_BEHIND_MAX_QUEUE = int(os.environ.get("WRITE_BEHIND_MAX_QUEUE", "5000"))
+WRITE_BEHIND_JOURNAL_DIR = Path(os.environ.get("WRITE_BEHIND_JOURNAL_DIR", "/app/journal"))
+RETRY_DELAY_SECONDS = 2.0
+DUPLICATE_KEY_ERROR = 11000
+
+
+class QueueFull(Exception):
+    """The write-behind queue can't accept more documents"""
+
+
+# Called once per flush with the documents it inserted
+FlushHook = Callable[[AsyncIOMotorDatabase, List[dict]], Awaitable[None]]
+
+
+class WriteBehindQueue:
+    """Journaled in-process queue inserting documents of one collection in batches"""
+
+    def __init__(self, db: AsyncIOMotorDatabase, collection: str, model: Type[BaseModel], on_inserted: FlushHook):
+        self.db = db
+        self.collection = collection
+        self.model = model
+        self.on_inserted = on_inserted
+        self.journal_dir = WRITE_BEHIND_JOURNAL_DIR / collection
+        self.segment = 0
+        # (journal segment, document) waiting for insert_many
+        self.queue: List[Tuple[int, dict]] = []
+        # Lines waiting for the next journal write, with the submissions waiting on them
+        self.journal_buffer: List[Tuple[str, dict, asyncio.Future]] = []
+        self.journal_task: Optional[asyncio.Task] = None
+        self.writing_segment: Optional[int] = None
+        self.batch_ready = asyncio.Event()
+        self.flusher: Optional[asyncio.Task] = None
+        self.accepted = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.batches = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self.queue) + len(self.journal_buffer)
+
+    def segment_path(self, segment: int) -> Path:
+        return self.journal_dir / f"{segment:010d}.jsonl"
+
+    def segments(self) -> List[int]:
+        return sorted(int(path.stem) for path in self.journal_dir.glob("*.jsonl"))
+
+    async def submit(self, item: BaseModel) -> None:
+        """Journal a document and queue it for insertion; returns once the journal is on disk"""
+        if self.depth >= WRITE_BEHIND_MAX_QUEUE:
+            self.rejected += 1
+            raise QueueFull()
+
+        # Several submissions arriving together share one write and fsync
+        future = asyncio.get_running_loop().create_future()
+        self.journal_buffer.append((item.model_dump_json(), item.dict(), future))
+        if self.journal_task is None:
+            self.journal_task = asyncio.create_task(self.write_journal())
+        await future
+
+    async def write_journal(self) -> None:
+        try:
+            while self.journal_buffer:
+                entries, self.journal_buffer = self.journal_buffer, []
+                self.writing_segment = self.segment
+                try:
+                    await run_in_threadpool(self.append_lines, self.writing_segment, [line for line, _, _ in entries])
+                except Exception as e:
+                    logger.error(f"Error writing {self.collection} journal: {e}")
+                    for _, _, future in entries:
+                        future.set_exception(e)
+                    continue
+
+                for _, document, future in entries:
+                    self.queue.append((self.writing_segment, document))
+                    future.set_result(None)
+                self.accepted += len(entries)
+                if len(self.queue) >= WRITE_BEHIND_BATCH_SIZE:
+                    self.batch_ready.set()
+        finally:
+            self.writing_segment = None
+            self.journal_task = None
+
+    def append_lines(self, segment: int, lines: List[str]) -> None:
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.segment_path(segment), "a", encoding="utf-8") as journal:
+            journal.write("".join(f"{line}\n" for line in lines))
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    async def insert(self, documents: List[dict]) -> int:
+        """insert_many skipping documents already stored; runs the hook once for the new ones"""
+        failed = set()
+        try:
+            await self.db[self.collection].insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+                raise
+            failed = {error["index"] for error in errors}
+
+        inserted = [document for index, document in enumerate(documents) if index not in failed]
+        if inserted:
+            await self.on_inserted(self.db, inserted)
+        return len(inserted)
+
+    async def flush(self) -> None:
+        """Insert one batch from the head of the queue, then drop fully inserted journal segments"""
+        if not self.queue:
+            return
+
+        batch, self.queue = self.queue[:WRITE_BEHIND_BATCH_SIZE], self.queue[WRITE_BEHIND_BATCH_SIZE:]
+        # Later submissions go to a new segment so this one can be deleted once inserted
+        if batch[-1][0] == self.segment:
+            self.segment += 1
+
+        try:
+            # insert_many adds _id to the documents, keep the queued ones untouched for a retry
+            self.inserted += await self.insert([dict(document) for _, document in batch])
+            self.batches += 1
+        except BaseException:
+            # Also when cancelled mid-insert, so the shutdown drain retries the batch
+            self.queue = batch + self.queue
+            raise
+
+        oldest_needed = min(
+            [self.segment] + [segment for segment, _ in self.queue[:1]] +
+            ([self.writing_segment] if self.writing_segment is not None else [])
+        )
+        await run_in_threadpool(self.delete_segments, oldest_needed)
+
+    def delete_segments(self, before: int) -> None:
+        for segment in self.segments():
+            if segment < before:
+                self.segment_path(segment).unlink(missing_ok=True)
+
+    async def recover(self) -> int:
+        """Insert the documents of journal segments left by a previous process"""
+        segments = await run_in_threadpool(self.segments)
+        if not segments:
+            return 0
+
+        documents = []
+        for segment in segments:
+            lines = await run_in_threadpool(self.segment_path(segment).read_text, encoding="utf-8")
+            for line in lines.splitlines():
+                try:
+                    documents.append(self.model.model_validate_json(line).dict())
+                except ValueError:
+                    # Torn last line of a crash during the write: never acknowledged
+                    logger.warning(f"Skipping unreadable {self.collection} journal line")
+
+        inserted = 0
+        for start in range(0, len(documents), WRITE_BEHIND_BATCH_SIZE):
+            inserted += await self.insert(documents[start:start + WRITE_BEHIND_BATCH_SIZE])
+
+        self.segment = segments[-1] + 1
+        await run_in_threadpool(self.delete_segments, self.segment)
+        logger.info(f"Recovered {inserted} {self.collection} from the journal ({len(documents)} entries)")
+        return inserted
+
+    async def run(self) -> None:
+        """Flush on size or time until cancelled"""
+        while True:
+            try:
+                await asyncio.wait_for(self.batch_ready.wait(), WRITE_BEHIND_FLUSH_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self.batch_ready.clear()
+
+            try:
+                await self.flush()
+                if len(self.queue) >= WRITE_BEHIND_BATCH_SIZE:
+                    self.batch_ready.set()
+            except Exception as e:
+                logger.error(f"Error flushing {len(self.queue)} queued {self.collection}: {e}")
+                await asyncio.sleep(RETRY_DELAY_SECONDS)
+
+    async def drain(self) -> None:
+        """Insert everything still queued (at shutdown; the journal covers what fails)"""
+        if self.journal_task is not None:
+            await self.journal_task
+        while self.queue:
+            await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.depth,
+            "accepted": self.accepted,
+            "inserted": self.inserted,
+            "rejected": self.rejected,
+            "batches": self.batches,
+        }
+
+
+# Collections accepting write-behind submissions: model and batch counter hook
+QUEUE_SPECS: Dict[str, Tuple[Type[BaseModel], FlushHook]] = {
+    "contact_requests": (ContactRequest, dashboard_counters.contact_requests_created),
+    "testimonials": (Testimonial, dashboard_counters.testimonials_created),
+}
+
+_queues: Dict[str, WriteBehindQueue] = {}
+
+
+def is_enabled() -> bool:
+    return WRITE_BEHIND_ENABLED and bool(_queues)
+
+
+async def submit(collection: str, item: BaseModel) -> None:
+    """Accept a document for collection; raises QueueFull when the queue is at capacity"""
+    await _queues[collection].submit(item)
+
+
+async def start(db: AsyncIOMotorDatabase) -> None:
+    """Replay leftover journals and start the flushers (no-op unless enabled)"""
+    if not WRITE_BEHIND_ENABLED:
+        return
+
+    for collection, (model, on_inserted) in QUEUE_SPECS.items():
+        queue = WriteBehindQueue(db, collection, model, on_inserted)
+        try:
+            await queue.recover()
+        except Exception as e:
+            # The segments stay on disk for the next start
+            logger.error(f"Error recovering {collection} journal: {e}")
+            queue.segment = max(queue.segments(), default=-1) + 1
+        queue.flusher = asyncio.create_task(queue.run())
+        _queues[collection] = queue
+    logger.info(f"Write-behind enabled for {', '.join(_queues)}")
+
+
+async def stop() -> None:
+    """Stop the flushers and insert what is still queued"""
+    for collection, queue in _queues.items():
+        queue.flusher.cancel()
+        # Let a flush in progress unwind before draining, so both don't insert the same batch
+        with suppress(asyncio.CancelledError):
+            await queue.flusher
+        try:
+            await queue.drain()
+        except Exception as e:
+            logger.error(f"Error draining {collection} queue, left in the journal: {e}")
+    _queues.clear()
+
+
+def get_queue_stats() -> dict:
+    """Return write-behind queue statistics"""
+    return {
+        "enabled": is_enabled(),
+        "batch_size": WRITE_BEHIND_BATCH_SIZE,
+        "flush_interval_seconds": WRITE_BEHIND_FLUSH_INTERVAL_SECONDS,
+        "max_queue": WRITE_BEHIND_MAX_QUEUE,
+        "queues": {collection: queue.stats() for collection, queue in _queues.items()},
+    }
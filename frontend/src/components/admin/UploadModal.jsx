@@ -43,9 +43,10 @@ const UploadModal = ({ onClose, onSuccess }) => {
   const validateFile = (selectedFile) => {
     if (!uploadInfo) return true;
 
-    // Check file size
-    if (selectedFile.size > uploadInfo.max_file_size) {
-      setError(`Fichier trop volumineux. Taille maximum: ${uploadInfo.max_file_size_mb}MB`);
+    // Check file size (large files go through resumable upload)
+    const maxSize = uploadInfo.max_resumable_file_size || uploadInfo.max_file_size;
+    if (selectedFile.size > maxSize) {
+      setError(`Fichier trop volumineux. Taille maximum: ${Math.floor(maxSize / (1024 * 1024))}MB`);
       return false;
     }
 
@@ -132,7 +133,7 @@ const UploadModal = ({ onClose, onSuccess }) => {
     setError(null);
 
     try {
-      const result = await uploadFile(file, formData);
+      const result = await uploadFile(file, formData, uploadInfo);
       onSuccess(result);
     } catch (err) {
       setError(err.message);
@@ -254,7 +255,7 @@ const UploadModal = ({ onClose, onSuccess }) => {
                 
                 {uploadInfo && (
                   <div className="text-xs text-gray-500 space-y-1">
-                    <p>Taille maximum: {uploadInfo.max_file_size_mb}MB</p>
+                    <p>Taille maximum: {Math.floor((uploadInfo.max_resumable_file_size || uploadInfo.max_file_size) / (1024 * 1024))}MB</p>
                     <p>
                       Formats supportés: Images (JPEG, PNG, GIF, WebP), Vidéos (MP4, AVI, MOV, WebM)
                     </p>
@@ -0,0 +1,59 @@
+import { useEffect, useState } from 'react';
+
+const SEARCH_DEBOUNCE_MS = 300;
+const SEARCH_PAGE_SIZE = 50;
+
+// Server-side search for the admin lists. `results` stays null while the search box is
+// empty, so pages keep showing their regular paginated list in that case.
+export function useAdminSearch(searchFn, term, filters) {
+  const [results, setResults] = useState(null);
+  const [total, setTotal] = useState(0);
+  const [facets, setFacets] = useState({});
+  const filtersKey = JSON.stringify(filters);
+
+  useEffect(() => {
+    const q = term.trim();
+    if (!q) {
+      setResults(null);
+      setTotal(0);
+      return undefined;
+    }
+
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const data = await searchFn({ ...filters, q, limit: SEARCH_PAGE_SIZE });
+        if (!cancelled) {
+          setResults(data.items);
+          setTotal(data.total);
+          setFacets(data.facets);
+        }
+      } catch (err) {
+        if (!cancelled) console.error(err);
+      }
+    }, SEARCH_DEBOUNCE_MS);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [term, filtersKey]);
+
+  const loadMore = async () => {
+    const data = await searchFn({ ...filters, q: term.trim(), limit: SEARCH_PAGE_SIZE, offset: results.length });
+    setResults((current) => [...current, ...data.items]);
+    setTotal(data.total);
+  };
+
+  // Apply a local change (update, delete) to the current results
+  const updateResults = (update) => setResults((current) => (current ? update(current) : current));
+
+  return {
+    results,
+    total,
+    facets,
+    hasMore: results !== null && results.length < total,
+    loadMore,
+    updateResults,
+  };
+}
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
-import { getContactRequests, updateContactRequest } from '../../services/adminApi';
+import { getContactRequest, getContactRequests, searchContactRequests, updateContactRequest } from '../../services/adminApi';
+import { useAdminSearch } from '../../hooks/use-admin-search';
 import { 
   Mail, 
   Phone, 
@@ -20,13 +21,17 @@ const ContactRequests = () => {
   const [statusFilter, setStatusFilter] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
   const [editingRequest, setEditingRequest] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const search = useAdminSearch(searchContactRequests, searchTerm, { status: statusFilter || null });
 
   const fetchRequests = async () => {
     try {
       setLoading(true);
       setError(null);
       const data = await getContactRequests(statusFilter || null);
-      setRequests(data);
+      setRequests(data.items);
+      setNextCursor(data.next_cursor);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -34,6 +39,23 @@ const ContactRequests = () => {
     }
   };
 
+  const loadMore = async () => {
+    try {
+      setLoadingMore(true);
+      if (search.results) {
+        await search.loadMore();
+        return;
+      }
+      const data = await getContactRequests(statusFilter || null, 50, nextCursor);
+      setRequests((current) => [...current, ...data.items]);
+      setNextCursor(data.next_cursor);
+    } catch (err) {
+      alert(err.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     fetchRequests();
   }, [statusFilter]);
@@ -42,15 +64,29 @@ const ContactRequests = () => {
     try {
       await updateContactRequest(requestId, { status: newStatus });
       // Update local state
-      setRequests(requests.map(req => 
+      const applyStatus = (list) => list.map(req =>
         req.id === requestId ? { ...req, status: newStatus } : req
-      ));
+      );
+      setRequests(applyStatus(requests));
+      search.updateResults(applyStatus);
       setEditingRequest(null);
     } catch (err) {
       alert('Erreur lors de la mise à jour: ' + err.message);
     }
   };
 
+  // Lists only carry the start of long messages
+  const showFullMessage = async (requestId) => {
+    try {
+      const fullRequest = await getContactRequest(requestId);
+      const applyFull = (list) => list.map(req => req.id === requestId ? fullRequest : req);
+      setRequests(applyFull);
+      search.updateResults(applyFull);
+    } catch (err) {
+      alert(err.message);
+    }
+  };
+
   const getStatusColor = (status) => {
     const colors = {
       'new': 'bg-blue-100 text-blue-800',
@@ -93,12 +129,9 @@ const ContactRequests = () => {
     return icons[eventType] || '🎉';
   };
 
-  // Filter requests based on search term
-  const filteredRequests = requests.filter(request =>
-    request.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-    request.email.toLowerCase().includes(searchTerm.toLowerCase()) ||
-    request.event_type.toLowerCase().includes(searchTerm.toLowerCase())
-  );
+  // Search results (server-side, whole collection) replace the list while searching
+  const filteredRequests = search.results ?? requests;
+  const hasMore = search.results ? search.hasMore : !!nextCursor;
 
   if (loading) {
     return (
@@ -124,7 +157,7 @@ const ContactRequests = () => {
           <div className="flex items-center justify-between">
             <div>
               <h1 className="text-2xl font-bold text-gray-900">Demandes de contact</h1>
-              <p className="text-gray-600">{requests.length} demande(s) au total</p>
+              <p className="text-gray-600">{requests.length}{nextCursor ? '+' : ''} demande(s) au total</p>
             </div>
             
             {/* Filters */}
@@ -226,14 +259,25 @@ const ContactRequests = () => {
                       </div>
 
                       {/* Message */}
-                      {request.message && (
+                      {(request.message ?? request.message_preview) && (
                         <div className="mb-4">
                           <div className="flex items-center space-x-2 text-sm font-medium text-gray-900 mb-2">
                             <MessageSquare className="h-4 w-4" />
                             <span>Message</span>
                           </div>
                           <p className="text-sm text-gray-700 bg-gray-50 rounded p-3">
-                            {request.message}
+                            {request.message ?? request.message_preview}
+                            {request.message === undefined && request.message_truncated && (
+                              <>
+                                …{' '}
+                                <button
+                                  onClick={() => showFullMessage(request.id)}
+                                  className="text-yellow-600 hover:text-yellow-700 font-medium"
+                                >
+                                  Lire la suite
+                                </button>
+                              </>
+                            )}
                           </p>
                         </div>
                       )}
@@ -285,6 +329,18 @@ const ContactRequests = () => {
             </div>
           </div>
         )}
+
+        {hasMore && (
+          <div className="mt-6 text-center">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="px-4 py-2 text-sm font-medium text-gray-700 bg-white border border-gray-300 rounded-md hover:bg-gray-50 disabled:opacity-50"
+            >
+              {loadingMore ? 'Chargement...' : 'Charger plus'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useAuth } from '../../contexts/AuthContext';
-import { getDashboardStats } from '../../services/adminApi';
+import { getAnalytics, getDashboardStats } from '../../services/adminApi';
 import { 
   Users, 
   MessageSquare, 
@@ -19,6 +19,7 @@ const Dashboard = () => {
   const [stats, setStats] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [weeklyRequests, setWeeklyRequests] = useState([]);
 
   const fetchStats = async () => {
     try {
@@ -33,10 +34,23 @@ const Dashboard = () => {
     }
   };
 
+  const fetchWeeklyRequests = async () => {
+    try {
+      const data = await getAnalytics('contact_requests', 'week');
+      setWeeklyRequests(data.series);
+    } catch (err) {
+      // The chart is optional: the rest of the dashboard still works without it
+      console.error(err);
+    }
+  };
+
   useEffect(() => {
     fetchStats();
+    fetchWeeklyRequests();
   }, []);
 
+  const maxWeeklyCount = Math.max(1, ...weeklyRequests.map((week) => week.totals.count || 0));
+
   const formatDate = (dateString) => {
     if (!dateString) return 'Non spécifié';
     try {
@@ -184,6 +198,33 @@ const Dashboard = () => {
           </div>
         </div>
 
+        {/* Requests per week */}
+        {weeklyRequests.length > 0 && (
+          <div className="bg-white rounded-lg shadow mb-8">
+            <div className="px-6 py-4 border-b border-gray-200">
+              <h2 className="text-lg font-semibold text-gray-900 flex items-center">
+                <TrendingUp className="h-5 w-5 text-gray-500 mr-2" />
+                Demandes par semaine
+              </h2>
+            </div>
+            <div className="px-6 py-4 flex items-end space-x-2 h-48">
+              {weeklyRequests.map((week) => (
+                <div key={week.bucket} className="flex-1 flex flex-col items-center justify-end h-full">
+                  <span className="text-xs text-gray-600 mb-1">{week.totals.count || 0}</span>
+                  <div
+                    className="w-full bg-yellow-400 rounded-t"
+                    style={{ height: `${((week.totals.count || 0) / maxWeeklyCount) * 100}%` }}
+                    title={`Semaine du ${new Date(week.bucket).toLocaleDateString('fr-FR')}`}
+                  />
+                  <span className="text-xs text-gray-400 mt-1">
+                    {new Date(week.bucket).toLocaleDateString('fr-FR', { day: '2-digit', month: '2-digit' })}
+                  </span>
+                </div>
+              ))}
+            </div>
+          </div>
+        )}
+
         {/* Recent Requests */}
         <div className="bg-white rounded-lg shadow">
           <div className="px-6 py-4 border-b border-gray-200">
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { 
   getGalleryItems, 
+  searchGalleryItems,
   updateGalleryItem, 
   deleteGalleryItem 
 } from '../../services/adminApi';
@@ -20,6 +21,7 @@ import {
 import LoadingSpinner from '../../components/LoadingSpinner';
 import ErrorMessage from '../../components/ErrorMessage';
 import UploadModal from '../../components/admin/UploadModal';
+import { useAdminSearch } from '../../hooks/use-admin-search';
 
 const Gallery = () => {
   const [items, setItems] = useState([]);
@@ -30,13 +32,20 @@ const Gallery = () => {
   const [eventFilter, setEventFilter] = useState('all');
   const [showUploadModal, setShowUploadModal] = useState(false);
   const [editingItem, setEditingItem] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const search = useAdminSearch(searchGalleryItems, searchTerm, {
+    file_type: typeFilter === 'all' ? null : typeFilter,
+    event_type: eventFilter === 'all' ? null : eventFilter,
+  });
 
   const fetchItems = async () => {
     try {
       setLoading(true);
       setError(null);
       const data = await getGalleryItems();
-      setItems(data);
+      setItems(data.items);
+      setNextCursor(data.next_cursor);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -44,6 +53,23 @@ const Gallery = () => {
     }
   };
 
+  const loadMore = async () => {
+    try {
+      setLoadingMore(true);
+      if (search.results) {
+        await search.loadMore();
+        return;
+      }
+      const data = await getGalleryItems(nextCursor);
+      setItems((current) => [...current, ...data.items]);
+      setNextCursor(data.next_cursor);
+    } catch (err) {
+      alert(err.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     fetchItems();
   }, []);
@@ -51,9 +77,11 @@ const Gallery = () => {
   const handleItemUpdate = async (itemId, updateData) => {
     try {
       const updatedItem = await updateGalleryItem(itemId, updateData);
-      setItems(items.map(item => 
+      const applyUpdate = (list) => list.map(item => 
         item.id === itemId ? updatedItem : item
-      ));
+      );
+      setItems(applyUpdate(items));
+      search.updateResults(applyUpdate);
       setEditingItem(null);
     } catch (err) {
       alert('Erreur lors de la mise à jour: ' + err.message);
@@ -68,6 +96,7 @@ const Gallery = () => {
     try {
       await deleteGalleryItem(itemId);
       setItems(items.filter(item => item.id !== itemId));
+      search.updateResults((list) => list.filter(item => item.id !== itemId));
     } catch (err) {
       alert('Erreur lors de la suppression: ' + err.message);
     }
@@ -100,16 +129,14 @@ const Gallery = () => {
     return icons[eventType] || '🎉';
   };
 
-  // Filter items
-  const filteredItems = items.filter(item => {
-    const matchesSearch = item.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                         (item.description && item.description.toLowerCase().includes(searchTerm.toLowerCase()));
-    
+  // Search results are filtered server-side over the whole gallery; loaded pages are filtered here
+  const filteredItems = search.results ?? items.filter(item => {
     const matchesType = typeFilter === 'all' || item.file_type === typeFilter;
     const matchesEvent = eventFilter === 'all' || item.event_type === eventFilter;
     
-    return matchesSearch && matchesType && matchesEvent;
+    return matchesType && matchesEvent;
   });
+  const hasMore = search.results ? search.hasMore : !!nextCursor;
 
   const getCounts = () => {
     const total = items.length;
@@ -233,9 +260,16 @@ const Gallery = () => {
                 <div className="relative aspect-video bg-gray-100 flex items-center justify-center">
                   {item.file_type === 'image' ? (
                     <img
-                      src={`${process.env.REACT_APP_BACKEND_URL}${item.file_url}`}
+                      src={`${process.env.REACT_APP_BACKEND_URL}${item.thumbnail_url || item.file_url}`}
+                      srcSet={(item.variants || [])
+                        .filter((variant) => variant.format === 'webp')
+                        .map((variant) => `${process.env.REACT_APP_BACKEND_URL}${variant.url} ${variant.width}w`)
+                        .join(', ') || undefined}
+                      sizes="(min-width: 1280px) 25vw, (min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
                       alt={item.title}
+                      loading="lazy"
                       className="w-full h-full object-cover"
+                      style={item.placeholder ? { backgroundImage: `url(${item.placeholder})`, backgroundSize: 'cover' } : undefined}
                       onError={(e) => {
                         e.target.style.display = 'none';
                         e.target.nextSibling.style.display = 'flex';
@@ -243,7 +277,14 @@ const Gallery = () => {
                     />
                   ) : (
                     <video
-                      src={`${process.env.REACT_APP_BACKEND_URL}${item.file_url}`}
+                      src={`${process.env.REACT_APP_BACKEND_URL}${item.preview_url || item.file_url}`}
+                      poster={item.thumbnail_url ? `${process.env.REACT_APP_BACKEND_URL}${item.thumbnail_url}` : undefined}
+                      preload={item.preview_url ? 'auto' : 'none'}
+                      muted
+                      loop
+                      playsInline
+                      onMouseEnter={(e) => item.preview_url && e.target.play()}
+                      onMouseLeave={(e) => item.preview_url && e.target.pause()}
                       className="w-full h-full object-cover"
                       onError={(e) => {
                         e.target.style.display = 'none';
@@ -338,6 +379,18 @@ const Gallery = () => {
             ))}
           </div>
         )}
+
+        {hasMore && (
+          <div className="mt-6 text-center">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="px-4 py-2 text-sm font-medium text-gray-700 bg-white border border-gray-300 rounded-md hover:bg-gray-50 disabled:opacity-50"
+            >
+              {loadingMore ? 'Chargement...' : 'Charger plus'}
+            </button>
+          </div>
+        )}
       </div>
 
       {/* Upload Modal */}
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
-import { getAllTestimonials, updateTestimonial } from '../../services/adminApi';
+import { bulkUpdateTestimonials, getAllTestimonials, searchTestimonials, updateTestimonial } from '../../services/adminApi';
+import { useAdminSearch } from '../../hooks/use-admin-search';
 import { 
   Star, 
   Check, 
@@ -17,17 +18,24 @@ const Testimonials = () => {
   const [error, setError] = useState(null);
   const [filter, setFilter] = useState('all'); // 'all', 'approved', 'pending'
   const [searchTerm, setSearchTerm] = useState('');
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  const approvedFilter = () => {
+    if (filter === 'approved') return true;
+    if (filter === 'pending') return false;
+    return null;
+  };
+
+  const search = useAdminSearch(searchTestimonials, searchTerm, { approved: approvedFilter() });
 
   const fetchTestimonials = async () => {
     try {
       setLoading(true);
       setError(null);
-      let approved = null;
-      if (filter === 'approved') approved = true;
-      if (filter === 'pending') approved = false;
-      
-      const data = await getAllTestimonials(approved);
-      setTestimonials(data);
+      const data = await getAllTestimonials(approvedFilter());
+      setTestimonials(data.items);
+      setNextCursor(data.next_cursor);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -35,6 +43,23 @@ const Testimonials = () => {
     }
   };
 
+  const loadMore = async () => {
+    try {
+      setLoadingMore(true);
+      if (search.results) {
+        await search.loadMore();
+        return;
+      }
+      const data = await getAllTestimonials(approvedFilter(), nextCursor);
+      setTestimonials((current) => [...current, ...data.items]);
+      setNextCursor(data.next_cursor);
+    } catch (err) {
+      alert(err.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     fetchTestimonials();
   }, [filter]);
@@ -43,11 +68,38 @@ const Testimonials = () => {
     try {
       await updateTestimonial(testimonialId, { is_approved: isApproved });
       // Update local state
-      setTestimonials(testimonials.map(testimonial =>
+      const applyApproval = (list) => list.map(testimonial =>
         testimonial.id === testimonialId 
           ? { ...testimonial, is_approved: isApproved }
           : testimonial
-      ));
+      );
+      setTestimonials(applyApproval(testimonials));
+      search.updateResults(applyApproval);
+    } catch (err) {
+      alert('Erreur lors de la mise à jour: ' + err.message);
+    }
+  };
+
+  // Approves every pending testimonial shown in one request
+  const handleApproveAll = async () => {
+    const pendingIds = filteredTestimonials.filter(t => !t.is_approved).map(t => t.id);
+    if (pendingIds.length === 0) return;
+    try {
+      const result = await bulkUpdateTestimonials(
+        pendingIds.map(id => ({ id, patch: { is_approved: true } })),
+        false
+      );
+      const approvedIds = new Set(result.results.filter(r => r.status === 'updated').map(r => r.id));
+      const applyApproval = (list) => list.map(testimonial =>
+        approvedIds.has(testimonial.id)
+          ? { ...testimonial, is_approved: true }
+          : testimonial
+      );
+      setTestimonials(applyApproval(testimonials));
+      search.updateResults(applyApproval);
+      if (approvedIds.size < pendingIds.length) {
+        alert(`${pendingIds.length - approvedIds.size} témoignage(s) n'ont pas pu être approuvés`);
+      }
     } catch (err) {
       alert('Erreur lors de la mise à jour: ' + err.message);
     }
@@ -68,12 +120,9 @@ const Testimonials = () => {
     }
   };
 
-  // Filter testimonials based on search term
-  const filteredTestimonials = testimonials.filter(testimonial =>
-    testimonial.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-    testimonial.event.toLowerCase().includes(searchTerm.toLowerCase()) ||
-    testimonial.text.toLowerCase().includes(searchTerm.toLowerCase())
-  );
+  // Search results (server-side, whole collection) replace the list while searching
+  const filteredTestimonials = search.results ?? testimonials;
+  const hasMore = search.results ? search.hasMore : !!nextCursor;
 
   const getFilterCounts = () => {
     const all = testimonials.length;
@@ -108,7 +157,7 @@ const Testimonials = () => {
           <div className="flex items-center justify-between">
             <div>
               <h1 className="text-2xl font-bold text-gray-900">Témoignages</h1>
-              <p className="text-gray-600">{testimonials.length} témoignage(s) au total</p>
+              <p className="text-gray-600">{testimonials.length}{nextCursor ? '+' : ''} témoignage(s) au total</p>
             </div>
             
             {/* Search */}
@@ -156,6 +205,15 @@ const Testimonials = () => {
             >
               En attente ({counts.pending})
             </button>
+            {filteredTestimonials.some(t => !t.is_approved) && (
+              <button
+                onClick={handleApproveAll}
+                className="px-4 py-2 text-sm font-medium rounded-md text-green-700 hover:bg-green-50 transition-colors flex items-center"
+              >
+                <Check className="h-4 w-4 mr-1" />
+                Tout approuver
+              </button>
+            )}
           </div>
         </div>
       </div>
@@ -235,6 +293,18 @@ const Testimonials = () => {
             ))}
           </div>
         )}
+
+        {hasMore && (
+          <div className="mt-6 text-center">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="px-4 py-2 text-sm font-medium text-gray-700 bg-white border border-gray-300 rounded-md hover:bg-gray-50 disabled:opacity-50"
+            >
+              {loadingMore ? 'Chargement...' : 'Charger plus'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -1,4 +1,5 @@
 import axios from 'axios';
+import { Sha256 } from '../lib/sha256';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API_BASE = `${BACKEND_URL}/api`;
@@ -21,13 +22,56 @@ adminClient.interceptors.request.use((config) => {
   return config;
 });
 
-// Response interceptor for auth errors
+const clearSession = () => {
+  localStorage.removeItem('admin_token');
+  localStorage.removeItem('admin_refresh_token');
+  localStorage.removeItem('admin_user');
+};
+
+// One refresh at a time: requests failing together wait for the same new token
+let refreshPromise = null;
+
+const refreshAccessToken = () => {
+  if (!refreshPromise) {
+    const refreshToken = localStorage.getItem('admin_refresh_token');
+    refreshPromise = (refreshToken
+      ? axios.post(`${API_BASE}/auth/refresh`, { refresh_token: refreshToken })
+      : Promise.reject(new Error('No refresh token'))
+    )
+      .then((response) => {
+        localStorage.setItem('admin_token', response.data.access_token);
+        localStorage.setItem('admin_refresh_token', response.data.refresh_token);
+        return response.data.access_token;
+      })
+      .finally(() => {
+        refreshPromise = null;
+      });
+  }
+  return refreshPromise;
+};
+
+// Response interceptor for auth errors: renew the access token once, then give up
 adminClient.interceptors.response.use(
   (response) => response,
-  (error) => {
-    if (error.response?.status === 401) {
-      localStorage.removeItem('admin_token');
-      localStorage.removeItem('admin_user');
+  async (error) => {
+    const request = error.config;
+    const isAuthCall = request?.url?.startsWith('/auth/login') || request?.url?.startsWith('/auth/refresh');
+    
+    if (error.response?.status === 401 && request && !request._retried && !isAuthCall) {
+      request._retried = true;
+      try {
+        const token = await refreshAccessToken();
+        request.headers.Authorization = `Bearer ${token}`;
+        return adminClient(request);
+      } catch (refreshError) {
+        clearSession();
+        window.location.href = '/admin/login';
+        return Promise.reject(error);
+      }
+    }
+    
+    if (error.response?.status === 401 && !isAuthCall) {
+      clearSession();
       window.location.href = '/admin/login';
     }
     return Promise.reject(error);
@@ -42,8 +86,9 @@ export const login = async (username, password) => {
       password
     });
     
-    const { access_token, expires_in } = response.data;
+    const { access_token, refresh_token, expires_in } = response.data;
     localStorage.setItem('admin_token', access_token);
+    localStorage.setItem('admin_refresh_token', refresh_token);
     
     // Get user info
     const userResponse = await adminClient.get('/auth/me');
@@ -61,12 +106,13 @@ export const login = async (username, password) => {
 
 export const logout = async () => {
   try {
-    await adminClient.post('/auth/logout');
+    // Revokes the refresh token so the session can't be renewed
+    const refreshToken = localStorage.getItem('admin_refresh_token');
+    await adminClient.post('/auth/logout', refreshToken ? { refresh_token: refreshToken } : undefined);
   } catch (error) {
     console.error('Logout error:', error);
   } finally {
-    localStorage.removeItem('admin_token');
-    localStorage.removeItem('admin_user');
+    clearSession();
   }
 };
 
@@ -89,12 +135,48 @@ export const getDashboardStats = async () => {
   }
 };
 
+// Listings return one page at a time: { items, limit, next_cursor, prev_cursor }.
+// Pass next_cursor back as `after` to load the following (older) page.
+
+// Analytics: metric is 'contact_requests', 'bookings' or 'conversion'
+export const getAnalytics = async (metric, granularity = 'week', groupBy = null) => {
+  try {
+    const params = new URLSearchParams({ granularity });
+    if (groupBy) params.append('group_by', groupBy);
+    
+    const response = await adminClient.get(`/admin/analytics/${metric}?${params}`);
+    return response.data;
+  } catch (error) {
+    throw new Error('Erreur lors du chargement des statistiques');
+  }
+};
+
+// Search (ranked, accent-insensitive, over the whole collection)
+const searchAdmin = async (resource, params) => {
+  try {
+    const query = new URLSearchParams();
+    Object.entries(params).forEach(([key, value]) => {
+      if (value !== null && value !== undefined && value !== '') query.append(key, value.toString());
+    });
+    
+    const response = await adminClient.get(`/admin/search/${resource}?${query}`);
+    return response.data;
+  } catch (error) {
+    throw new Error('Erreur lors de la recherche');
+  }
+};
+
+export const searchGalleryItems = (params) => searchAdmin('gallery', params);
+export const searchContactRequests = (params) => searchAdmin('contact-requests', params);
+export const searchTestimonials = (params) => searchAdmin('testimonials', params);
+
 // Contact Requests
-export const getContactRequests = async (status = null, limit = 50) => {
+export const getContactRequests = async (status = null, limit = 50, after = null) => {
   try {
     const params = new URLSearchParams();
     if (status) params.append('status', status);
     params.append('limit', limit.toString());
+    if (after) params.append('after', after);
     
     const response = await adminClient.get(`/admin/contact-requests?${params}`);
     return response.data;
@@ -103,6 +185,16 @@ export const getContactRequests = async (status = null, limit = 50) => {
   }
 };
 
+// Lists carry a message preview (message_preview, message_truncated), this returns the full request
+export const getContactRequest = async (requestId) => {
+  try {
+    const response = await adminClient.get(`/admin/contact-requests/${requestId}`);
+    return response.data;
+  } catch (error) {
+    throw new Error('Erreur lors du chargement de la demande');
+  }
+};
+
 export const updateContactRequest = async (requestId, updateData) => {
   try {
     const response = await adminClient.put(`/admin/contact-requests/${requestId}`, updateData);
@@ -112,11 +204,23 @@ export const updateContactRequest = async (requestId, updateData) => {
   }
 };
 
+// Bulk updates: items are { id, patch } (or { id, delete: true } for the gallery).
+// With ordered, processing stops at the first failing item; the result lists every item.
+export const bulkUpdateContactRequests = async (items, ordered = true) => {
+  try {
+    const response = await adminClient.post('/admin/contact-requests/bulk', { items, ordered });
+    return response.data;
+  } catch (error) {
+    throw new Error('Erreur lors de la mise à jour des demandes');
+  }
+};
+
 // Testimonials
-export const getAllTestimonials = async (approved = null) => {
+export const getAllTestimonials = async (approved = null, after = null) => {
   try {
     const params = new URLSearchParams();
     if (approved !== null) params.append('approved', approved.toString());
+    if (after) params.append('after', after);
     
     const response = await adminClient.get(`/admin/testimonials?${params}`);
     return response.data;
@@ -125,6 +229,15 @@ export const getAllTestimonials = async (approved = null) => {
   }
 };
 
+export const getTestimonial = async (testimonialId) => {
+  try {
+    const response = await adminClient.get(`/admin/testimonials/${testimonialId}`);
+    return response.data;
+  } catch (error) {
+    throw new Error('Erreur lors du chargement du témoignage');
+  }
+};
+
 export const updateTestimonial = async (testimonialId, updateData) => {
   try {
     const response = await adminClient.put(`/admin/testimonials/${testimonialId}`, updateData);
@@ -134,16 +247,52 @@ export const updateTestimonial = async (testimonialId, updateData) => {
   }
 };
 
+export const bulkUpdateTestimonials = async (items, ordered = true) => {
+  try {
+    const response = await adminClient.post('/admin/testimonials/bulk', { items, ordered });
+    return response.data;
+  } catch (error) {
+    throw new Error('Erreur lors de la mise à jour des témoignages');
+  }
+};
+
+// Bookings
+export const getBookings = async (status = null, after = null) => {
+  try {
+    const params = new URLSearchParams();
+    if (status) params.append('status', status);
+    if (after) params.append('after', after);
+    
+    const response = await adminClient.get(`/admin/bookings?${params}`);
+    return response.data;
+  } catch (error) {
+    throw new Error('Erreur lors du chargement des réservations');
+  }
+};
+
 // Gallery
-export const getGalleryItems = async () => {
+export const getGalleryItems = async (after = null) => {
   try {
-    const response = await adminClient.get('/admin/gallery');
+    const params = new URLSearchParams();
+    if (after) params.append('after', after);
+    
+    const response = await adminClient.get(`/admin/gallery?${params}`);
     return response.data;
   } catch (error) {
     throw new Error('Erreur lors du chargement de la galerie');
   }
 };
 
+// Full item, with the media metadata the list leaves out (dimensions, hash, derivatives status)
+export const getGalleryItem = async (itemId) => {
+  try {
+    const response = await adminClient.get(`/admin/gallery/${itemId}`);
+    return response.data;
+  } catch (error) {
+    throw new Error('Erreur lors du chargement de l\'élément');
+  }
+};
+
 export const createGalleryItem = async (itemData) => {
   try {
     const response = await adminClient.post('/admin/gallery', itemData);
@@ -171,8 +320,129 @@ export const deleteGalleryItem = async (itemId) => {
   }
 };
 
+export const bulkUpdateGalleryItems = async (items, ordered = true) => {
+  try {
+    const response = await adminClient.post('/admin/gallery/bulk', { items, ordered });
+    return response.data;
+  } catch (error) {
+    throw new Error('Erreur lors de la mise à jour des éléments');
+  }
+};
+
 // Upload
-export const uploadFile = async (file, metadata) => {
+// Files above this size are sent in chunks through a resumable upload session
+const RESUMABLE_UPLOAD_THRESHOLD = 10 * 1024 * 1024;
+const RESUMABLE_PARALLEL_CHUNKS = 3;
+const RESUMABLE_CHUNK_RETRIES = 3;
+
+const uploadChunkWithRetry = async (sessionId, index, blob) => {
+  for (let attempt = 1; ; attempt++) {
+    try {
+      return await adminClient.put(`/upload/sessions/${sessionId}/chunks/${index}`, blob, {
+        headers: { 'Content-Type': 'application/octet-stream' },
+        timeout: 120000,
+      });
+    } catch (error) {
+      if (attempt >= RESUMABLE_CHUNK_RETRIES || (error.response && error.response.status < 500)) {
+        throw error;
+      }
+      await new Promise((resolve) => setTimeout(resolve, 1000 * 2 ** attempt));
+    }
+  }
+};
+
+export const uploadFileResumable = async (file, metadata) => {
+  try {
+    const { data: session } = await adminClient.post('/upload/sessions', {
+      filename: file.name,
+      content_type: file.type,
+      total_size: file.size,
+      title: metadata.title,
+      description: metadata.description || null,
+      event_type: metadata.event_type || null,
+      is_featured: !!metadata.is_featured,
+    });
+
+    // Send the missing chunks, a few at a time
+    const pending = [...session.missing_chunks];
+    const worker = async () => {
+      while (pending.length > 0) {
+        const index = pending.shift();
+        const start = index * session.chunk_size;
+        await uploadChunkWithRetry(session.id, index, file.slice(start, start + session.chunk_size));
+        console.log(`Upload Progress: chunk ${index + 1}/${session.total_chunks}`);
+      }
+    };
+    await Promise.all(Array.from({ length: RESUMABLE_PARALLEL_CHUNKS }, worker));
+
+    const response = await adminClient.post(`/upload/sessions/${session.id}/complete`, null, {
+      timeout: 120000,
+    });
+    return response.data;
+  } catch (error) {
+    if (error.response?.data?.detail) {
+      throw new Error(error.response.data.detail);
+    }
+    throw new Error('Erreur lors de l\'upload du fichier');
+  }
+};
+
+// Read in slices so hashing a large video never holds the whole file in memory
+const SHA256_SLICE_SIZE = 4 * 1024 * 1024;
+
+const sha256Hex = async (file) => {
+  const hash = new Sha256();
+  for (let start = 0; start < file.size; start += SHA256_SLICE_SIZE) {
+    hash.update(await file.slice(start, start + SHA256_SLICE_SIZE).arrayBuffer());
+  }
+  return Array.from(hash.digest(), (byte) => byte.toString(16).padStart(2, '0')).join('');
+};
+
+// Object storage: the file goes straight to the bucket, the API only signs and registers it
+export const uploadFileDirect = async (file, metadata) => {
+  try {
+    const payload = {
+      filename: file.name,
+      content_type: file.type,
+      size: file.size,
+      sha256: await sha256Hex(file),
+      title: metadata.title,
+      description: metadata.description || null,
+      event_type: metadata.event_type || null,
+      is_featured: !!metadata.is_featured,
+    };
+
+    const { data } = await adminClient.post('/upload/direct', payload);
+    if (data.upload_required) {
+      // Plain axios: the presigned URL must not receive the admin Authorization header
+      await axios.put(data.upload.url, file, {
+        headers: data.upload.headers,
+        timeout: 0,
+        onUploadProgress: (progressEvent) => {
+          const percentCompleted = Math.round((progressEvent.loaded * 100) / progressEvent.total);
+          console.log(`Upload Progress: ${percentCompleted}%`);
+        }
+      });
+    }
+
+    const response = await adminClient.post('/upload/direct/complete', payload);
+    return response.data;
+  } catch (error) {
+    if (error.response?.data?.detail) {
+      throw new Error(error.response.data.detail);
+    }
+    throw new Error('Erreur lors de l\'upload du fichier');
+  }
+};
+
+export const uploadFile = async (file, metadata, uploadInfo = null) => {
+  if (uploadInfo?.direct_upload) {
+    return uploadFileDirect(file, metadata);
+  }
+  if (file.size > RESUMABLE_UPLOAD_THRESHOLD) {
+    return uploadFileResumable(file, metadata);
+  }
+
   try {
     const formData = new FormData();
     formData.append('file', file);
@@ -0,0 +1,12 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+# The backend modules import each other as top-level packages (services, routers, models)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
@@ -0,0 +1,71 @@
+from PIL import Image
+from services import image_derivatives
+from services.image_derivatives import DERIVATIVE_WIDTHS, PLACEHOLDER_WIDTH, derivative_formats, generate_derivatives
+import base64
+import io
+
+import pytest
+
+
+def make_png(path, size=(800, 600)):
+    Image.new("RGBA", size, (200, 40, 90, 255)).save(path, format="PNG")
+
+
+def test_generate_derivatives_resizes_to_widths_below_the_original(tmp_path):
+    source = tmp_path / "source.png"
+    make_png(source)
+    output = tmp_path / "derived"
+
+    result = generate_derivatives(str(source), str(output), "abc", "/uploads/derived")
+
+    assert (result["width"], result["height"]) == (800, 600)
+    expected_widths = [w for w in DERIVATIVE_WIDTHS if w < 800]
+    formats = derivative_formats()
+    assert [(v["width"], v["format"]) for v in result["variants"]] == [
+        (w, fmt) for w in expected_widths for fmt in formats
+    ]
+    for variant in result["variants"]:
+        filename = f"abc-{variant['width']}w.{variant['format']}"
+        assert variant["url"] == f"/uploads/derived/{filename}"
+        assert variant["height"] == round(600 * variant["width"] / 800)
+        with Image.open(output / filename) as image:
+            assert image.format == variant["format"].upper()
+            assert image.size == (variant["width"], variant["height"])
+
+    assert result["thumbnail_url"] == "/uploads/derived/abc-320w.webp"
+    # Only the finished files are left behind
+    assert sorted(p.name for p in output.iterdir()) == sorted(
+        f"abc-{w}w.{fmt}" for w in expected_widths for fmt in formats
+    )
+
+
+def test_generate_derivatives_placeholder_is_a_tiny_webp_data_uri(tmp_path):
+    source = tmp_path / "source.png"
+    make_png(source)
+
+    result = generate_derivatives(str(source), str(tmp_path / "derived"), "abc", "/uploads/derived")
+
+    prefix = "data:image/webp;base64,"
+    assert result["placeholder"].startswith(prefix)
+    with Image.open(io.BytesIO(base64.b64decode(result["placeholder"][len(prefix):]))) as placeholder:
+        assert placeholder.format == "WEBP"
+        assert placeholder.size == (PLACEHOLDER_WIDTH, round(600 * PLACEHOLDER_WIDTH / 800))
+
+
+def test_generate_derivatives_keeps_small_images_at_their_own_width(tmp_path):
+    source = tmp_path / "small.png"
+    make_png(source, (200, 100))
+
+    result = generate_derivatives(str(source), str(tmp_path / "derived"), "small", "/uploads/derived")
+
+    assert {v["width"] for v in result["variants"]} == {200}
+    assert result["thumbnail_url"] == "/uploads/derived/small-200w.webp"
+
+
+@pytest.mark.anyio
+async def test_shutdown_stops_the_worker_processes():
+    image_derivatives.get_executor()
+
+    await image_derivatives.shutdown()
+
+    assert image_derivatives._executor is None
@@ -0,0 +1,28 @@
+from services.media_server import parse_range
+
+import pytest
+
+
+@pytest.mark.parametrize("header, size, expected", [
+    ("bytes=0-", 10, (0, 9)),
+    ("bytes=2-4", 10, (2, 4)),
+    ("bytes=5-100", 10, (5, 9)),
+    ("bytes=-3", 10, (7, 9)),
+    ("bytes=-30", 10, (0, 9)),
+    ("bytes=0-1,4-5", 10, None),
+    ("items=0-1", 10, None),
+])
+def test_parse_range(header, size, expected):
+    assert parse_range(header, size) == expected
+
+
+@pytest.mark.parametrize("header, size", [
+    ("bytes=10-", 10),
+    ("bytes=4-2", 10),
+    ("bytes=-0", 10),
+    ("bytes=0-", 0),
+    ("bytes=-5", 0),
+])
+def test_parse_range_unsatisfiable(header, size):
+    with pytest.raises(ValueError):
+        parse_range(header, size)
@@ -0,0 +1,125 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from moto import mock_aws
+from services import storage
+from services.storage import S3Storage
+from routers import static
+import base64
+import hashlib
+
+import boto3
+import pytest
+import requests
+
+BUCKET = "test-media"
+REGION = "eu-west-3"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.delenv("AWS_PROFILE", raising=False)
+    with mock_aws():
+        boto3.client("s3", region_name=REGION).create_bucket(
+            Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": REGION}
+        )
+        yield S3Storage(bucket=BUCKET, endpoint_url=None, region=REGION)
+
+
+def local_file(tmp_path, content: bytes):
+    path = tmp_path / "upload.bin"
+    path.write_bytes(content)
+    return path
+
+
+@pytest.mark.anyio
+async def test_put_file_uploads_and_consumes_the_local_file(s3, tmp_path):
+    path = local_file(tmp_path, b"jpeg bytes")
+
+    await s3.put_file(path, "image/abc.jpg", "image/jpeg")
+
+    head = s3.client.head_object(Bucket=BUCKET, Key="image/abc.jpg")
+    assert head["ContentType"] == "image/jpeg"
+    assert head["ContentLength"] == len(b"jpeg bytes")
+    assert not path.exists()
+
+
+@pytest.mark.anyio
+async def test_size_and_exists(s3, tmp_path):
+    await s3.put_file(local_file(tmp_path, b"12345"), "image/abc.jpg")
+
+    assert await s3.size("image/abc.jpg") == 5
+    assert await s3.exists("image/abc.jpg")
+    assert await s3.size("image/missing.jpg") is None
+    assert not await s3.exists("image/missing.jpg")
+
+
+@pytest.mark.anyio
+async def test_move_renames_the_object(s3, tmp_path):
+    await s3.put_file(local_file(tmp_path, b"video"), "video/old.mp4")
+
+    assert await s3.move("video/old.mp4", "video/new.mp4")
+
+    assert await s3.size("video/old.mp4") is None
+    assert await s3.size("video/new.mp4") == len(b"video")
+    assert not await s3.move("video/old.mp4", "video/other.mp4")
+
+
+@pytest.mark.anyio
+async def test_delete_removes_the_object_and_ignores_missing_ones(s3, tmp_path):
+    await s3.put_file(local_file(tmp_path, b"gone"), "image/abc.jpg")
+
+    await s3.delete("image/abc.jpg")
+    await s3.delete("image/abc.jpg")
+
+    assert not await s3.exists("image/abc.jpg")
+    assert await s3.list_keys("image/") == []
+
+
+@pytest.mark.anyio
+async def test_presigned_upload_accepts_the_signed_content(s3):
+    content = b"direct upload"
+    sha256_b64 = base64.b64encode(hashlib.sha256(content).digest()).decode()
+
+    upload = await s3.presigned_upload("image/direct.png", "image/png", len(content), sha256_b64)
+
+    assert upload["method"] == "PUT"
+    assert upload["headers"] == {"Content-Type": "image/png", "x-amz-checksum-sha256": sha256_b64}
+    assert upload["expires_in"] == storage.S3_PRESIGN_EXPIRES_SECONDS
+    response = requests.put(upload["url"], data=content, headers=upload["headers"])
+    assert response.status_code == 200
+    assert await s3.size("image/direct.png") == len(content)
+
+
+@pytest.fixture
+def uploads_client(s3, monkeypatch):
+    monkeypatch.setattr(storage, "_storage", s3)
+    app = FastAPI()
+    app.include_router(static.router)
+    return TestClient(app)
+
+
+def test_uploads_redirect_to_a_presigned_download(uploads_client):
+    response = uploads_client.get("/uploads/image/abc.jpg", follow_redirects=False)
+
+    assert response.status_code == 307
+    assert response.headers["cache-control"] == static.REDIRECT_CACHE_CONTROL
+    location = response.headers["location"]
+    assert BUCKET in location and "image/abc.jpg" in location
+    assert "X-Amz-Signature=" in location
+
+
+def test_uploads_redirect_to_the_public_base_url(uploads_client, monkeypatch):
+    monkeypatch.setattr(storage, "S3_PUBLIC_BASE_URL", "https://cdn.example.com/media/")
+
+    response = uploads_client.get("/uploads/derived/abc-320w.webp", follow_redirects=False)
+
+    assert response.status_code == 307
+    assert response.headers["location"] == "https://cdn.example.com/media/derived/abc-320w.webp"
+
+
+def test_uploads_reject_unknown_directories_before_redirecting(uploads_client):
+    response = uploads_client.get("/uploads/secrets/abc.jpg", follow_redirects=False)
+
+    assert response.status_code == 400